@@ -0,0 +1,34 @@
+from typing import Any, List, Optional
+import json
+
+from facefusion.filesystem import is_file
+from facefusion.typing import BatchJob
+
+
+def read_batch_jobs(batch_path : str) -> Optional[List[BatchJob]]:
+	if is_file(batch_path):
+		with open(batch_path, 'r') as batch_file:
+			try:
+				batch_jobs = json.load(batch_file)
+			except ValueError:
+				return None
+		if isinstance(batch_jobs, list) and all(is_batch_job(batch_job) for batch_job in batch_jobs):
+			return batch_jobs
+	return None
+
+
+def is_batch_job(batch_job : Any) -> bool:
+	if isinstance(batch_job, dict) and isinstance(batch_job.get('target_path'), str):
+		return isinstance(batch_job.get('source_paths', []), list) and isinstance(batch_job.get('output_path', ''), str) and isinstance(batch_job.get('args', []), list)
+	return False
+
+
+def create_batch_job_args(batch_job : BatchJob) -> List[str]:
+	batch_job_args = []
+	for source_path in batch_job.get('source_paths', []):
+		batch_job_args.extend([ '-s', source_path ])
+	batch_job_args.extend([ '-t', batch_job.get('target_path') ])
+	if batch_job.get('output_path'):
+		batch_job_args.extend([ '-o', batch_job.get('output_path') ])
+	batch_job_args.extend(batch_job.get('args', []))
+	return batch_job_args
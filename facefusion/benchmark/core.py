@@ -0,0 +1,381 @@
+from typing import Any, Callable, Dict, List, Optional
+from argparse import ArgumentParser, Namespace
+from types import ModuleType
+import json
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import onnxruntime
+
+import facefusion.choices
+import facefusion.globals
+from facefusion import core, face_analyser, face_masker, metadata, logger, wording
+from facefusion.benchmark import stand_in
+from facefusion.benchmark.history import create_benchmark_record, read_benchmark_records, append_benchmark_record, find_baseline_record, find_benchmark_record, is_comparable_record, compare_benchmark_records
+from facefusion.common_helper import create_metavar
+from facefusion.face_analyser import get_many_faces, clear_face_analyser
+from facefusion.face_store import clear_reference_faces, clear_static_faces
+from facefusion.ffmpeg import run_ffmpeg, extract_frames, merge_video
+from facefusion.filesystem import create_temp, clear_temp, get_temp_frame_paths, resolve_relative_path
+from facefusion.processors.frame.core import get_frame_processors_modules, group_frame_processors_modules, process_fused_video
+from facefusion.processors.frame import globals as frame_processors_globals
+from facefusion.typing import BenchmarkReport, BenchmarkResult, BenchmarkStage, BenchmarkComparison, Resolution
+from facefusion.vision import read_image
+
+BENCHMARK_FPS = 25.0
+BENCHMARK_RESOLUTIONS : Dict[str, Resolution] =\
+{
+	'240p': (426, 240),
+	'360p': (640, 360),
+	'540p': (960, 540),
+	'720p': (1280, 720),
+	'1080p': (1920, 1080),
+	'1440p': (2560, 1440),
+	'2160p': (3840, 2160)
+}
+BENCHMARK_FRAME_PROCESSORS = [ 'face_swapper', 'face_enhancer' ]
+
+
+def register_args(program : ArgumentParser) -> None:
+	group_benchmark = program.add_argument_group('benchmark')
+	group_benchmark.add_argument('--benchmark-path', help = wording.get('benchmark_path_help'), dest = 'benchmark_path')
+	group_benchmark.add_argument('--benchmark-resolutions', help = wording.get('benchmark_resolutions_help').format(choices = ', '.join(facefusion.choices.benchmark_resolutions)), default = [ '240p' ], choices = facefusion.choices.benchmark_resolutions, nargs = '+', metavar = 'BENCHMARK_RESOLUTIONS')
+	group_benchmark.add_argument('--benchmark-frame-total', help = wording.get('benchmark_frame_total_help'), type = int, default = 25, choices = facefusion.choices.benchmark_frame_total_range, metavar = create_metavar(facefusion.choices.benchmark_frame_total_range))
+	group_benchmark.add_argument('--benchmark-cycles', help = wording.get('benchmark_cycles_help'), type = int, default = 3, choices = facefusion.choices.benchmark_cycles_range, metavar = create_metavar(facefusion.choices.benchmark_cycles_range))
+	group_benchmark.add_argument('--benchmark-history-path', help = wording.get('benchmark_history_path_help'), default = resolve_relative_path('../.assets/benchmarks/history.jsonl'), dest = 'benchmark_history_path')
+	group_benchmark.add_argument('--benchmark-baseline', help = wording.get('benchmark_baseline_help'))
+	group_benchmark.add_argument('--benchmark-threshold', help = wording.get('benchmark_threshold_help'), type = int, default = 10, choices = facefusion.choices.benchmark_threshold_range, metavar = create_metavar(facefusion.choices.benchmark_threshold_range))
+
+
+def register_compare_args(program : ArgumentParser) -> None:
+	program.add_argument('benchmark_baseline', help = wording.get('benchmark_compare_baseline_help'), metavar = 'BASELINE')
+	program.add_argument('benchmark_current', help = wording.get('benchmark_compare_current_help'), metavar = 'CURRENT')
+	group_benchmark = program.add_argument_group('benchmark')
+	group_benchmark.add_argument('--benchmark-history-path', help = wording.get('benchmark_history_path_help'), default = resolve_relative_path('../.assets/benchmarks/history.jsonl'), dest = 'benchmark_history_path')
+	group_benchmark.add_argument('--benchmark-threshold', help = wording.get('benchmark_threshold_help'), type = int, default = 10, choices = facefusion.choices.benchmark_threshold_range, metavar = create_metavar(facefusion.choices.benchmark_threshold_range))
+
+
+def apply_args(args : Namespace) -> None:
+	facefusion.globals.benchmark_path = args.benchmark_path
+	facefusion.globals.benchmark_resolutions = args.benchmark_resolutions
+	facefusion.globals.benchmark_frame_total = args.benchmark_frame_total
+	facefusion.globals.benchmark_cycles = args.benchmark_cycles
+	facefusion.globals.benchmark_history_path = args.benchmark_history_path
+	facefusion.globals.benchmark_baseline = args.benchmark_baseline
+	facefusion.globals.benchmark_threshold = args.benchmark_threshold
+
+
+def run(program : ArgumentParser) -> None:
+	args = program.parse_args()
+	core.apply_args(args)
+	apply_args(args)
+	facefusion.globals.skip_download = True
+	logger.init(facefusion.globals.log_level)
+	core.limit_resources()
+	if not core.pre_check():
+		return
+	if facefusion.globals.face_detector_model != 'retinaface':
+		logger.error(wording.get('benchmark_model_not_supported').format(model = facefusion.globals.face_detector_model), __name__.upper())
+		return
+	benchmark_directory_path = tempfile.mkdtemp(prefix = 'facefusion-benchmark-')
+	try:
+		benchmark_report = benchmark(benchmark_directory_path)
+	finally:
+		shutil.rmtree(benchmark_directory_path, ignore_errors = True)
+	if benchmark_report:
+		report_benchmark(benchmark_report)
+		if not write_benchmark_report(benchmark_report):
+			logger.error(wording.get('writing_benchmark_failed'), __name__.upper())
+		if not conditional_record_benchmark(benchmark_report):
+			sys.exit(1)
+
+
+def run_compare(program : ArgumentParser) -> None:
+	args = program.parse_args()
+	facefusion.globals.benchmark_history_path = args.benchmark_history_path
+	facefusion.globals.benchmark_threshold = args.benchmark_threshold
+	logger.init('info')
+	if not compare_benchmark(args.benchmark_baseline, args.benchmark_current):
+		sys.exit(1)
+
+
+def benchmark(benchmark_directory_path : str) -> Optional[BenchmarkReport]:
+	logger.info(wording.get('creating_benchmark_inputs'), __name__.upper())
+	frame_processors_modules = prepare_benchmark(benchmark_directory_path)
+	if frame_processors_modules is None:
+		return None
+	benchmark_results = []
+	for benchmark_resolution in facefusion.globals.benchmark_resolutions:
+		logger.info(wording.get('benchmarking_resolution').format(resolution = benchmark_resolution), __name__.upper())
+		benchmark_result = benchmark_target(benchmark_directory_path, benchmark_resolution, frame_processors_modules)
+		if benchmark_result is None:
+			return None
+		benchmark_results.append(benchmark_result)
+	return\
+	{
+		'name': metadata.get('name'),
+		'version': metadata.get('version'),
+		'host': get_benchmark_host(),
+		'settings': get_benchmark_settings(),
+		'results': benchmark_results
+	}
+
+
+def prepare_benchmark(benchmark_directory_path : str) -> Optional[List[ModuleType]]:
+	source_path = os.path.join(benchmark_directory_path, 'source.jpg')
+	if not create_source_image(source_path):
+		return None
+	facefusion.globals.source_paths = [ source_path ]
+	facefusion.globals.output_path = os.path.join(benchmark_directory_path, 'output.mp4')
+	apply_stand_in_models(benchmark_directory_path)
+	frame_processors = []
+	for frame_processor in facefusion.globals.frame_processors:
+		if frame_processor in BENCHMARK_FRAME_PROCESSORS:
+			frame_processors.append(frame_processor)
+		else:
+			logger.warn(wording.get('benchmark_frame_processor_skipped').format(frame_processor = frame_processor), __name__.upper())
+	facefusion.globals.frame_processors = frame_processors
+	frame_processors_modules = get_frame_processors_modules(frame_processors)
+	for frame_processor_module in frame_processors_modules:
+		apply_stand_in_frame_processor_model(benchmark_directory_path, frame_processor_module)
+	facefusion.globals.target_path = source_path
+	for frame_processor_module in frame_processors_modules:
+		if not frame_processor_module.pre_process('output'):
+			return None
+	return frame_processors_modules
+
+
+def apply_stand_in_models(benchmark_directory_path : str) -> None:
+	face_detector_path = os.path.join(benchmark_directory_path, 'face_detector.onnx')
+	face_recognizer_path = os.path.join(benchmark_directory_path, 'face_recognizer.onnx')
+	gender_age_path = os.path.join(benchmark_directory_path, 'gender_age.onnx')
+	face_occluder_path = os.path.join(benchmark_directory_path, 'face_occluder.onnx')
+	face_parser_path = os.path.join(benchmark_directory_path, 'face_parser.onnx')
+	stand_in.create_face_detector_model(face_detector_path, facefusion.globals.face_detector_size)
+	stand_in.create_face_recognizer_model(face_recognizer_path)
+	stand_in.create_gender_age_model(gender_age_path)
+	stand_in.create_face_occluder_model(face_occluder_path)
+	stand_in.create_face_parser_model(face_parser_path)
+	face_analyser.MODELS['face_detector_retinaface'] = { **face_analyser.MODELS.get('face_detector_retinaface'), 'path': face_detector_path }
+	face_analyser.MODELS['face_recognizer_' + facefusion.globals.face_recognizer_model] = { **face_analyser.MODELS.get('face_recognizer_' + facefusion.globals.face_recognizer_model), 'path': face_recognizer_path }
+	face_analyser.MODELS['gender_age'] = { **face_analyser.MODELS.get('gender_age'), 'path': gender_age_path }
+	face_masker.MODELS['face_occluder'] = { **face_masker.MODELS.get('face_occluder'), 'path': face_occluder_path }
+	face_masker.MODELS['face_parser'] = { **face_masker.MODELS.get('face_parser'), 'path': face_parser_path }
+
+
+def apply_stand_in_frame_processor_model(benchmark_directory_path : str, frame_processor_module : ModuleType) -> None:
+	frame_processor = frame_processor_module.__name__.split('.')[-1]
+	frame_processor_model = frame_processor_module.get_options('model')
+	model_path = os.path.join(benchmark_directory_path, frame_processor + '.onnx')
+	if frame_processor == 'face_swapper':
+		stand_in.create_face_swapper_model(model_path, frame_processor_model.get('type'), frame_processor_model.get('size'))
+	if frame_processor == 'face_enhancer':
+		stand_in.create_face_enhancer_model(model_path, frame_processor_model.get('size'), frame_processors_globals.face_enhancer_model == 'codeformer')
+	frame_processor_module.set_options('model', { **frame_processor_model, 'path': model_path })
+
+
+def create_source_image(source_path : str) -> bool:
+	return run_ffmpeg([ '-f', 'lavfi', '-i', 'testsrc2=size=512x512', '-frames:v', '1', source_path ])
+
+
+def create_target_video(target_path : str, resolution : Resolution) -> bool:
+	width, height = resolution
+	commands = [ '-f', 'lavfi', '-i', 'testsrc2=size=' + str(width) + 'x' + str(height) + ':rate=' + str(BENCHMARK_FPS) ]
+	commands.extend([ '-frames:v', str(facefusion.globals.benchmark_frame_total), '-c:v', 'libx264', '-pix_fmt', 'yuv420p', '-y', target_path ])
+	return run_ffmpeg(commands)
+
+
+def benchmark_target(benchmark_directory_path : str, benchmark_resolution : str, frame_processors_modules : List[ModuleType]) -> Optional[BenchmarkResult]:
+	target_path = os.path.join(benchmark_directory_path, 'target-' + benchmark_resolution + '.mp4')
+	if not create_target_video(target_path, BENCHMARK_RESOLUTIONS[benchmark_resolution]):
+		return None
+	facefusion.globals.target_path = target_path
+	clear_reference_faces()
+	clear_static_faces()
+	core.conditional_append_reference_faces()
+	clear_benchmark_sessions(frame_processors_modules)
+	stages_times : Dict[str, List[float]] = {}
+	try:
+		for _ in range(facefusion.globals.benchmark_cycles + 1):
+			stage_times = benchmark_cycle(target_path, frame_processors_modules)
+			if stage_times is None:
+				return None
+			for stage_name, stage_time in stage_times.items():
+				stages_times.setdefault(stage_name, []).append(stage_time)
+	finally:
+		clear_temp(target_path)
+	return\
+	{
+		'resolution': benchmark_resolution,
+		'frame_total': facefusion.globals.benchmark_frame_total,
+		'stages': { stage_name: create_benchmark_stage(stage_times) for stage_name, stage_times in stages_times.items() }
+	}
+
+
+def benchmark_cycle(target_path : str, frame_processors_modules : List[ModuleType]) -> Optional[Dict[str, float]]:
+	stage_times = {}
+	create_temp(target_path)
+	stage_times['extract_frames'] = measure_stage(extract_frames, target_path, BENCHMARK_FPS)
+	temp_frame_paths = get_temp_frame_paths(target_path)
+	if not temp_frame_paths:
+		logger.error(wording.get('temp_frames_not_found'), __name__.upper())
+		return None
+	clear_static_faces()
+	stage_times['face_analyser'] = measure_stage(analyse_frames, temp_frame_paths)
+	for frame_processors_group in group_frame_processors_modules(frame_processors_modules):
+		clear_static_faces()
+		stage_times[get_benchmark_stage_name(frame_processors_group)] = measure_stage(process_fused_video, frame_processors_group, facefusion.globals.source_paths, temp_frame_paths)
+	stage_times['merge_video'] = measure_stage(merge_video, target_path, BENCHMARK_FPS)
+	clear_temp(target_path)
+	return stage_times
+
+
+def get_benchmark_stage_name(frame_processors_modules : List[ModuleType]) -> str:
+	return '+'.join(frame_processor_module.__name__.split('.')[-1] for frame_processor_module in frame_processors_modules)
+
+
+def analyse_frames(temp_frame_paths : List[str]) -> None:
+	for temp_frame_path in temp_frame_paths:
+		get_many_faces(read_image(temp_frame_path))
+
+
+def measure_stage(function : Callable[..., Any], *args : Any) -> float:
+	start_time = time.perf_counter()
+	function(*args)
+	return time.perf_counter() - start_time
+
+
+def clear_benchmark_sessions(frame_processors_modules : List[ModuleType]) -> None:
+	for frame_processor_module in frame_processors_modules:
+		frame_processor_module.post_process()
+	clear_face_analyser()
+	face_masker.clear_face_occluder()
+	face_masker.clear_face_parser()
+
+
+def create_benchmark_stage(stage_times : List[float]) -> BenchmarkStage:
+	cold_time = stage_times[0]
+	warm_times = stage_times[1:]
+	warm_mean = statistics.mean(warm_times)
+	return\
+	{
+		'cold': round(cold_time, 4),
+		'warm_mean': round(warm_mean, 4),
+		'warm_median': round(statistics.median(warm_times), 4),
+		'warm_min': round(min(warm_times), 4),
+		'warm_max': round(max(warm_times), 4),
+		'warm_fps': round(facefusion.globals.benchmark_frame_total / warm_mean, 2) if warm_mean else 0.0
+	}
+
+
+def get_benchmark_host() -> Dict[str, Any]:
+	return\
+	{
+		'platform': platform.platform(),
+		'machine': platform.machine(),
+		'processor': platform.processor(),
+		'cpu_count': os.cpu_count(),
+		'python': platform.python_version(),
+		'onnxruntime': onnxruntime.__version__
+	}
+
+
+def get_benchmark_settings() -> Dict[str, Any]:
+	benchmark_settings =\
+	{
+		'execution_providers': facefusion.globals.execution_providers,
+		'execution_backend': facefusion.globals.execution_backend,
+		'execution_thread_count': facefusion.globals.execution_thread_count,
+		'execution_queue_count': facefusion.globals.execution_queue_count,
+		'execution_session_count': facefusion.globals.execution_session_count,
+		'execution_session_concurrency': facefusion.globals.execution_session_concurrency,
+		'execution_batch_size': facefusion.globals.execution_batch_size,
+		'execution_batch_timeout': facefusion.globals.execution_batch_timeout,
+		'execution_preset': facefusion.globals.execution_preset,
+		'execution_intra_op_thread_count': facefusion.globals.execution_intra_op_thread_count,
+		'execution_inter_op_thread_count': facefusion.globals.execution_inter_op_thread_count,
+		'execution_mode': facefusion.globals.execution_mode,
+		'execution_graph_optimization': facefusion.globals.execution_graph_optimization,
+		'execution_disable_memory_arena': facefusion.globals.execution_disable_memory_arena,
+		'execution_disable_spinning': facefusion.globals.execution_disable_spinning,
+		'execution_disable_model_cache': facefusion.globals.execution_disable_model_cache,
+		'face_detector_size': facefusion.globals.face_detector_size,
+		'face_tracker_interval': facefusion.globals.face_tracker_interval,
+		'face_selector_mode': facefusion.globals.face_selector_mode,
+		'face_mask_types': facefusion.globals.face_mask_types,
+		'temp_frame_format': facefusion.globals.temp_frame_format,
+		'output_video_encoder': facefusion.globals.output_video_encoder,
+		'frame_processors': facefusion.globals.frame_processors,
+		'benchmark_frame_total': facefusion.globals.benchmark_frame_total,
+		'benchmark_cycles': facefusion.globals.benchmark_cycles
+	}
+	for frame_processor_module in get_frame_processors_modules(facefusion.globals.frame_processors):
+		frame_processor = frame_processor_module.__name__.split('.')[-1]
+		benchmark_settings[frame_processor + '_model'] = getattr(frame_processors_globals, frame_processor + '_model')
+	return benchmark_settings
+
+
+def report_benchmark(benchmark_report : BenchmarkReport) -> None:
+	for benchmark_result in benchmark_report.get('results'):
+		for stage_name, benchmark_stage in benchmark_result.get('stages').items():
+			logger.info(wording.get('benchmark_stage').format(resolution = benchmark_result.get('resolution'), stage = stage_name, cold = benchmark_stage.get('cold'), warm = benchmark_stage.get('warm_mean'), fps = benchmark_stage.get('warm_fps')), __name__.upper())
+
+
+def conditional_record_benchmark(benchmark_report : BenchmarkReport) -> bool:
+	if not facefusion.globals.benchmark_history_path:
+		return True
+	benchmark_records = read_benchmark_records(facefusion.globals.benchmark_history_path)
+	benchmark_record = create_benchmark_record(benchmark_report)
+	if not append_benchmark_record(facefusion.globals.benchmark_history_path, benchmark_record):
+		logger.error(wording.get('writing_benchmark_history_failed'), __name__.upper())
+	if facefusion.globals.benchmark_baseline:
+		baseline_record = find_baseline_record(benchmark_records, benchmark_record, facefusion.globals.benchmark_baseline)
+		if not baseline_record:
+			logger.warn(wording.get('benchmark_baseline_not_found').format(baseline = facefusion.globals.benchmark_baseline), __name__.upper())
+			return True
+		logger.info(wording.get('comparing_benchmark_baseline').format(revision = baseline_record.get('revision')), __name__.upper())
+		return report_benchmark_comparisons(compare_benchmark_records(baseline_record, benchmark_record))
+	return True
+
+
+def compare_benchmark(baseline : str, current : str) -> bool:
+	benchmark_records = read_benchmark_records(facefusion.globals.benchmark_history_path)
+	baseline_record = find_benchmark_record(benchmark_records, baseline)
+	benchmark_record = find_benchmark_record(benchmark_records, current)
+	if not baseline_record:
+		logger.error(wording.get('benchmark_record_not_found').format(revision = baseline), __name__.upper())
+		return False
+	if not benchmark_record:
+		logger.error(wording.get('benchmark_record_not_found').format(revision = current), __name__.upper())
+		return False
+	if not is_comparable_record(baseline_record, benchmark_record):
+		logger.warn(wording.get('benchmark_records_not_comparable'), __name__.upper())
+	logger.info(wording.get('comparing_benchmark_baseline').format(revision = baseline_record.get('revision')), __name__.upper())
+	return report_benchmark_comparisons(compare_benchmark_records(baseline_record, benchmark_record))
+
+
+def report_benchmark_comparisons(benchmark_comparisons : List[BenchmarkComparison]) -> bool:
+	has_regression = False
+	for benchmark_comparison in benchmark_comparisons:
+		if benchmark_comparison.get('change') > facefusion.globals.benchmark_threshold:
+			logger.error(wording.get('benchmark_stage_regression').format(**benchmark_comparison, threshold = facefusion.globals.benchmark_threshold), __name__.upper())
+			has_regression = True
+		else:
+			logger.info(wording.get('benchmark_stage_compare').format(**benchmark_comparison), __name__.upper())
+	return not has_regression
+
+
+def write_benchmark_report(benchmark_report : BenchmarkReport) -> bool:
+	if facefusion.globals.benchmark_path:
+		try:
+			with open(facefusion.globals.benchmark_path, 'w') as benchmark_file:
+				json.dump(benchmark_report, benchmark_file, indent = 4)
+		except OSError:
+			return False
+		return True
+	print(json.dumps(benchmark_report, indent = 4))
+	return True
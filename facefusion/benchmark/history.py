@@ -0,0 +1,91 @@
+from typing import Any, Dict, List, Optional
+import hashlib
+import json
+import os
+import subprocess
+import time
+
+from facefusion.filesystem import is_file
+from facefusion.typing import BenchmarkReport, BenchmarkRecord, BenchmarkComparison
+
+
+def get_revision() -> Optional[str]:
+	try:
+		return subprocess.run([ 'git', 'describe', '--always', '--dirty' ], stdout = subprocess.PIPE, stderr = subprocess.DEVNULL, cwd = os.path.dirname(__file__), check = True).stdout.decode().strip() or None
+	except (OSError, subprocess.CalledProcessError):
+		return None
+
+
+def create_fingerprint(value : Dict[str, Any]) -> str:
+	return hashlib.sha1(json.dumps(value, sort_keys = True).encode()).hexdigest()[:12]
+
+
+def create_benchmark_record(benchmark_report : BenchmarkReport) -> BenchmarkRecord:
+	return\
+	{
+		'revision': get_revision(),
+		'host_fingerprint': create_fingerprint(benchmark_report.get('host')),
+		'settings_fingerprint': create_fingerprint(benchmark_report.get('settings')),
+		'created_at': round(time.time()),
+		'report': benchmark_report
+	}
+
+
+def read_benchmark_records(history_path : str) -> List[BenchmarkRecord]:
+	benchmark_records = []
+	if is_file(history_path):
+		with open(history_path, 'r') as history_file:
+			for line in history_file:
+				try:
+					benchmark_records.append(json.loads(line))
+				except ValueError:
+					continue
+	return benchmark_records
+
+
+def append_benchmark_record(history_path : str, benchmark_record : BenchmarkRecord) -> bool:
+	try:
+		history_directory_path = os.path.dirname(history_path)
+		if history_directory_path:
+			os.makedirs(history_directory_path, exist_ok = True)
+		with open(history_path, 'a') as history_file:
+			history_file.write(json.dumps(benchmark_record) + '\n')
+	except OSError:
+		return False
+	return True
+
+
+def find_baseline_record(benchmark_records : List[BenchmarkRecord], benchmark_record : BenchmarkRecord, baseline : str) -> Optional[BenchmarkRecord]:
+	baseline_records = [ baseline_record for baseline_record in benchmark_records if is_comparable_record(baseline_record, benchmark_record) ]
+	return find_benchmark_record(baseline_records, baseline)
+
+
+def find_benchmark_record(benchmark_records : List[BenchmarkRecord], revision : str) -> Optional[BenchmarkRecord]:
+	for benchmark_record in reversed(benchmark_records):
+		if revision == 'latest' or (benchmark_record.get('revision') or '').startswith(revision):
+			return benchmark_record
+	return None
+
+
+def is_comparable_record(baseline_record : BenchmarkRecord, benchmark_record : BenchmarkRecord) -> bool:
+	return baseline_record.get('host_fingerprint') == benchmark_record.get('host_fingerprint') and baseline_record.get('settings_fingerprint') == benchmark_record.get('settings_fingerprint')
+
+
+def compare_benchmark_records(baseline_record : BenchmarkRecord, benchmark_record : BenchmarkRecord) -> List[BenchmarkComparison]:
+	benchmark_comparisons : List[BenchmarkComparison] = []
+	baseline_results = { baseline_result.get('resolution'): baseline_result for baseline_result in baseline_record.get('report').get('results') }
+	for benchmark_result in benchmark_record.get('report').get('results'):
+		baseline_result = baseline_results.get(benchmark_result.get('resolution'))
+		if baseline_result:
+			for stage_name, benchmark_stage in benchmark_result.get('stages').items():
+				baseline_stage = baseline_result.get('stages').get(stage_name)
+				if baseline_stage and baseline_stage.get('warm_median') > 0:
+					benchmark_comparisons.append(
+					{
+						'resolution': benchmark_result.get('resolution'),
+						'stage': stage_name,
+						'baseline': baseline_stage.get('warm_median'),
+						'current': benchmark_stage.get('warm_median'),
+						'change': round((benchmark_stage.get('warm_median') / baseline_stage.get('warm_median') - 1) * 100, 1)
+					})
+	return benchmark_comparisons
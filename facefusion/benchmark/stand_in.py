@@ -0,0 +1,162 @@
+from typing import Any, List, Tuple
+import numpy
+import onnx
+from onnx import helper, numpy_helper, TensorProto
+
+STAND_IN_OPSET = 13
+STAND_IN_BATCH = 'batch'
+STAND_IN_FACE_CENTER = (96, 96)
+STAND_IN_FACE_KPS = numpy.array([ [ -22, -12 ], [ 22, -12 ], [ 0, 8 ], [ -18, 30 ], [ 18, 30 ] ])
+
+
+def create_tensor(name : str, shape : List[Any], elem_type : int = TensorProto.FLOAT) -> onnx.ValueInfoProto:
+	return helper.make_tensor_value_info(name, elem_type, shape)
+
+
+def create_initializer(name : str, value : numpy.ndarray[Any, Any]) -> onnx.TensorProto:
+	return numpy_helper.from_array(value.astype(numpy.float32), name)
+
+
+def create_zero_nodes(input_name : str, output_name : str) -> List[onnx.NodeProto]:
+	return\
+	[
+		helper.make_node('ReduceMean', [ input_name ], [ output_name + '_mean' ], keepdims = 0),
+		helper.make_node('Mul', [ output_name + '_mean', 'zero' ], [ output_name ])
+	]
+
+
+def save_model(model_path : str, nodes : List[onnx.NodeProto], inputs : List[onnx.ValueInfoProto], outputs : List[onnx.ValueInfoProto], initializers : List[onnx.TensorProto]) -> None:
+	initializers.insert(0, create_initializer('zero', numpy.array(0)))
+	graph = helper.make_graph(nodes, 'stand_in', inputs, outputs, initializers)
+	model = helper.make_model(graph, opset_imports = [ helper.make_opsetid('', STAND_IN_OPSET) ])
+	model.ir_version = 8
+	onnx.save(model, model_path)
+
+
+def create_face_detector_model(model_path : str, face_detector_size : str) -> None:
+	face_detector_width, face_detector_height = map(int, face_detector_size.split('x'))
+	feature_strides = [ 8, 16, 32 ]
+	anchor_total = 2
+	nodes = create_zero_nodes('input', 'input_zero')
+	outputs = []
+	initializers = []
+	detections : List[List[numpy.ndarray[Any, Any]]] = [ [], [], [] ]
+	for feature_stride in feature_strides:
+		stride_height = face_detector_height // feature_stride
+		stride_width = face_detector_width // feature_stride
+		anchor_count = stride_height * stride_width * anchor_total
+		score = numpy.zeros((anchor_count, 1))
+		bbox = numpy.zeros((anchor_count, 4))
+		kps = numpy.zeros((anchor_count, 10))
+		if feature_stride == feature_strides[-1]:
+			anchor_index = (STAND_IN_FACE_CENTER[1] // feature_stride * stride_width + STAND_IN_FACE_CENTER[0] // feature_stride) * anchor_total
+			score[anchor_index] = 0.9
+			bbox[anchor_index] = 2
+			kps[anchor_index] = STAND_IN_FACE_KPS.ravel() / feature_stride
+		detections[0].append(score)
+		detections[1].append(bbox)
+		detections[2].append(kps)
+	for detection_name, detection_list in zip([ 'score', 'bbox', 'kps' ], detections):
+		for feature_stride, detection in zip(feature_strides, detection_list):
+			output_name = detection_name + '_' + str(feature_stride)
+			initializers.append(create_initializer(output_name + '_value', detection))
+			nodes.append(helper.make_node('Add', [ output_name + '_value', 'input_zero' ], [ output_name ]))
+			outputs.append(create_tensor(output_name, list(detection.shape)))
+	save_model(model_path, nodes, [ create_tensor('input', [ 1, 3, face_detector_height, face_detector_width ]) ], outputs, initializers)
+
+
+def create_face_recognizer_model(model_path : str) -> None:
+	random_state = numpy.random.RandomState(0)
+	nodes =\
+	[
+		helper.make_node('GlobalAveragePool', [ 'input' ], [ 'pool' ]),
+		helper.make_node('Flatten', [ 'pool' ], [ 'flatten' ]),
+		helper.make_node('Gemm', [ 'flatten', 'weight', 'bias' ], [ 'embedding' ])
+	]
+	initializers =\
+	[
+		create_initializer('weight', random_state.randn(3, 512) * 0.01),
+		create_initializer('bias', random_state.randn(512))
+	]
+	save_model(model_path, nodes, [ create_tensor('input', [ STAND_IN_BATCH, 3, 112, 112 ]) ], [ create_tensor('embedding', [ STAND_IN_BATCH, 512 ]) ], initializers)
+
+
+def create_gender_age_model(model_path : str) -> None:
+	nodes =\
+	[
+		helper.make_node('GlobalAveragePool', [ 'input' ], [ 'pool' ]),
+		helper.make_node('Flatten', [ 'pool' ], [ 'flatten' ]),
+		helper.make_node('Gemm', [ 'flatten', 'weight', 'bias' ], [ 'prediction' ])
+	]
+	initializers =\
+	[
+		create_initializer('weight', numpy.zeros((3, 3))),
+		create_initializer('bias', numpy.array([ 1, 0, 0.3 ]))
+	]
+	save_model(model_path, nodes, [ create_tensor('input', [ STAND_IN_BATCH, 3, 96, 96 ]) ], [ create_tensor('prediction', [ STAND_IN_BATCH, 3 ]) ], initializers)
+
+
+def create_face_occluder_model(model_path : str) -> None:
+	nodes =\
+	[
+		helper.make_node('ReduceMean', [ 'input' ], [ 'mean' ], axes = [ 3 ]),
+		helper.make_node('Mul', [ 'mean', 'zero' ], [ 'mean_zero' ]),
+		helper.make_node('Add', [ 'mean_zero', 'one' ], [ 'mask' ])
+	]
+	initializers =\
+	[
+		create_initializer('one', numpy.array(1))
+	]
+	save_model(model_path, nodes, [ create_tensor('input', [ STAND_IN_BATCH, 256, 256, 3 ]) ], [ create_tensor('mask', [ STAND_IN_BATCH, 256, 256, 1 ]) ], initializers)
+
+
+def create_face_parser_model(model_path : str) -> None:
+	region_bias = numpy.zeros(19)
+	region_bias[1] = 1
+	nodes =\
+	[
+		helper.make_node('Conv', [ 'input', 'weight', 'bias' ], [ 'regions' ], kernel_shape = [ 1, 1 ])
+	]
+	initializers =\
+	[
+		create_initializer('weight', numpy.zeros((19, 3, 1, 1))),
+		create_initializer('bias', region_bias)
+	]
+	save_model(model_path, nodes, [ create_tensor('input', [ STAND_IN_BATCH, 3, 512, 512 ]) ], [ create_tensor('regions', [ STAND_IN_BATCH, 19, 512, 512 ]) ], initializers)
+
+
+def create_face_swapper_model(model_path : str, model_type : str, model_size : Tuple[int, int]) -> None:
+	crop_size = model_size[1]
+	source_shape = [ STAND_IN_BATCH, 3, 112, 112 ] if model_type == 'blendswap' else [ STAND_IN_BATCH, 512 ]
+	nodes = create_zero_nodes('source', 'source_zero')
+	nodes.extend(
+	[
+		helper.make_node('Sigmoid', [ 'target' ], [ 'target_sigmoid' ]),
+		helper.make_node('Add', [ 'target_sigmoid', 'source_zero' ], [ 'output' ])
+	])
+	initializers = []
+	if model_type == 'inswapper':
+		initializers.append(create_initializer('emap', numpy.eye(512)))
+	inputs =\
+	[
+		create_tensor('target', [ STAND_IN_BATCH, 3, crop_size, crop_size ]),
+		create_tensor('source', source_shape)
+	]
+	save_model(model_path, nodes, inputs, [ create_tensor('output', [ STAND_IN_BATCH, 3, crop_size, crop_size ]) ], initializers)
+
+
+def create_face_enhancer_model(model_path : str, model_size : Tuple[int, int], has_weight : bool) -> None:
+	crop_size = model_size[1]
+	nodes = [ helper.make_node('Tanh', [ 'input' ], [ 'input_tanh' ]) ]
+	inputs = [ create_tensor('input', [ STAND_IN_BATCH, 3, crop_size, crop_size ]) ]
+	if has_weight:
+		nodes.extend(
+		[
+			helper.make_node('Cast', [ 'weight' ], [ 'weight_float' ], to = TensorProto.FLOAT),
+			helper.make_node('Mul', [ 'weight_float', 'zero' ], [ 'weight_zero' ]),
+			helper.make_node('Add', [ 'input_tanh', 'weight_zero' ], [ 'output' ])
+		])
+		inputs.append(create_tensor('weight', [ 1 ], TensorProto.DOUBLE))
+	else:
+		nodes.append(helper.make_node('Identity', [ 'input_tanh' ], [ 'output' ]))
+	save_model(model_path, nodes, inputs, [ create_tensor('output', [ STAND_IN_BATCH, 3, crop_size, crop_size ]) ], [])
@@ -1,6 +1,6 @@
 from typing import List
 
-from facefusion.typing import FaceSelectorMode, FaceAnalyserOrder, FaceAnalyserAge, FaceAnalyserGender, FaceMaskType, FaceMaskRegion, TempFrameFormat, OutputVideoEncoder
+from facefusion.typing import FaceSelectorMode, FaceAnalyserOrder, FaceAnalyserAge, FaceAnalyserGender, FaceMaskType, FaceMaskRegion, TempFrameFormat, OutputVideoEncoder, ExecutionBackend, ExecutionPreset, ExecutionMode, ExecutionGraphOptimization
 from facefusion.common_helper import create_range
 
 face_analyser_orders : List[FaceAnalyserOrder] = [ 'left-right', 'right-left', 'top-bottom', 'bottom-top', 'small-large', 'large-small', 'best-worst', 'worst-best' ]
@@ -13,14 +13,30 @@ face_mask_types : List[FaceMaskType] = [ 'box', 'occlusion', 'region' ]
 face_mask_regions : List[FaceMaskRegion] = [ 'skin', 'left-eyebrow', 'right-eyebrow', 'left-eye', 'right-eye', 'eye-glasses', 'nose', 'mouth', 'upper-lip', 'lower-lip' ]
 temp_frame_formats : List[TempFrameFormat] = [ 'jpg', 'png' ]
 output_video_encoders : List[OutputVideoEncoder] = [ 'libx264', 'libx265', 'libvpx-vp9', 'h264_nvenc', 'hevc_nvenc' ]
+execution_backends : List[ExecutionBackend] = [ 'thread', 'process' ]
+execution_presets : List[ExecutionPreset] = [ 'throughput', 'latency' ]
+execution_modes : List[ExecutionMode] = [ 'sequential', 'parallel' ]
+execution_graph_optimizations : List[ExecutionGraphOptimization] = [ 'disabled', 'basic', 'extended', 'all' ]
+benchmark_resolutions : List[str] = [ '240p', '360p', '540p', '720p', '1080p', '1440p', '2160p' ]
 
 execution_thread_count_range : List[float] = create_range(1, 128, 1)
 execution_queue_count_range : List[float] = create_range(1, 32, 1)
+execution_session_count_range : List[float] = create_range(1, 32, 1)
+execution_session_concurrency_range : List[float] = create_range(1, 128, 1)
+execution_batch_size_range : List[float] = create_range(1, 32, 1)
+execution_batch_timeout_range : List[float] = create_range(1, 100, 1)
+execution_op_thread_count_range : List[float] = create_range(0, 128, 1)
 max_memory_range : List[float] = create_range(0, 128, 1)
 face_detector_score_range : List[float] = create_range(0.0, 1.0, 0.05)
+face_tracker_interval_range : List[float] = create_range(1, 60, 1)
+face_store_limit_range : List[float] = create_range(0, 1024, 16)
 face_mask_blur_range : List[float] = create_range(0.0, 1.0, 0.05)
 face_mask_padding_range : List[float] = create_range(0, 100, 1)
 reference_face_distance_range : List[float] = create_range(0.0, 1.5, 0.05)
 temp_frame_quality_range : List[float] = create_range(0, 100, 1)
+segment_duration_range : List[float] = create_range(0, 600, 10)
 output_image_quality_range : List[float] = create_range(0, 100, 1)
 output_video_quality_range : List[float] = create_range(0, 100, 1)
+benchmark_frame_total_range : List[float] = create_range(1, 1000, 1)
+benchmark_cycles_range : List[float] = create_range(1, 10, 1)
+benchmark_threshold_range : List[float] = create_range(0, 100, 1)
@@ -1,9 +1,8 @@
 from typing import Any, Dict
-from functools import lru_cache
+from functools import lru_cache, partial
 import threading
 import cv2
 import numpy
-import onnxruntime
 from tqdm import tqdm
 
 import facefusion.globals
@@ -12,6 +11,7 @@ from facefusion.typing import Frame, ModelValue
 from facefusion.vision import get_video_frame, count_video_frame_total, read_image, detect_fps
 from facefusion.filesystem import resolve_relative_path
 from facefusion.download import conditional_download
+from facefusion.session_pool import create_session_pool, create_inference_session
 
 CONTENT_ANALYSER = None
 THREAD_LOCK : threading.Lock = threading.Lock()
@@ -34,7 +34,7 @@ def get_content_analyser() -> Any:
 	with THREAD_LOCK:
 		if CONTENT_ANALYSER is None:
 			model_path = MODELS.get('open_nsfw').get('path')
-			CONTENT_ANALYSER = onnxruntime.InferenceSession(model_path, providers = facefusion.globals.execution_providers)
+			CONTENT_ANALYSER = create_session_pool(partial(create_inference_session, model_path))
 	return CONTENT_ANALYSER
 
 
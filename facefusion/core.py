@@ -1,6 +1,8 @@
+from typing import List
+from types import ModuleType
 import os
 
-os.environ['OMP_NUM_THREADS'] = '1'
+os.environ.setdefault('OMP_NUM_THREADS', '1')
 
 import signal
 import ssl
@@ -9,21 +11,27 @@ import warnings
 import platform
 import shutil
 import onnxruntime
-from argparse import ArgumentParser, HelpFormatter
+from argparse import ArgumentParser, HelpFormatter, Namespace
 
 import facefusion.choices
 import facefusion.globals
 from facefusion.face_analyser import get_one_face, get_average_face
-from facefusion.face_store import get_reference_faces, append_reference_face
-from facefusion.vision import get_video_frame, detect_fps, read_image, read_static_images
+from facefusion.face_store import get_reference_faces, append_reference_face, clear_reference_faces, clear_static_faces
+from facefusion.face_cache import load_face_cache, save_face_cache
+from facefusion.face_tracker import is_face_tracker_enabled
+from facefusion.vision import get_video_frame, detect_fps, count_video_frame_total, read_image, read_static_images
 from facefusion import face_analyser, face_masker, content_analyser, metadata, logger, wording
 from facefusion.content_analyser import analyse_image, analyse_video
-from facefusion.processors.frame.core import get_frame_processors_modules, load_frame_processor_module
+from facefusion.processors.frame.core import get_frame_processors_modules, clear_frame_processors_modules, group_frame_processors_modules, multi_process_stream, process_fused_video, register_frame_processors_args, apply_frame_processors_args
+from facefusion.processors.frame import globals as frame_processors_globals
+from facefusion.batch import read_batch_jobs, create_batch_job_args
+from facefusion.tracer import write_trace
 from facefusion.common_helper import create_metavar
-from facefusion.execution_helper import encode_execution_providers, decode_execution_providers
+from facefusion.execution_helper import encode_execution_providers, decode_execution_providers, apply_execution_preset
 from facefusion.normalizer import normalize_output_path, normalize_padding
 from facefusion.filesystem import is_image, is_video, list_module_names, get_temp_frame_paths, create_temp, move_temp, clear_temp
-from facefusion.ffmpeg import extract_frames, compress_image, merge_video, restore_audio
+from facefusion.job_manifest import create_job_manifest, resume_job_manifest, clear_job_manifest, is_job_stage_done, set_job_stage_done, set_job_frame_processors, restore_job_frames, get_job_pending_frame_paths
+from facefusion.ffmpeg import extract_frames, extract_stream_frames, compress_image, merge_video, merge_stream_frames, restore_audio
 
 onnxruntime.set_default_logger_severity(3)
 warnings.filterwarnings('ignore', category = UserWarning, module = 'gradio')
@@ -35,23 +43,50 @@ if platform.system().lower() == 'darwin':
 
 def cli() -> None:
 	signal.signal(signal.SIGINT, lambda signal_number, frame: destroy())
+	is_benchmark = sys.argv[1:2] == [ 'benchmark' ]
+	if is_benchmark:
+		sys.argv.pop(1)
+		if sys.argv[1:2] == [ 'compare' ]:
+			import facefusion.benchmark.core as benchmark
+
+			sys.argv.pop(1)
+			program = ArgumentParser(formatter_class = lambda prog: HelpFormatter(prog, max_help_position = 120))
+			benchmark.register_compare_args(program)
+			benchmark.run_compare(program)
+			return
 	program = ArgumentParser(formatter_class = lambda prog: HelpFormatter(prog, max_help_position = 120), add_help = False)
 	# general
 	program.add_argument('-s', '--source', action = 'append', help = wording.get('source_help'), dest = 'source_paths')
 	program.add_argument('-t', '--target', help = wording.get('target_help'), dest = 'target_path')
 	program.add_argument('-o', '--output', help = wording.get('output_help'), dest = 'output_path')
+	program.add_argument('--batch', help = wording.get('batch_help'), dest = 'batch_path')
 	program.add_argument('-v', '--version', version = metadata.get('name') + ' ' + metadata.get('version'), action = 'version')
 	# misc
 	group_misc = program.add_argument_group('misc')
 	group_misc.add_argument('--skip-download', help = wording.get('skip_download_help'), action = 'store_true')
+	group_misc.add_argument('--skip-face-cache', help = wording.get('skip_face_cache_help'), action = 'store_true')
 	group_misc.add_argument('--headless', help = wording.get('headless_help'), action = 'store_true')
 	group_misc.add_argument('--log-level', help = wording.get('log_level_help'), default = 'info', choices = logger.get_log_levels())
+	group_misc.add_argument('--trace-path', help = wording.get('trace_path_help'), dest = 'trace_path')
 	# execution
 	execution_providers = encode_execution_providers(onnxruntime.get_available_providers())
 	group_execution = program.add_argument_group('execution')
 	group_execution.add_argument('--execution-providers', help = wording.get('execution_providers_help').format(choices = ', '.join(execution_providers)), default = [ 'cpu' ], choices = execution_providers, nargs = '+', metavar = 'EXECUTION_PROVIDERS')
+	group_execution.add_argument('--execution-backend', help = wording.get('execution_backend_help'), default = 'thread', choices = facefusion.choices.execution_backends)
 	group_execution.add_argument('--execution-thread-count', help = wording.get('execution_thread_count_help'), type = int, default = 4, choices = facefusion.choices.execution_thread_count_range, metavar = create_metavar(facefusion.choices.execution_thread_count_range))
 	group_execution.add_argument('--execution-queue-count', help = wording.get('execution_queue_count_help'), type = int, default = 1, choices = facefusion.choices.execution_queue_count_range, metavar = create_metavar(facefusion.choices.execution_queue_count_range))
+	group_execution.add_argument('--execution-preset', help = wording.get('execution_preset_help'), choices = facefusion.choices.execution_presets)
+	group_execution.add_argument('--execution-session-count', help = wording.get('execution_session_count_help'), type = int, choices = facefusion.choices.execution_session_count_range, metavar = create_metavar(facefusion.choices.execution_session_count_range))
+	group_execution.add_argument('--execution-session-concurrency', help = wording.get('execution_session_concurrency_help'), type = int, choices = facefusion.choices.execution_session_concurrency_range, metavar = create_metavar(facefusion.choices.execution_session_concurrency_range))
+	group_execution.add_argument('--execution-batch-size', help = wording.get('execution_batch_size_help'), type = int, default = 1, choices = facefusion.choices.execution_batch_size_range, metavar = create_metavar(facefusion.choices.execution_batch_size_range))
+	group_execution.add_argument('--execution-batch-timeout', help = wording.get('execution_batch_timeout_help'), type = int, default = 5, choices = facefusion.choices.execution_batch_timeout_range, metavar = create_metavar(facefusion.choices.execution_batch_timeout_range))
+	group_execution.add_argument('--execution-intra-op-thread-count', help = wording.get('execution_intra_op_thread_count_help'), type = int, choices = facefusion.choices.execution_op_thread_count_range, metavar = create_metavar(facefusion.choices.execution_op_thread_count_range))
+	group_execution.add_argument('--execution-inter-op-thread-count', help = wording.get('execution_inter_op_thread_count_help'), type = int, choices = facefusion.choices.execution_op_thread_count_range, metavar = create_metavar(facefusion.choices.execution_op_thread_count_range))
+	group_execution.add_argument('--execution-mode', help = wording.get('execution_mode_help'), choices = facefusion.choices.execution_modes)
+	group_execution.add_argument('--execution-graph-optimization', help = wording.get('execution_graph_optimization_help'), choices = facefusion.choices.execution_graph_optimizations)
+	group_execution.add_argument('--execution-disable-memory-arena', help = wording.get('execution_disable_memory_arena_help'), action = 'store_true', default = None)
+	group_execution.add_argument('--execution-disable-spinning', help = wording.get('execution_disable_spinning_help'), action = 'store_true', default = None)
+	group_execution.add_argument('--execution-disable-model-cache', help = wording.get('execution_disable_model_cache_help'), action = 'store_true')
 	group_execution.add_argument('--max-memory', help = wording.get('max_memory_help'), type = int, choices = facefusion.choices.max_memory_range, metavar = create_metavar(facefusion.choices.max_memory_range))
 	# face analyser
 	group_face_analyser = program.add_argument_group('face analyser')
@@ -61,6 +96,8 @@ def cli() -> None:
 	group_face_analyser.add_argument('--face-detector-model', help = wording.get('face_detector_model_help'), default = 'retinaface', choices = facefusion.choices.face_detector_models)
 	group_face_analyser.add_argument('--face-detector-size', help = wording.get('face_detector_size_help'), default = '640x640', choices = facefusion.choices.face_detector_sizes)
 	group_face_analyser.add_argument('--face-detector-score', help = wording.get('face_detector_score_help'), type = float, default = 0.5, choices = facefusion.choices.face_detector_score_range, metavar = create_metavar(facefusion.choices.face_detector_score_range))
+	group_face_analyser.add_argument('--face-tracker-interval', help = wording.get('face_tracker_interval_help'), type = int, default = 1, choices = facefusion.choices.face_tracker_interval_range, metavar = create_metavar(facefusion.choices.face_tracker_interval_range))
+	group_face_analyser.add_argument('--face-store-limit', help = wording.get('face_store_limit_help'), type = int, default = 256, choices = facefusion.choices.face_store_limit_range, metavar = create_metavar(facefusion.choices.face_store_limit_range))
 	# face selector
 	group_face_selector = program.add_argument_group('face selector')
 	group_face_selector.add_argument('--face-selector-mode', help = wording.get('face_selector_mode_help'), default = 'reference', choices = facefusion.choices.face_selector_modes)
@@ -80,6 +117,9 @@ def cli() -> None:
 	group_frame_extraction.add_argument('--temp-frame-format', help = wording.get('temp_frame_format_help'), default = 'jpg', choices = facefusion.choices.temp_frame_formats)
 	group_frame_extraction.add_argument('--temp-frame-quality', help = wording.get('temp_frame_quality_help'), type = int, default = 100, choices = facefusion.choices.temp_frame_quality_range, metavar = create_metavar(facefusion.choices.temp_frame_quality_range))
 	group_frame_extraction.add_argument('--keep-temp', help = wording.get('keep_temp_help'), action = 'store_true')
+	group_frame_extraction.add_argument('--segment-duration', help = wording.get('segment_duration_help'), type = int, default = 60, choices = facefusion.choices.segment_duration_range, metavar = create_metavar(facefusion.choices.segment_duration_range))
+	group_frame_extraction.add_argument('--stream-frames', help = wording.get('stream_frames_help'), action = 'store_true')
+	group_frame_extraction.add_argument('--resume', help = wording.get('resume_help'), action = 'store_true')
 	# output creation
 	group_output_creation = program.add_argument_group('output creation')
 	group_output_creation.add_argument('--output-image-quality', help = wording.get('output_image_quality_help'), type = int, default = 80, choices = facefusion.choices.output_image_quality_range, metavar = create_metavar(facefusion.choices.output_image_quality_range))
@@ -92,29 +132,49 @@ def cli() -> None:
 	program = ArgumentParser(parents = [ program ], formatter_class = program.formatter_class, add_help = True)
 	group_frame_processors = program.add_argument_group('frame processors')
 	group_frame_processors.add_argument('--frame-processors', help = wording.get('frame_processors_help').format(choices = ', '.join(available_frame_processors)), default = [ 'face_swapper' ], nargs = '+')
-	for frame_processor in available_frame_processors:
-		frame_processor_module = load_frame_processor_module(frame_processor)
-		frame_processor_module.register_args(group_frame_processors)
+	register_frame_processors_args(group_frame_processors, available_frame_processors)
 	# uis
 	group_uis = program.add_argument_group('uis')
 	group_uis.add_argument('--ui-layouts', help = wording.get('ui_layouts_help').format(choices = ', '.join(list_module_names('facefusion/uis/layouts'))), default = [ 'default' ], nargs = '+')
-	run(program)
+	if is_benchmark:
+		import facefusion.benchmark.core as benchmark
+
+		benchmark.register_args(program)
+		benchmark.run(program)
+	else:
+		run(program)
 
 
-def apply_args(program : ArgumentParser) -> None:
-	args = program.parse_args()
+def apply_args(args : Namespace) -> None:
 	# general
 	facefusion.globals.source_paths = args.source_paths
 	facefusion.globals.target_path = args.target_path
 	facefusion.globals.output_path = normalize_output_path(facefusion.globals.source_paths, facefusion.globals.target_path, args.output_path)
+	facefusion.globals.batch_path = args.batch_path
 	# misc
 	facefusion.globals.skip_download = args.skip_download
+	facefusion.globals.skip_face_cache = args.skip_face_cache
 	facefusion.globals.headless = args.headless
 	facefusion.globals.log_level = args.log_level
+	facefusion.globals.trace_path = args.trace_path
 	# execution
 	facefusion.globals.execution_providers = decode_execution_providers(args.execution_providers)
+	facefusion.globals.execution_backend = args.execution_backend
 	facefusion.globals.execution_thread_count = args.execution_thread_count
 	facefusion.globals.execution_queue_count = args.execution_queue_count
+	facefusion.globals.execution_session_count = args.execution_session_count
+	facefusion.globals.execution_session_concurrency = args.execution_session_concurrency
+	facefusion.globals.execution_batch_size = args.execution_batch_size
+	facefusion.globals.execution_batch_timeout = args.execution_batch_timeout
+	facefusion.globals.execution_intra_op_thread_count = args.execution_intra_op_thread_count
+	facefusion.globals.execution_inter_op_thread_count = args.execution_inter_op_thread_count
+	facefusion.globals.execution_mode = args.execution_mode
+	facefusion.globals.execution_graph_optimization = args.execution_graph_optimization
+	facefusion.globals.execution_disable_memory_arena = args.execution_disable_memory_arena
+	facefusion.globals.execution_disable_spinning = args.execution_disable_spinning
+	facefusion.globals.execution_disable_model_cache = args.execution_disable_model_cache
+	facefusion.globals.execution_preset = args.execution_preset
+	apply_execution_preset(facefusion.globals.execution_preset)
 	facefusion.globals.max_memory = args.max_memory
 	# face analyser
 	facefusion.globals.face_analyser_order = args.face_analyser_order
@@ -123,6 +183,8 @@ def apply_args(program : ArgumentParser) -> None:
 	facefusion.globals.face_detector_model = args.face_detector_model
 	facefusion.globals.face_detector_size = args.face_detector_size
 	facefusion.globals.face_detector_score = args.face_detector_score
+	facefusion.globals.face_tracker_interval = args.face_tracker_interval
+	facefusion.globals.face_store_limit = args.face_store_limit
 	# face selector
 	facefusion.globals.face_selector_mode = args.face_selector_mode
 	facefusion.globals.reference_face_position = args.reference_face_position
@@ -139,6 +201,9 @@ def apply_args(program : ArgumentParser) -> None:
 	facefusion.globals.temp_frame_format = args.temp_frame_format
 	facefusion.globals.temp_frame_quality = args.temp_frame_quality
 	facefusion.globals.keep_temp = args.keep_temp
+	facefusion.globals.segment_duration = args.segment_duration
+	facefusion.globals.stream_frames = args.stream_frames
+	facefusion.globals.resume = args.resume
 	# output creation
 	facefusion.globals.output_image_quality = args.output_image_quality
 	facefusion.globals.output_video_encoder = args.output_video_encoder
@@ -146,17 +211,14 @@ def apply_args(program : ArgumentParser) -> None:
 	facefusion.globals.keep_fps = args.keep_fps
 	facefusion.globals.skip_audio = args.skip_audio
 	# frame processors
-	available_frame_processors = list_module_names('facefusion/processors/frame/modules')
 	facefusion.globals.frame_processors = args.frame_processors
-	for frame_processor in available_frame_processors:
-		frame_processor_module = load_frame_processor_module(frame_processor)
-		frame_processor_module.apply_args(program)
+	apply_frame_processors_args(args)
 	# uis
 	facefusion.globals.ui_layouts = args.ui_layouts
 
 
 def run(program : ArgumentParser) -> None:
-	apply_args(program)
+	apply_args(program.parse_args())
 	logger.init(facefusion.globals.log_level)
 	limit_resources()
 	if not pre_check() or not content_analyser.pre_check() or not face_analyser.pre_check() or not face_masker.pre_check():
@@ -164,8 +226,12 @@ def run(program : ArgumentParser) -> None:
 	for frame_processor_module in get_frame_processors_modules(facefusion.globals.frame_processors):
 		if not frame_processor_module.pre_check():
 			return
-	if facefusion.globals.headless:
+	if facefusion.globals.batch_path:
+		process_batch(program)
+		conditional_write_trace()
+	elif facefusion.globals.headless:
 		conditional_process()
+		conditional_write_trace()
 	else:
 		import facefusion.uis.core as ui
 
@@ -207,6 +273,61 @@ def pre_check() -> bool:
 	return True
 
 
+def process_batch(program : ArgumentParser) -> None:
+	if facefusion.globals.source_paths or facefusion.globals.target_path or facefusion.globals.output_path:
+		logger.error(wording.get('batch_paths_not_supported'), __name__.upper())
+		return
+	batch_jobs = read_batch_jobs(facefusion.globals.batch_path)
+	if not batch_jobs:
+		logger.error(wording.get('batch_not_loaded'), __name__.upper())
+		return
+	batch_jobs_args = [ sys.argv[1:] + create_batch_job_args(batch_job) for batch_job in batch_jobs ]
+	for batch_job_args in batch_jobs_args:
+		batch_job_namespace, _ = program.parse_known_args(batch_job_args)
+		register_frame_processors_args(program, batch_job_namespace.frame_processors)
+	batch_jobs_namespaces = [ program.parse_args(batch_job_args) for batch_job_args in batch_jobs_args ]
+	batch_job_overrides = None
+	try:
+		for index, batch_job in enumerate(batch_jobs):
+			has_overrides_changed = batch_job.get('args', []) != batch_job_overrides
+			if has_overrides_changed:
+				for frame_processor_module in get_frame_processors_modules(facefusion.globals.frame_processors):
+					frame_processor_module.post_process()
+				clear_frame_processors_modules()
+			apply_args(batch_jobs_namespaces[index])
+			if has_overrides_changed:
+				batch_job_overrides = batch_job.get('args', [])
+				for frame_processor_module in get_frame_processors_modules(facefusion.globals.frame_processors):
+					frame_processor_model = getattr(frame_processors_globals, frame_processor_module.__name__.split('.')[-1] + '_model', None)
+					if frame_processor_model:
+						frame_processor_module.set_options('model', frame_processor_module.MODELS[frame_processor_model])
+					if not frame_processor_module.pre_check():
+						return
+			facefusion.globals.batch_job_id = str(index + 1).zfill(4)
+			clear_reference_faces()
+			clear_static_faces()
+			if facefusion.globals.output_path:
+				logger.info(wording.get('processing_batch_job').format(batch_job_number = index + 1, batch_job_total = len(batch_jobs)), __name__.upper())
+				conditional_process()
+			else:
+				logger.error(wording.get('batch_job_skipped').format(batch_job_number = index + 1), __name__.upper())
+	finally:
+		facefusion.globals.batch_job_id = None
+	for frame_processor_module in get_frame_processors_modules(facefusion.globals.frame_processors):
+		frame_processor_module.post_process()
+
+
+def conditional_write_trace() -> None:
+	if facefusion.globals.trace_path and not write_trace(facefusion.globals.trace_path):
+		logger.error(wording.get('writing_trace_failed'), __name__.upper())
+
+
+def conditional_post_process(frame_processors_modules : List[ModuleType]) -> None:
+	if not facefusion.globals.batch_path:
+		for frame_processor_module in frame_processors_modules:
+			frame_processor_module.post_process()
+
+
 def conditional_process() -> None:
 	conditional_append_reference_faces()
 	for frame_processor_module in get_frame_processors_modules(facefusion.globals.frame_processors):
@@ -243,7 +364,7 @@ def process_image() -> None:
 	for frame_processor_module in get_frame_processors_modules(facefusion.globals.frame_processors):
 		logger.info(wording.get('processing'), frame_processor_module.NAME)
 		frame_processor_module.process_image(facefusion.globals.source_paths, facefusion.globals.output_path, facefusion.globals.output_path)
-		frame_processor_module.post_process()
+		conditional_post_process([ frame_processor_module ])
 	# compress image
 	logger.info(wording.get('compressing_image'), __name__.upper())
 	if not compress_image(facefusion.globals.output_path):
@@ -256,44 +377,92 @@ def process_image() -> None:
 
 
 def process_video() -> None:
+	if facefusion.globals.stream_frames and is_face_tracker_enabled():
+		logger.error(wording.get('streaming_frames_face_tracker_not_supported'), __name__.upper())
+		return
 	if analyse_video(facefusion.globals.target_path, facefusion.globals.trim_frame_start, facefusion.globals.trim_frame_end):
 		return
 	fps = detect_fps(facefusion.globals.target_path) if facefusion.globals.keep_fps else 25.0
 	# create temp
 	logger.info(wording.get('creating_temp'), __name__.upper())
 	create_temp(facefusion.globals.target_path)
-	# extract frames
-	logger.info(wording.get('extracting_frames_fps').format(fps = fps), __name__.upper())
-	extract_frames(facefusion.globals.target_path, fps)
-	# process frame
-	temp_frame_paths = get_temp_frame_paths(facefusion.globals.target_path)
-	if temp_frame_paths:
-		for frame_processor_module in get_frame_processors_modules(facefusion.globals.frame_processors):
-			logger.info(wording.get('processing'), frame_processor_module.NAME)
-			frame_processor_module.process_video(facefusion.globals.source_paths, temp_frame_paths)
-			frame_processor_module.post_process()
+	if not facefusion.globals.skip_face_cache:
+		load_face_cache(facefusion.globals.target_path, fps)
+	if facefusion.globals.stream_frames:
+		clear_job_manifest()
+		# stream frames
+		logger.info(wording.get('streaming_frames_fps').format(fps = fps), __name__.upper())
+		if not process_video_stream(fps):
+			logger.error(wording.get('streaming_frames_failed'), __name__.upper())
+			return
+		if not save_face_cache():
+			logger.warn(wording.get('saving_face_cache_skipped'), __name__.upper())
 	else:
-		logger.error(wording.get('temp_frames_not_found'), __name__.upper())
-		return
-	# merge video
-	logger.info(wording.get('merging_video_fps').format(fps = fps), __name__.upper())
-	if not merge_video(facefusion.globals.target_path, fps):
-		logger.error(wording.get('merging_video_failed'), __name__.upper())
-		return
+		# resume job
+		if facefusion.globals.resume and resume_job_manifest(facefusion.globals.target_path):
+			logger.info(wording.get('resuming_job'), __name__.upper())
+		else:
+			create_job_manifest(facefusion.globals.target_path)
+		# extract frames
+		if not is_job_stage_done('extract_frames'):
+			logger.info(wording.get('extracting_frames_fps').format(fps = fps), __name__.upper())
+			if extract_frames(facefusion.globals.target_path, fps):
+				set_job_stage_done('extract_frames')
+		# process frame
+		temp_frame_paths = get_temp_frame_paths(facefusion.globals.target_path)
+		if temp_frame_paths:
+			for index, frame_processors_modules in enumerate(group_frame_processors_modules(get_frame_processors_modules(facefusion.globals.frame_processors))):
+				frame_processors_names = [ frame_processor_module.NAME for frame_processor_module in frame_processors_modules ]
+				restore_job_frames(frame_processors_names, temp_frame_paths)
+				pending_temp_frame_paths = get_job_pending_frame_paths(frame_processors_names, temp_frame_paths)
+				for frame_processor_module in frame_processors_modules:
+					logger.info(wording.get('processing'), frame_processor_module.NAME)
+				set_job_frame_processors(frame_processors_names)
+				process_fused_video(frame_processors_modules, facefusion.globals.source_paths, pending_temp_frame_paths)
+				set_job_frame_processors([])
+				if index == 0 and not save_face_cache():
+					logger.warn(wording.get('saving_face_cache_skipped'), __name__.upper())
+				conditional_post_process(frame_processors_modules)
+		else:
+			logger.error(wording.get('temp_frames_not_found'), __name__.upper())
+			return
+		# merge video
+		if not is_job_stage_done('merge_video'):
+			logger.info(wording.get('merging_video_fps').format(fps = fps), __name__.upper())
+			if not merge_video(facefusion.globals.target_path, fps):
+				logger.error(wording.get('merging_video_failed'), __name__.upper())
+				return
+			set_job_stage_done('merge_video')
 	# handle audio
-	if facefusion.globals.skip_audio:
-		logger.info(wording.get('skipping_audio'), __name__.upper())
-		move_temp(facefusion.globals.target_path, facefusion.globals.output_path)
-	else:
-		logger.info(wording.get('restoring_audio'), __name__.upper())
-		if not restore_audio(facefusion.globals.target_path, facefusion.globals.output_path):
-			logger.warn(wording.get('restoring_audio_skipped'), __name__.upper())
+	if not is_job_stage_done('restore_audio'):
+		if facefusion.globals.skip_audio:
+			logger.info(wording.get('skipping_audio'), __name__.upper())
 			move_temp(facefusion.globals.target_path, facefusion.globals.output_path)
+		else:
+			logger.info(wording.get('restoring_audio'), __name__.upper())
+			if not restore_audio(facefusion.globals.target_path, facefusion.globals.output_path):
+				logger.warn(wording.get('restoring_audio_skipped'), __name__.upper())
+				move_temp(facefusion.globals.target_path, facefusion.globals.output_path)
+		set_job_stage_done('restore_audio')
 	# clear temp
 	logger.info(wording.get('clearing_temp'), __name__.upper())
 	clear_temp(facefusion.globals.target_path)
+	clear_job_manifest()
 	# validate video
 	if is_video(facefusion.globals.output_path):
 		logger.info(wording.get('processing_video_succeed'), __name__.upper())
 	else:
 		logger.error(wording.get('processing_video_failed'), __name__.upper())
+
+
+def process_video_stream(fps : float) -> bool:
+	video_fps = detect_fps(facefusion.globals.target_path)
+	video_frame_total = count_video_frame_total(facefusion.globals.target_path)
+	trim_frame_start = facefusion.globals.trim_frame_start or 0
+	trim_frame_end = facefusion.globals.trim_frame_end or video_frame_total
+	frame_total = round((trim_frame_end - trim_frame_start) * fps / video_fps) if video_fps else 0
+	temp_frames = extract_stream_frames(facefusion.globals.target_path, fps)
+	result_frames = multi_process_stream(facefusion.globals.source_paths, temp_frames, frame_total)
+	is_merged = merge_stream_frames(facefusion.globals.target_path, fps, result_frames)
+	conditional_post_process(get_frame_processors_modules(facefusion.globals.frame_processors))
+	return is_merged
@@ -1,6 +1,10 @@
-from typing import List
+from typing import Any, Dict, List, Optional
+import os
 import onnxruntime
 
+import facefusion.globals
+from facefusion.typing import ExecutionPreset
+
 
 def encode_execution_providers(execution_providers : List[str]) -> List[str]:
 	return [ execution_provider.replace('ExecutionProvider', '').lower() for execution_provider in execution_providers ]
@@ -20,3 +24,33 @@ def map_device(execution_providers : List[str]) -> str:
 	if 'OpenVINOExecutionProvider' in execution_providers:
 		return 'mkl'
 	return 'cpu'
+
+
+def apply_execution_preset(execution_preset : Optional[ExecutionPreset]) -> None:
+	for key, value in get_execution_preset(execution_preset).items():
+		if getattr(facefusion.globals, key) is None:
+			setattr(facefusion.globals, key, value)
+
+
+def get_execution_preset(execution_preset : Optional[ExecutionPreset]) -> Dict[str, Any]:
+	if execution_preset == 'throughput':
+		return\
+		{
+			'execution_session_count': facefusion.globals.execution_thread_count,
+			'execution_session_concurrency': 1,
+			'execution_intra_op_thread_count': 1,
+			'execution_inter_op_thread_count': 1,
+			'execution_mode': 'sequential',
+			'execution_disable_spinning': True
+		}
+	if execution_preset == 'latency':
+		return\
+		{
+			'execution_session_count': 1,
+			'execution_session_concurrency': 1,
+			'execution_intra_op_thread_count': os.cpu_count(),
+			'execution_inter_op_thread_count': 1,
+			'execution_mode': 'sequential',
+			'execution_disable_spinning': False
+		}
+	return {}
@@ -1,20 +1,25 @@
-from typing import Any, Optional, List, Tuple
+from typing import Any, Callable, Dict, Optional, List, Tuple
+from functools import partial
 import threading
 import cv2
 import numpy
-import onnxruntime
 
 import facefusion.globals
 from facefusion.download import conditional_download
-from facefusion.face_store import get_static_faces, set_static_faces
+from facefusion.session_pool import create_session_pool, create_inference_session
+from facefusion.session_batcher import create_session_batcher
+from facefusion.face_store import get_static_faces, set_static_faces, get_context_frame_number, get_context_faces, set_context_faces, get_reference_embeddings, create_embedding_matrix
+from facefusion.face_cache import get_cached_faces, set_cached_faces, is_face_cache_entry_complete
+from facefusion.tracer import trace
+from facefusion.face_tracker import track_faces, set_tracker_faces, find_tracked_face, is_face_tracker_keyframe
 from facefusion.face_helper import warp_face, create_static_anchors, distance_to_kps, distance_to_bbox, apply_nms
 from facefusion.filesystem import resolve_relative_path
-from facefusion.typing import Frame, Face, FaceSet, FaceAnalyserOrder, FaceAnalyserAge, FaceAnalyserGender, ModelSet, Bbox, Kps, Score, Embedding
+from facefusion.typing import Frame, Face, FaceAttributes, FaceCacheEntry, FaceSet, FaceAnalyserOrder, FaceAnalyserAge, FaceAnalyserGender, ModelSet, Bbox, Kps, Embedding
 from facefusion.vision import resize_frame_dimension
 
 FACE_ANALYSER = None
-THREAD_SEMAPHORE : threading.Semaphore = threading.Semaphore()
 THREAD_LOCK : threading.Lock = threading.Lock()
+DETECTOR_BUFFERS : threading.local = threading.local()
 MODELS : ModelSet =\
 {
 	'face_detector_retinaface':
@@ -56,16 +61,16 @@ def get_face_analyser() -> Any:
 	with THREAD_LOCK:
 		if FACE_ANALYSER is None:
 			if facefusion.globals.face_detector_model == 'retinaface':
-				face_detector = onnxruntime.InferenceSession(MODELS.get('face_detector_retinaface').get('path'), providers = facefusion.globals.execution_providers)
+				face_detector = create_session_pool(partial(create_inference_session, MODELS.get('face_detector_retinaface').get('path')))
 			if facefusion.globals.face_detector_model == 'yunet':
-				face_detector = cv2.FaceDetectorYN.create(MODELS.get('face_detector_yunet').get('path'), '', (0, 0))
+				face_detector = create_session_pool(partial(cv2.FaceDetectorYN.create, MODELS.get('face_detector_yunet').get('path'), '', (0, 0)), 1)
 			if facefusion.globals.face_recognizer_model == 'arcface_blendswap':
-				face_recognizer = onnxruntime.InferenceSession(MODELS.get('face_recognizer_arcface_blendswap').get('path'), providers = facefusion.globals.execution_providers)
+				face_recognizer = create_session_batcher(create_session_pool(partial(create_inference_session, MODELS.get('face_recognizer_arcface_blendswap').get('path'))))
 			if facefusion.globals.face_recognizer_model == 'arcface_inswapper':
-				face_recognizer = onnxruntime.InferenceSession(MODELS.get('face_recognizer_arcface_inswapper').get('path'), providers = facefusion.globals.execution_providers)
+				face_recognizer = create_session_batcher(create_session_pool(partial(create_inference_session, MODELS.get('face_recognizer_arcface_inswapper').get('path'))))
 			if facefusion.globals.face_recognizer_model == 'arcface_simswap':
-				face_recognizer = onnxruntime.InferenceSession(MODELS.get('face_recognizer_arcface_simswap').get('path'), providers = facefusion.globals.execution_providers)
-			gender_age = onnxruntime.InferenceSession(MODELS.get('gender_age').get('path'), providers = facefusion.globals.execution_providers)
+				face_recognizer = create_session_batcher(create_session_pool(partial(create_inference_session, MODELS.get('face_recognizer_arcface_simswap').get('path'))))
+			gender_age = create_session_batcher(create_session_pool(partial(create_inference_session, MODELS.get('gender_age').get('path'))))
 			FACE_ANALYSER =\
 			{
 				'face_detector': face_detector,
@@ -96,7 +101,8 @@ def pre_check() -> bool:
 	return True
 
 
-def extract_faces(frame: Frame) -> List[Face]:
+@trace('extract_faces')
+def extract_faces(frame: Frame, tracked_faces : Optional[List[Face]] = None) -> List[Face]:
 	face_detector_width, face_detector_height = map(int, facefusion.globals.face_detector_size.split('x'))
 	frame_height, frame_width, _ = frame.shape
 	temp_frame = resize_frame_dimension(frame, face_detector_width, face_detector_height)
@@ -104,15 +110,16 @@ def extract_faces(frame: Frame) -> List[Face]:
 	ratio_height = frame_height / temp_frame_height
 	ratio_width = frame_width / temp_frame_width
 	if facefusion.globals.face_detector_model == 'retinaface':
-		bbox_list, kps_list, score_list = detect_with_retinaface(temp_frame, temp_frame_height, temp_frame_width, face_detector_height, face_detector_width, ratio_height, ratio_width)
-		return create_faces(frame, bbox_list, kps_list, score_list)
+		bboxes, kps_array, scores = detect_with_retinaface(temp_frame, temp_frame_height, temp_frame_width, face_detector_height, face_detector_width, ratio_height, ratio_width)
+		return create_faces(frame, bboxes, kps_array, scores, tracked_faces)
 	elif facefusion.globals.face_detector_model == 'yunet':
-		bbox_list, kps_list, score_list = detect_with_yunet(temp_frame, temp_frame_height, temp_frame_width, ratio_height, ratio_width)
-		return create_faces(frame, bbox_list, kps_list, score_list)
+		bboxes, kps_array, scores = detect_with_yunet(temp_frame, temp_frame_height, temp_frame_width, ratio_height, ratio_width)
+		return create_faces(frame, bboxes, kps_array, scores, tracked_faces)
 	return []
 
 
-def detect_with_retinaface(temp_frame : Frame, temp_frame_height : int, temp_frame_width : int, face_detector_height : int, face_detector_width : int, ratio_height : float, ratio_width : float) -> Tuple[List[Bbox], List[Kps], List[Score]]:
+@trace('detect_faces')
+def detect_with_retinaface(temp_frame : Frame, temp_frame_height : int, temp_frame_width : int, face_detector_height : int, face_detector_width : int, ratio_height : float, ratio_width : float) -> Tuple[Bbox, Kps, numpy.ndarray[Any, Any]]:
 	face_detector = get_face_analyser().get('face_detector')
 	bbox_list = []
 	kps_list = []
@@ -120,113 +127,169 @@ def detect_with_retinaface(temp_frame : Frame, temp_frame_height : int, temp_fra
 	feature_strides = [ 8, 16, 32 ]
 	feature_map_channel = 3
 	anchor_total = 2
-	prepare_frame = numpy.zeros((face_detector_height, face_detector_width, 3))
-	prepare_frame[:temp_frame_height, :temp_frame_width, :] = temp_frame
-	temp_frame = (prepare_frame - 127.5) / 128.0
-	temp_frame = numpy.expand_dims(temp_frame.transpose(2, 0, 1), axis = 0).astype(numpy.float32)
-	with THREAD_SEMAPHORE:
-		detections = face_detector.run(None,
-		{
-			face_detector.get_inputs()[0].name: temp_frame
-		})
+	temp_frame = prepare_detector_frame(temp_frame, face_detector_height, face_detector_width)
+	detections = face_detector.run(None,
+	{
+		face_detector.get_inputs()[0].name: temp_frame
+	})
 	for index, feature_stride in enumerate(feature_strides):
-		keep_indices = numpy.where(detections[index] >= facefusion.globals.face_detector_score)[0]
-		if keep_indices.any():
+		keep_indices = numpy.where(detections[index][:, 0] >= facefusion.globals.face_detector_score)[0]
+		if keep_indices.size:
 			stride_height = face_detector_height // feature_stride
 			stride_width = face_detector_width // feature_stride
-			anchors = create_static_anchors(feature_stride, anchor_total, stride_height, stride_width)
-			bbox_raw = (detections[index + feature_map_channel] * feature_stride)
-			kps_raw = detections[index + feature_map_channel * 2] * feature_stride
-			for bbox in distance_to_bbox(anchors, bbox_raw)[keep_indices]:
-				bbox_list.append(numpy.array(
-				[
-					bbox[0] * ratio_width,
-					bbox[1] * ratio_height,
-					bbox[2] * ratio_width,
-					bbox[3] * ratio_height
-				]))
-			for kps in distance_to_kps(anchors, kps_raw)[keep_indices]:
-				kps_list.append(kps * [ ratio_width, ratio_height ])
-			for score in detections[index][keep_indices]:
-				score_list.append(score[0])
-	return bbox_list, kps_list, score_list
-
-
-def detect_with_yunet(temp_frame : Frame, temp_frame_height : int, temp_frame_width : int, ratio_height : float, ratio_width : float) -> Tuple[List[Bbox], List[Kps], List[Score]]:
+			anchors = create_static_anchors(feature_stride, anchor_total, stride_height, stride_width)[keep_indices]
+			bbox_raw = detections[index + feature_map_channel][keep_indices] * feature_stride
+			kps_raw = detections[index + feature_map_channel * 2][keep_indices] * feature_stride
+			bbox_list.append(distance_to_bbox(anchors, bbox_raw))
+			kps_list.append(distance_to_kps(anchors, kps_raw))
+			score_list.append(detections[index][keep_indices, 0])
+	if not score_list:
+		return numpy.empty((0, 4)), numpy.empty((0, 5, 2)), numpy.empty(0)
+	bboxes = numpy.concatenate(bbox_list) * [ ratio_width, ratio_height, ratio_width, ratio_height ]
+	kps_array = numpy.concatenate(kps_list) * [ ratio_width, ratio_height ]
+	scores = numpy.concatenate(score_list)
+	return bboxes, kps_array, scores
+
+
+def prepare_detector_frame(temp_frame : Frame, face_detector_height : int, face_detector_width : int) -> Frame:
+	detector_buffers = getattr(DETECTOR_BUFFERS, 'value', None)
+	if detector_buffers is None:
+		detector_buffers = DETECTOR_BUFFERS.value = {}
+	temp_frame_height, temp_frame_width, _ = temp_frame.shape
+	detector_buffer, detector_frame_shape = detector_buffers.get((face_detector_height, face_detector_width), (None, None))
+	if detector_buffer is None:
+		detector_buffer = numpy.empty((1, 3, face_detector_height, face_detector_width), dtype = numpy.float32)
+	if detector_frame_shape != temp_frame.shape:
+		detector_buffer.fill(-127.5 / 128.0)
+	detector_frame = detector_buffer[0, :, :temp_frame_height, :temp_frame_width]
+	numpy.subtract(temp_frame.transpose(2, 0, 1), 127.5, out = detector_frame, dtype = numpy.float32)
+	detector_frame *= 1 / 128.0
+	detector_buffers[(face_detector_height, face_detector_width)] = (detector_buffer, temp_frame.shape)
+	return detector_buffer
+
+
+@trace('detect_faces')
+def detect_with_yunet(temp_frame : Frame, temp_frame_height : int, temp_frame_width : int, ratio_height : float, ratio_width : float) -> Tuple[Bbox, Kps, numpy.ndarray[Any, Any]]:
 	face_detector = get_face_analyser().get('face_detector')
-	face_detector.setInputSize((temp_frame_width, temp_frame_height))
-	face_detector.setScoreThreshold(facefusion.globals.face_detector_score)
-	bbox_list = []
-	kps_list = []
-	score_list = []
-	with THREAD_SEMAPHORE:
-		_, detections = face_detector.detect(temp_frame)
-	if detections.any():
-		for detection in detections:
-			bbox_list.append(numpy.array(
-			[
-				detection[0] * ratio_width,
-				detection[1] * ratio_height,
-				(detection[0] + detection[2]) * ratio_width,
-				(detection[1] + detection[3]) * ratio_height
-			]))
-			kps_list.append(detection[4:14].reshape((5, 2)) * [ ratio_width, ratio_height])
-			score_list.append(detection[14])
-	return bbox_list, kps_list, score_list
-
-
-def create_faces(frame : Frame, bbox_list : List[Bbox], kps_list : List[Kps], score_list : List[Score]) -> List[Face]:
+	with face_detector.acquire() as face_detector_session:
+		face_detector_session.setInputSize((temp_frame_width, temp_frame_height))
+		face_detector_session.setScoreThreshold(facefusion.globals.face_detector_score)
+		_, detections = face_detector_session.detect(temp_frame)
+	if detections is None or not detections.any():
+		return numpy.empty((0, 4)), numpy.empty((0, 5, 2)), numpy.empty(0)
+	bboxes = numpy.column_stack([ detections[:, :2], detections[:, :2] + detections[:, 2:4] ]) * [ ratio_width, ratio_height, ratio_width, ratio_height ]
+	kps_array = detections[:, 4:14].reshape((-1, 5, 2)) * [ ratio_width, ratio_height ]
+	scores = detections[:, 14]
+	return bboxes, kps_array, scores
+
+
+def create_faces(frame : Frame, bboxes : Bbox, kps_array : Kps, scores : numpy.ndarray[Any, Any], tracked_faces : Optional[List[Face]] = None) -> List[Face]:
 	faces = []
 	if facefusion.globals.face_detector_score > 0:
-		sort_indices = numpy.argsort(-numpy.array(score_list))
-		bbox_list = [ bbox_list[index] for index in sort_indices ]
-		kps_list = [ kps_list[index] for index in sort_indices ]
-		score_list = [ score_list[index] for index in sort_indices ]
-		keep_indices = apply_nms(bbox_list, 0.4)
-		for index in keep_indices:
-			bbox = bbox_list[index]
-			kps = kps_list[index]
-			score = score_list[index]
-			embedding, normed_embedding = calc_embedding(frame, kps)
-			gender, age = detect_gender_age(frame, kps)
+		keep_indices = apply_nms(bboxes, scores, 0.4)
+		tracked_face_list = [ find_tracked_face(tracked_faces, bboxes[index]) if tracked_faces else None for index in keep_indices ]
+		analyse_kps_list = [ kps_array[index] for index, tracked_face in zip(keep_indices, tracked_face_list) if tracked_face is None ]
+		face_attributes_list = iter(create_face_attributes(frame, analyse_kps_list))
+		for index, tracked_face in zip(keep_indices, tracked_face_list):
 			faces.append(Face(
-				bbox = bbox,
-				kps = kps,
-				score = score,
-				embedding = embedding,
-				normed_embedding = normed_embedding,
-				gender = gender,
-				age = age
+				bbox = bboxes[index],
+				kps = kps_array[index],
+				score = scores[index],
+				attributes = tracked_face.attributes if tracked_face else next(face_attributes_list)
 			))
 	return faces
 
 
+def create_cached_faces(frame : Frame, face_cache_entry : FaceCacheEntry) -> List[Face]:
+	faces = []
+	kps_list = list(face_cache_entry.get('kps'))
+	if is_face_cache_entry_complete(face_cache_entry):
+		face_attributes_list = [ FaceAttributes() for _ in kps_list ]
+	else:
+		face_attributes_list = create_face_attributes(frame, kps_list)
+	for index, face_attributes in enumerate(face_attributes_list):
+		if face_cache_entry.get('embeddings') is not None:
+			face_attributes.values['embedding'] = face_cache_entry.get('embeddings')[index]
+			face_attributes.values['normed_embedding'] = face_cache_entry.get('normed_embeddings')[index]
+		if face_cache_entry.get('genders') is not None:
+			face_attributes.values['gender'] = int(face_cache_entry.get('genders')[index])
+			face_attributes.values['age'] = int(face_cache_entry.get('ages')[index])
+		faces.append(Face(
+			bbox = face_cache_entry.get('bboxes')[index],
+			kps = face_cache_entry.get('kps')[index],
+			score = float(face_cache_entry.get('scores')[index]),
+			attributes = face_attributes
+		))
+	return faces
+
+
+def create_face_attributes(frame : Frame, kps_list : List[Kps]) -> List[FaceAttributes]:
+	face_attributes_list = [ FaceAttributes() for _ in kps_list ]
+	if kps_list:
+		get_crop_frames : Callable[[int], List[Frame]] = partial(warp_crop_frames, frame, kps_list)
+		if get_context_frame_number(frame) is None:
+			crop_frames_set = { crop_size: get_crop_frames(crop_size) for crop_size in [ 112, 96 ] }
+			get_crop_frames = crop_frames_set.__getitem__
+		load_attribute = partial(load_face_attribute, get_crop_frames, [ face_attributes.values for face_attributes in face_attributes_list ])
+		for face_attributes in face_attributes_list:
+			face_attributes.load_attribute = load_attribute
+	return face_attributes_list
+
+
+def warp_crop_frames(frame : Frame, kps_list : List[Kps], crop_size : int) -> List[Frame]:
+	return [ warp_face(frame, kps, 'arcface_112_v2', (crop_size, crop_size))[0] for kps in kps_list ]
+
+
+def load_face_attribute(get_crop_frames : Callable[[int], List[Frame]], face_attributes_values : List[Dict[str, Any]], name : str) -> None:
+	if name in [ 'embedding', 'normed_embedding' ]:
+		for values, (embedding, normed_embedding) in zip(face_attributes_values, calc_embeddings(get_crop_frames(112))):
+			values['embedding'] = embedding
+			values['normed_embedding'] = normed_embedding
+	if name in [ 'gender', 'age' ]:
+		for values, (gender, age) in zip(face_attributes_values, detect_genders_ages(get_crop_frames(96))):
+			values['gender'] = gender
+			values['age'] = age
+
+
 def calc_embedding(temp_frame : Frame, kps : Kps) -> Tuple[Embedding, Embedding]:
+	crop_frame, _ = warp_face(temp_frame, kps, 'arcface_112_v2', (112, 112))
+	return calc_embeddings([ crop_frame ])[0]
+
+
+@trace('calc_embedding')
+def calc_embeddings(crop_frame_list : List[Frame]) -> List[Tuple[Embedding, Embedding]]:
 	face_recognizer = get_face_analyser().get('face_recognizer')
-	crop_frame, matrix = warp_face(temp_frame, kps, 'arcface_112_v2', (112, 112))
-	crop_frame = crop_frame.astype(numpy.float32) / 127.5 - 1
-	crop_frame = crop_frame[:, :, ::-1].transpose(2, 0, 1)
-	crop_frame = numpy.expand_dims(crop_frame, axis = 0)
-	embedding = face_recognizer.run(None,
-	{
-		face_recognizer.get_inputs()[0].name: crop_frame
-	})[0]
-	embedding = embedding.ravel()
-	normed_embedding = embedding / numpy.linalg.norm(embedding)
-	return embedding, normed_embedding
+	crop_frames = numpy.stack(crop_frame_list).astype(numpy.float32) / 127.5 - 1
+	crop_frames = crop_frames[:, :, :, ::-1].transpose(0, 3, 1, 2)
+	embeddings = run_face_batch(face_recognizer, crop_frames)
+	embeddings = embeddings.reshape(len(crop_frame_list), -1)
+	normed_embeddings = embeddings / numpy.linalg.norm(embeddings, axis = 1, keepdims = True)
+	return list(zip(embeddings, normed_embeddings))
 
 
 def detect_gender_age(frame : Frame, kps : Kps) -> Tuple[int, int]:
+	crop_frame, _ = warp_face(frame, kps, 'arcface_112_v2', (96, 96))
+	return detect_genders_ages([ crop_frame ])[0]
+
+
+@trace('detect_gender_age')
+def detect_genders_ages(crop_frame_list : List[Frame]) -> List[Tuple[int, int]]:
 	gender_age = get_face_analyser().get('gender_age')
-	crop_frame, affine_matrix = warp_face(frame, kps, 'arcface_112_v2', (96, 96))
-	crop_frame = numpy.expand_dims(crop_frame, axis = 0).transpose(0, 3, 1, 2).astype(numpy.float32)
-	prediction = gender_age.run(None,
-	{
-		gender_age.get_inputs()[0].name: crop_frame
-	})[0][0]
-	gender = int(numpy.argmax(prediction[:2]))
-	age = int(numpy.round(prediction[2] * 100))
-	return gender, age
+	crop_frames = numpy.stack(crop_frame_list).transpose(0, 3, 1, 2).astype(numpy.float32)
+	predictions = run_face_batch(gender_age, crop_frames)
+	genders = numpy.argmax(predictions[:, :2], axis = 1)
+	ages = numpy.round(predictions[:, 2] * 100)
+	return [ (int(gender), int(age)) for gender, age in zip(genders, ages) ]
+
+
+def run_face_batch(face_model : Any, crop_frames : numpy.ndarray[Any, Any]) -> numpy.ndarray[Any, Any]:
+	input_name = face_model.get_inputs()[0].name
+	if face_model.batch_support:
+		return face_model.run(None,
+		{
+			input_name: crop_frames
+		})[0]
+	return numpy.concatenate([ face_model.run(None, { input_name: crop_frame[numpy.newaxis] })[0] for crop_frame in crop_frames ])
 
 
 def get_one_face(frame : Frame, position : int = 0) -> Optional[Face]:
@@ -265,12 +328,25 @@ def get_average_face(frames : List[Frame], position : int = 0) -> Optional[Face]
 
 def get_many_faces(frame : Frame) -> List[Face]:
 	try:
-		faces_cache = get_static_faces(frame)
-		if faces_cache:
+		faces_cache = get_context_faces(frame)
+		if faces_cache is None:
+			faces_cache = get_static_faces(frame)
+		if faces_cache is not None:
 			faces = faces_cache
 		else:
-			faces = extract_faces(frame)
+			face_cache_entry = get_cached_faces(frame)
+			tracked_faces = track_faces(frame) if face_cache_entry is None else None
+			if face_cache_entry is not None:
+				faces = create_cached_faces(frame, face_cache_entry)
+				set_cached_faces(frame, faces)
+			elif tracked_faces is not None and not is_face_tracker_keyframe():
+				faces = tracked_faces
+			else:
+				faces = extract_faces(frame, tracked_faces)
+				set_cached_faces(frame, faces)
+			set_tracker_faces(frame, faces, faces is tracked_faces)
 			set_static_faces(frame, faces)
+		set_context_faces(frame, faces)
 		if facefusion.globals.face_analyser_order:
 			faces = sort_by_order(faces, facefusion.globals.face_analyser_order)
 		if facefusion.globals.face_analyser_age:
@@ -286,23 +362,17 @@ def find_similar_faces(frame : Frame, reference_faces : FaceSet, face_distance :
 	similar_faces : List[Face] = []
 	many_faces = get_many_faces(frame)
 
-	if reference_faces:
+	if reference_faces and many_faces:
+		face_embeddings = create_embedding_matrix(many_faces)
 		for reference_set in reference_faces:
 			if not similar_faces:
-				for reference_face in reference_faces[reference_set]:
-					for face in many_faces:
-						if compare_faces(face, reference_face, face_distance):
-							similar_faces.append(face)
+				reference_embeddings = get_reference_embeddings(reference_faces[reference_set])
+				face_distances = 1 - numpy.dot(reference_embeddings, face_embeddings.T)
+				_, face_indices = numpy.nonzero(face_distances < face_distance)
+				similar_faces.extend(many_faces[face_index] for face_index in face_indices)
 	return similar_faces
 
 
-def compare_faces(face : Face, reference_face : Face, face_distance : float) -> bool:
-	if hasattr(face, 'normed_embedding') and hasattr(reference_face, 'normed_embedding'):
-		current_face_distance = 1 - numpy.dot(face.normed_embedding, reference_face.normed_embedding)
-		return current_face_distance < face_distance
-	return False
-
-
 def sort_by_order(faces : List[Face], order : FaceAnalyserOrder) -> List[Face]:
 	if order == 'left-right':
 		return sorted(faces, key = lambda face: face.bbox[0])
@@ -0,0 +1,223 @@
+from typing import Any, Dict, List, Optional, Tuple
+from functools import lru_cache
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import numpy
+
+import facefusion.globals
+from facefusion.face_store import get_context_frame_number
+from facefusion.filesystem import is_file, resolve_relative_path
+from facefusion.typing import Frame, Face, FaceCache, FaceCacheEntry, FaceCacheFace
+
+FACE_CACHE : Optional[FaceCache] = None
+THREAD_LOCK : threading.Lock = threading.Lock()
+FACE_CACHE_CHUNK_SIZE = 1024 * 1024
+
+
+def get_face_cache_path(target_path : str, fps : float) -> str:
+	target_stat = os.stat(target_path)
+	cache_key =\
+	{
+		'target_hash': create_target_hash(target_path, target_stat.st_size, target_stat.st_ctime_ns),
+		'fps': fps,
+		'trim_frame_start': facefusion.globals.trim_frame_start,
+		'face_detector_model': facefusion.globals.face_detector_model,
+		'face_detector_size': facefusion.globals.face_detector_size,
+		'face_detector_score': facefusion.globals.face_detector_score,
+		'face_recognizer_model': facefusion.globals.face_recognizer_model,
+		'face_tracker_interval': facefusion.globals.face_tracker_interval
+	}
+	cache_hash = hashlib.sha1(json.dumps(cache_key, sort_keys = True).encode()).hexdigest()
+	return resolve_relative_path('../.assets/cache/faces/' + cache_hash + '.npz')
+
+
+@lru_cache(maxsize = None)
+def create_target_hash(target_path : str, target_size : int, target_time : int) -> str:
+	target_hash = hashlib.sha1()
+	with open(target_path, 'rb') as target_file:
+		for target_chunk in iter(lambda: target_file.read(FACE_CACHE_CHUNK_SIZE), b''):
+			target_hash.update(target_chunk)
+	return target_hash.hexdigest()
+
+
+def load_face_cache(target_path : str, fps : float) -> None:
+	global FACE_CACHE
+
+	face_cache_path = get_face_cache_path(target_path, fps)
+	face_cache : FaceCache =\
+	{
+		'path': face_cache_path,
+		'entries': {},
+		'new_entries': {},
+		'pending_faces': {}
+	}
+	if is_file(face_cache_path):
+		try:
+			face_cache['entries'] = read_face_cache_entries(face_cache_path)
+		except (OSError, ValueError, KeyError):
+			face_cache['entries'] = {}
+	with THREAD_LOCK:
+		FACE_CACHE = face_cache
+
+
+def save_face_cache() -> bool:
+	global FACE_CACHE
+
+	with THREAD_LOCK:
+		face_cache = FACE_CACHE
+		FACE_CACHE = None
+	if face_cache:
+		face_cache.get('new_entries').update(create_face_cache_entries(face_cache.get('pending_faces')))
+		if face_cache.get('new_entries'):
+			face_cache.get('entries').update(face_cache.get('new_entries'))
+			try:
+				write_face_cache_entries(face_cache.get('path'), face_cache.get('entries'))
+			except OSError:
+				return False
+	return True
+
+
+def get_cached_faces(frame : Frame) -> Optional[FaceCacheEntry]:
+	face_cache = FACE_CACHE
+	frame_number = get_context_frame_number(frame)
+	if face_cache and frame_number is not None:
+		return face_cache.get('entries').get(frame_number)
+	return None
+
+
+def set_cached_faces(frame : Frame, faces : List[Face]) -> None:
+	face_cache = FACE_CACHE
+	frame_number = get_context_frame_number(frame)
+	if face_cache and frame_number is not None:
+		if not is_face_cache_entry_complete(face_cache.get('entries').get(frame_number)):
+			with THREAD_LOCK:
+				face_cache.get('pending_faces')[frame_number] = [ (face.bbox, face.kps, face.score, face.attributes.values) for face in faces ]
+
+
+def get_cached_face_counts() -> Dict[int, int]:
+	face_cache = FACE_CACHE
+	if face_cache:
+		return { frame_number: len(face_cache_entry.get('scores')) for frame_number, face_cache_entry in face_cache.get('entries').items() }
+	return {}
+
+
+def pop_cached_faces() -> Dict[int, FaceCacheEntry]:
+	face_cache = FACE_CACHE
+	if face_cache:
+		with THREAD_LOCK:
+			pending_faces = face_cache.get('pending_faces')
+			face_cache['pending_faces'] = {}
+		return create_face_cache_entries(pending_faces)
+	return {}
+
+
+def append_cached_faces(face_cache_entries : Dict[int, FaceCacheEntry]) -> None:
+	face_cache = FACE_CACHE
+	if face_cache:
+		with THREAD_LOCK:
+			face_cache.get('new_entries').update(face_cache_entries)
+
+
+def is_face_cache_entry_complete(face_cache_entry : Optional[FaceCacheEntry]) -> bool:
+	return face_cache_entry is not None and face_cache_entry.get('embeddings') is not None and face_cache_entry.get('genders') is not None
+
+
+def create_face_cache_entries(pending_faces : Dict[int, List[FaceCacheFace]]) -> Dict[int, FaceCacheEntry]:
+	return { frame_number: create_face_cache_entry(faces) for frame_number, faces in pending_faces.items() }
+
+
+def create_face_cache_entry(faces : List[FaceCacheFace]) -> FaceCacheEntry:
+	face_cache_entry : FaceCacheEntry =\
+	{
+		'bboxes': numpy.array([ bbox for bbox, _, _, _ in faces ], dtype = numpy.float32).reshape(-1, 4),
+		'kps': numpy.array([ kps for _, kps, _, _ in faces ], dtype = numpy.float32).reshape(-1, 5, 2),
+		'scores': numpy.array([ score for _, _, score, _ in faces ], dtype = numpy.float32),
+		'embeddings': None,
+		'normed_embeddings': None,
+		'genders': None,
+		'ages': None
+	}
+	face_attributes_values = [ values for _, _, _, values in faces ]
+	if faces and all('embedding' in values for values in face_attributes_values):
+		face_cache_entry['embeddings'] = numpy.array([ values.get('embedding') for values in face_attributes_values ], dtype = numpy.float32)
+		face_cache_entry['normed_embeddings'] = numpy.array([ values.get('normed_embedding') for values in face_attributes_values ], dtype = numpy.float32)
+	if faces and all('gender' in values for values in face_attributes_values):
+		face_cache_entry['genders'] = numpy.array([ values.get('gender') for values in face_attributes_values ], dtype = numpy.int32)
+		face_cache_entry['ages'] = numpy.array([ values.get('age') for values in face_attributes_values ], dtype = numpy.int32)
+	return face_cache_entry
+
+
+def read_face_cache_entries(face_cache_path : str) -> Dict[int, FaceCacheEntry]:
+	face_cache_entries : Dict[int, FaceCacheEntry] = {}
+	with numpy.load(face_cache_path, allow_pickle = False) as face_cache_file:
+		face_cache_columns = { name: face_cache_file[name] for name in face_cache_file.files }
+	face_offsets = numpy.concatenate([ [ 0 ], numpy.cumsum(face_cache_columns.get('face_counts')) ])
+	for index, frame_number in enumerate(face_cache_columns.get('frame_numbers').tolist()):
+		start, end = face_offsets[index], face_offsets[index + 1]
+		has_embeddings = face_cache_columns.get('has_embeddings')[index]
+		has_genders = face_cache_columns.get('has_genders')[index]
+		face_cache_entries[frame_number] =\
+		{
+			'bboxes': face_cache_columns.get('bboxes')[start:end],
+			'kps': face_cache_columns.get('kps')[start:end],
+			'scores': face_cache_columns.get('scores')[start:end],
+			'embeddings': face_cache_columns.get('embeddings')[start:end] if has_embeddings else None,
+			'normed_embeddings': face_cache_columns.get('normed_embeddings')[start:end] if has_embeddings else None,
+			'genders': face_cache_columns.get('genders')[start:end] if has_genders else None,
+			'ages': face_cache_columns.get('ages')[start:end] if has_genders else None
+		}
+	return face_cache_entries
+
+
+def write_face_cache_entries(face_cache_path : str, face_cache_entries : Dict[int, FaceCacheEntry]) -> None:
+	frame_numbers = list(face_cache_entries.keys())
+	face_cache_entry_list = list(face_cache_entries.values())
+	face_counts = [ len(face_cache_entry.get('scores')) for face_cache_entry in face_cache_entry_list ]
+	embedding_size = next((face_cache_entry.get('embeddings').shape[1] for face_cache_entry in face_cache_entry_list if face_cache_entry.get('embeddings') is not None), 0)
+	embeddings, normed_embeddings = create_embedding_columns(face_cache_entry_list, face_counts, embedding_size)
+	face_cache_columns : Dict[str, Any] =\
+	{
+		'frame_numbers': numpy.array(frame_numbers, dtype = numpy.int64),
+		'face_counts': numpy.array(face_counts, dtype = numpy.int32),
+		'bboxes': concatenate_column([ face_cache_entry.get('bboxes') for face_cache_entry in face_cache_entry_list ], (0, 4)),
+		'kps': concatenate_column([ face_cache_entry.get('kps') for face_cache_entry in face_cache_entry_list ], (0, 5, 2)),
+		'scores': concatenate_column([ face_cache_entry.get('scores') for face_cache_entry in face_cache_entry_list ], (0,)),
+		'has_embeddings': numpy.array([ face_cache_entry.get('embeddings') is not None for face_cache_entry in face_cache_entry_list ], dtype = bool),
+		'embeddings': embeddings,
+		'normed_embeddings': normed_embeddings,
+		'has_genders': numpy.array([ face_cache_entry.get('genders') is not None for face_cache_entry in face_cache_entry_list ], dtype = bool),
+		'genders': concatenate_column([ face_cache_entry.get('genders') if face_cache_entry.get('genders') is not None else numpy.zeros(face_count, dtype = numpy.int32) for face_cache_entry, face_count in zip(face_cache_entry_list, face_counts) ], (0,)),
+		'ages': concatenate_column([ face_cache_entry.get('ages') if face_cache_entry.get('ages') is not None else numpy.zeros(face_count, dtype = numpy.int32) for face_cache_entry, face_count in zip(face_cache_entry_list, face_counts) ], (0,))
+	}
+	face_cache_directory_path = os.path.dirname(face_cache_path)
+	os.makedirs(face_cache_directory_path, exist_ok = True)
+	temp_file_descriptor, temp_face_cache_path = tempfile.mkstemp(dir = face_cache_directory_path, suffix = '.npz')
+	try:
+		with os.fdopen(temp_file_descriptor, 'wb') as temp_face_cache_file:
+			numpy.savez(temp_face_cache_file, **face_cache_columns)
+		os.replace(temp_face_cache_path, face_cache_path)
+	finally:
+		if is_file(temp_face_cache_path):
+			os.remove(temp_face_cache_path)
+
+
+def create_embedding_columns(face_cache_entry_list : List[FaceCacheEntry], face_counts : List[int], embedding_size : int) -> Tuple[numpy.ndarray[Any, Any], numpy.ndarray[Any, Any]]:
+	embedding_list = []
+	normed_embedding_list = []
+	for face_cache_entry, face_count in zip(face_cache_entry_list, face_counts):
+		if face_cache_entry.get('embeddings') is not None:
+			embedding_list.append(face_cache_entry.get('embeddings'))
+			normed_embedding_list.append(face_cache_entry.get('normed_embeddings'))
+		else:
+			embedding_list.append(numpy.zeros((face_count, embedding_size), dtype = numpy.float32))
+			normed_embedding_list.append(numpy.zeros((face_count, embedding_size), dtype = numpy.float32))
+	return concatenate_column(embedding_list, (0, embedding_size)), concatenate_column(normed_embedding_list, (0, embedding_size))
+
+
+def concatenate_column(column_list : List[numpy.ndarray[Any, Any]], empty_shape : Tuple[int, ...]) -> numpy.ndarray[Any, Any]:
+	if column_list:
+		return numpy.concatenate(column_list)
+	return numpy.empty(empty_shape)
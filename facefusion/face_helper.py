@@ -4,7 +4,8 @@ from functools import lru_cache
 import cv2
 import numpy
 
-from facefusion.typing import Bbox, Kps, Frame, Mask, Matrix, Template
+from facefusion.typing import Bbox, Kps, Frame, FacePaste, Mask, Matrix, Template
+from facefusion.tracer import trace
 
 TEMPLATES : Dict[Template, numpy.ndarray[Any, Any]] =\
 {
@@ -43,6 +44,7 @@ TEMPLATES : Dict[Template, numpy.ndarray[Any, Any]] =\
 }
 
 
+@trace('warp_face')
 def warp_face(temp_frame : Frame, kps : Kps, template : Template, size : Size) -> Tuple[Frame, Matrix]:
 	normed_template = TEMPLATES.get(template) * size[1] / size[0]
 	affine_matrix = cv2.estimateAffinePartial2D(kps, normed_template, method = cv2.RANSAC, ransacReprojThreshold = 100)[0]
@@ -51,17 +53,39 @@ def warp_face(temp_frame : Frame, kps : Kps, template : Template, size : Size) -
 
 
 def paste_back(temp_frame : Frame, crop_frame: Frame, crop_mask : Mask, affine_matrix : Matrix) -> Frame:
-	inverse_matrix = cv2.invertAffineTransform(affine_matrix)
-	temp_frame_size = temp_frame.shape[:2][::-1]
-	inverse_crop_mask = cv2.warpAffine(crop_mask, inverse_matrix, temp_frame_size).clip(0, 1)
-	inverse_crop_frame = cv2.warpAffine(crop_frame, inverse_matrix, temp_frame_size, borderMode = cv2.BORDER_REPLICATE)
+	return paste_back_many(temp_frame, [ (crop_frame, crop_mask, affine_matrix) ])
+
+
+@trace('paste_back')
+def paste_back_many(temp_frame : Frame, face_pastes : List[FacePaste]) -> Frame:
 	paste_frame = temp_frame.copy()
-	paste_frame[:, :, 0] = inverse_crop_mask * inverse_crop_frame[:, :, 0] + (1 - inverse_crop_mask) * temp_frame[:, :, 0]
-	paste_frame[:, :, 1] = inverse_crop_mask * inverse_crop_frame[:, :, 1] + (1 - inverse_crop_mask) * temp_frame[:, :, 1]
-	paste_frame[:, :, 2] = inverse_crop_mask * inverse_crop_frame[:, :, 2] + (1 - inverse_crop_mask) * temp_frame[:, :, 2]
+	for crop_frame, crop_mask, affine_matrix in face_pastes:
+		blend_paste_area(paste_frame, crop_frame, crop_mask, affine_matrix)
 	return paste_frame
 
 
+def blend_paste_area(paste_frame : Frame, crop_frame: Frame, crop_mask : Mask, affine_matrix : Matrix) -> None:
+	inverse_matrix = cv2.invertAffineTransform(affine_matrix)
+	x1, y1, x2, y2 = calc_paste_area(paste_frame, crop_frame, inverse_matrix)
+	if x2 > x1 and y2 > y1:
+		inverse_matrix[:, 2] -= (x1, y1)
+		paste_size = (x2 - x1, y2 - y1)
+		inverse_crop_mask = cv2.warpAffine(crop_mask, inverse_matrix, paste_size).clip(0, 1)[:, :, numpy.newaxis]
+		inverse_crop_frame = cv2.warpAffine(crop_frame, inverse_matrix, paste_size, borderMode = cv2.BORDER_REPLICATE)
+		paste_area = paste_frame[y1:y2, x1:x2]
+		paste_area[:] = inverse_crop_mask * inverse_crop_frame + (1 - inverse_crop_mask) * paste_area
+
+
+def calc_paste_area(temp_frame : Frame, crop_frame : Frame, inverse_matrix : Matrix) -> Tuple[int, int, int, int]:
+	crop_height, crop_width = crop_frame.shape[:2]
+	crop_points = numpy.array([ [ -1, -1 ], [ crop_width, -1 ], [ -1, crop_height ], [ crop_width, crop_height ] ], dtype = numpy.float64)
+	paste_points = cv2.transform(crop_points.reshape(-1, 1, 2), inverse_matrix).reshape(-1, 2)
+	x1, y1 = numpy.floor(paste_points.min(axis = 0)).astype(int) - 1
+	x2, y2 = numpy.ceil(paste_points.max(axis = 0)).astype(int) + 2
+	temp_height, temp_width = temp_frame.shape[:2]
+	return max(0, x1), max(0, y1), min(temp_width, x2), min(temp_height, y2)
+
+
 @lru_cache(maxsize = None)
 def create_static_anchors(feature_stride : int, anchor_total : int, stride_height : int, stride_width : int) -> numpy.ndarray[Any, Any]:
 	y, x = numpy.mgrid[:stride_height, :stride_width][::-1]
@@ -87,25 +111,17 @@ def distance_to_kps(points : numpy.ndarray[Any, Any], distance : numpy.ndarray[A
 	return kps
 
 
-def apply_nms(bbox_list : List[Bbox], iou_threshold : float) -> List[int]:
-	keep_indices = []
-	dimension_list = numpy.reshape(bbox_list, (-1, 4))
-	x1 = dimension_list[:, 0]
-	y1 = dimension_list[:, 1]
-	x2 = dimension_list[:, 2]
-	y2 = dimension_list[:, 3]
-	areas = (x2 - x1 + 1) * (y2 - y1 + 1)
-	indices = numpy.arange(len(bbox_list))
-	while indices.size > 0:
-		index = indices[0]
-		remain_indices = indices[1:]
-		keep_indices.append(index)
-		xx1 = numpy.maximum(x1[index], x1[remain_indices])
-		yy1 = numpy.maximum(y1[index], y1[remain_indices])
-		xx2 = numpy.minimum(x2[index], x2[remain_indices])
-		yy2 = numpy.minimum(y2[index], y2[remain_indices])
-		width = numpy.maximum(0, xx2 - xx1 + 1)
-		height = numpy.maximum(0, yy2 - yy1 + 1)
-		iou = width * height / (areas[index] + areas[remain_indices] - width * height)
-		indices = indices[numpy.where(iou <= iou_threshold)[0] + 1]
-	return keep_indices
+def apply_nms(bboxes : numpy.ndarray[Any, Any], scores : numpy.ndarray[Any, Any], iou_threshold : float) -> List[int]:
+	if len(bboxes) == 0:
+		return []
+	bboxes = numpy.reshape(bboxes, (-1, 4)).astype(numpy.float64)
+	bboxes[:, 2:] -= bboxes[:, :2] - 1
+	keep_indices = cv2.dnn.NMSBoxes(bboxes.tolist(), numpy.ravel(scores).tolist(), 0, iou_threshold)
+	return numpy.ravel(keep_indices).tolist()
+
+
+def calc_bbox_iou(bbox : Bbox, other_bbox : Bbox) -> float:
+	width = max(0, min(bbox[2], other_bbox[2]) - max(bbox[0], other_bbox[0]))
+	height = max(0, min(bbox[3], other_bbox[3]) - max(bbox[1], other_bbox[1]))
+	area = (bbox[2] - bbox[0]) * (bbox[3] - bbox[1]) + (other_bbox[2] - other_bbox[0]) * (other_bbox[3] - other_bbox[1]) - width * height
+	return width * height / area if area > 0 else 0.0
@@ -1,15 +1,17 @@
 from typing import Any, Dict, List
 from cv2.typing import Size
-from functools import lru_cache
+from functools import lru_cache, partial
 import threading
 import cv2
 import numpy
-import onnxruntime
 
 import facefusion.globals
 from facefusion.typing import Frame, Mask, Padding, FaceMaskRegion, ModelSet
 from facefusion.filesystem import resolve_relative_path
+from facefusion.tracer import trace
 from facefusion.download import conditional_download
+from facefusion.session_pool import create_session_pool, create_inference_session
+from facefusion.session_batcher import create_session_batcher
 
 FACE_OCCLUDER = None
 FACE_PARSER = None
@@ -48,7 +50,7 @@ def get_face_occluder() -> Any:
 	with THREAD_LOCK:
 		if FACE_OCCLUDER is None:
 			model_path = MODELS.get('face_occluder').get('path')
-			FACE_OCCLUDER = onnxruntime.InferenceSession(model_path, providers = facefusion.globals.execution_providers)
+			FACE_OCCLUDER = create_session_batcher(create_session_pool(partial(create_inference_session, model_path)))
 	return FACE_OCCLUDER
 
 
@@ -58,7 +60,7 @@ def get_face_parser() -> Any:
 	with THREAD_LOCK:
 		if FACE_PARSER is None:
 			model_path = MODELS.get('face_parser').get('path')
-			FACE_PARSER = onnxruntime.InferenceSession(model_path, providers = facefusion.globals.execution_providers)
+			FACE_PARSER = create_session_batcher(create_session_pool(partial(create_inference_session, model_path)))
 	return FACE_PARSER
 
 
@@ -100,6 +102,7 @@ def create_static_box_mask(crop_size : Size, face_mask_blur : float, face_mask_p
 	return box_mask
 
 
+@trace('create_occlusion_mask')
 def create_occlusion_mask(crop_frame : Frame) -> Mask:
 	face_occluder = get_face_occluder()
 	prepare_frame = cv2.resize(crop_frame, face_occluder.get_inputs()[0].shape[1:3][::-1])
@@ -114,6 +117,7 @@ def create_occlusion_mask(crop_frame : Frame) -> Mask:
 	return occlusion_mask
 
 
+@trace('create_region_mask')
 def create_region_mask(crop_frame : Frame, face_mask_regions : List[FaceMaskRegion]) -> Mask:
 	face_parser = get_face_parser()
 	prepare_frame = cv2.flip(cv2.resize(crop_frame, (512, 512)), 1)
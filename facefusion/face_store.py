@@ -1,34 +1,138 @@
 from typing import Optional, List
+from collections import OrderedDict
 import hashlib
+import math
+import threading
+import numpy
 
-from facefusion.typing import Frame, Face, FaceStore, FaceSet
+import facefusion.globals
+from facefusion.typing import Frame, Face, FaceStore, FaceSet, FrameContext, StaticFacesStatistics, EmbeddingMatrix
 
 FACE_STORE: FaceStore =\
 {
-	'static_faces': {},
-	'reference_faces': {}
+	'static_faces': OrderedDict(),
+	'reference_faces': {},
+	'reference_embeddings': OrderedDict()
+}
+FRAME_CONTEXT : threading.local = threading.local()
+THREAD_LOCK : threading.Lock = threading.Lock()
+REFERENCE_EMBEDDINGS_LIMIT = 16
+STATIC_FACES_SAMPLE_TOTAL = 65536
+STATIC_FACES_STATISTICS : StaticFacesStatistics =\
+{
+	'hits': 0,
+	'misses': 0
 }
 
 
 def get_static_faces(frame : Frame) -> Optional[List[Face]]:
+	if get_context_frame_number(frame) is not None:
+		return None
 	frame_hash = create_frame_hash(frame)
-	if frame_hash in FACE_STORE['static_faces']:
-		return FACE_STORE['static_faces'][frame_hash]
+	with THREAD_LOCK:
+		if frame_hash in FACE_STORE['static_faces']:
+			FACE_STORE['static_faces'].move_to_end(frame_hash)
+			STATIC_FACES_STATISTICS['hits'] += 1
+			return FACE_STORE['static_faces'][frame_hash]
+		STATIC_FACES_STATISTICS['misses'] += 1
 	return None
 
 
 def set_static_faces(frame : Frame, faces : List[Face]) -> None:
+	if get_context_frame_number(frame) is not None:
+		return
 	frame_hash = create_frame_hash(frame)
 	if frame_hash:
-		FACE_STORE['static_faces'][frame_hash] = faces
+		with THREAD_LOCK:
+			FACE_STORE['static_faces'][frame_hash] = faces
+			FACE_STORE['static_faces'].move_to_end(frame_hash)
+			while len(FACE_STORE['static_faces']) > facefusion.globals.face_store_limit:
+				FACE_STORE['static_faces'].popitem(last = False)
 
 
 def clear_static_faces() -> None:
-	FACE_STORE['static_faces'] = {}
+	with THREAD_LOCK:
+		FACE_STORE['static_faces'] = OrderedDict()
+		STATIC_FACES_STATISTICS['hits'] = 0
+		STATIC_FACES_STATISTICS['misses'] = 0
+
+
+def create_frame_hash(frame : Frame) -> Optional[str]:
+	frame_step = max(1, math.isqrt(frame.shape[0] * frame.shape[1] // STATIC_FACES_SAMPLE_TOTAL))
+	sample_frame = numpy.ascontiguousarray(frame[::frame_step, ::frame_step])
+	if sample_frame.any():
+		return hashlib.sha1(str(frame.shape).encode() + sample_frame.tobytes()).hexdigest()
+	return None
+
+
+def get_static_faces_statistics() -> StaticFacesStatistics:
+	with THREAD_LOCK:
+		return STATIC_FACES_STATISTICS.copy()
+
+
+def pop_static_faces_statistics() -> StaticFacesStatistics:
+	with THREAD_LOCK:
+		static_faces_statistics = STATIC_FACES_STATISTICS.copy()
+		STATIC_FACES_STATISTICS['hits'] = 0
+		STATIC_FACES_STATISTICS['misses'] = 0
+	return static_faces_statistics
+
+
+def append_static_faces_statistics(static_faces_statistics : StaticFacesStatistics) -> None:
+	with THREAD_LOCK:
+		STATIC_FACES_STATISTICS['hits'] += static_faces_statistics.get('hits')
+		STATIC_FACES_STATISTICS['misses'] += static_faces_statistics.get('misses')
+
+
+def create_frame_context(frame : Frame, frame_number : Optional[int] = None) -> None:
+	FRAME_CONTEXT.value =\
+	{
+		'frame': frame,
+		'frame_number': frame_number,
+		'faces': None
+	}
+
+
+def get_frame_context() -> Optional[FrameContext]:
+	return getattr(FRAME_CONTEXT, 'value', None)
+
+
+def clear_frame_context() -> None:
+	FRAME_CONTEXT.value = None
+
+
+def set_context_frame(frame : Frame) -> None:
+	frame_context = get_frame_context()
+	if frame_context:
+		if frame_context.get('frame').shape != frame.shape:
+			frame_context['frame_number'] = None
+			frame_context['faces'] = None
+		frame_context['frame'] = frame
+
+
+def is_context_frame(frame : Frame) -> bool:
+	frame_context = get_frame_context()
+	return frame_context is not None and frame_context.get('frame') is frame
+
+
+def get_context_frame_number(frame : Frame) -> Optional[int]:
+	frame_context = get_frame_context()
+	if frame_context and is_context_frame(frame):
+		return frame_context.get('frame_number')
+	return None
+
+
+def get_context_faces(frame : Frame) -> Optional[List[Face]]:
+	frame_context = get_frame_context()
+	if frame_context and is_context_frame(frame):
+		return frame_context.get('faces')
+	return None
 
 
-def create_frame_hash(frame: Frame) -> Optional[str]:
-	return hashlib.sha1(frame.tobytes()).hexdigest() if frame.any() else None
+def set_context_faces(frame : Frame, faces : List[Face]) -> None:
+	frame_context = get_frame_context()
+	if frame_context and is_context_frame(frame):
+		frame_context['faces'] = faces
 
 
 def get_reference_faces() -> Optional[FaceSet]:
@@ -45,3 +149,25 @@ def append_reference_face(name : str, face : Face) -> None:
 
 def clear_reference_faces() -> None:
 	FACE_STORE['reference_faces'] = {}
+	with THREAD_LOCK:
+		FACE_STORE['reference_embeddings'].clear()
+
+
+def get_reference_embeddings(reference_faces : List[Face]) -> EmbeddingMatrix:
+	reference_key = tuple(id(reference_face) for reference_face in reference_faces)
+	with THREAD_LOCK:
+		if reference_key in FACE_STORE['reference_embeddings']:
+			FACE_STORE['reference_embeddings'].move_to_end(reference_key)
+			return FACE_STORE['reference_embeddings'][reference_key][1]
+	reference_embeddings = create_embedding_matrix(reference_faces)
+	with THREAD_LOCK:
+		FACE_STORE['reference_embeddings'][reference_key] = (tuple(reference_faces), reference_embeddings)
+		while len(FACE_STORE['reference_embeddings']) > REFERENCE_EMBEDDINGS_LIMIT:
+			FACE_STORE['reference_embeddings'].popitem(last = False)
+	return reference_embeddings
+
+
+def create_embedding_matrix(faces : List[Face]) -> EmbeddingMatrix:
+	if faces:
+		return numpy.stack([ face.normed_embedding for face in faces ])
+	return numpy.empty((0, 512), dtype = numpy.float32)
@@ -0,0 +1,89 @@
+from typing import Optional, List
+import threading
+import cv2
+import numpy
+
+import facefusion.globals
+from facefusion.face_helper import calc_bbox_iou
+from facefusion.typing import Frame, Face, FaceTracker, Bbox, Matrix
+
+FACE_TRACKER : threading.local = threading.local()
+
+
+def get_face_tracker() -> Optional[FaceTracker]:
+	if is_face_tracker_active():
+		return getattr(FACE_TRACKER, 'value', None)
+	return None
+
+
+def start_face_tracker() -> None:
+	FACE_TRACKER.is_active = True
+	FACE_TRACKER.value = None
+
+
+def stop_face_tracker() -> None:
+	FACE_TRACKER.is_active = False
+	FACE_TRACKER.value = None
+
+
+def is_face_tracker_enabled() -> bool:
+	return bool(facefusion.globals.face_tracker_interval and facefusion.globals.face_tracker_interval > 1)
+
+
+def is_face_tracker_active() -> bool:
+	return is_face_tracker_enabled() and getattr(FACE_TRACKER, 'is_active', False)
+
+
+def is_face_tracker_keyframe() -> bool:
+	face_tracker = get_face_tracker()
+	if face_tracker:
+		return face_tracker.get('frame_count') >= facefusion.globals.face_tracker_interval
+	return True
+
+
+def track_faces(frame : Frame) -> Optional[List[Face]]:
+	face_tracker = get_face_tracker()
+	if face_tracker and face_tracker.get('faces'):
+		previous_gray_frame = face_tracker.get('gray_frame')
+		gray_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+		if previous_gray_frame.shape == gray_frame.shape:
+			previous_points = numpy.concatenate([ face.kps for face in face_tracker.get('faces') ]).reshape(-1, 1, 2).astype(numpy.float32)
+			points, status, _ = cv2.calcOpticalFlowPyrLK(previous_gray_frame, gray_frame, previous_points, None, winSize = (21, 21), maxLevel = 3)
+			back_points, back_status, _ = cv2.calcOpticalFlowPyrLK(gray_frame, previous_gray_frame, points, None, winSize = (21, 21), maxLevel = 3)
+			if status.all() and back_status.all():
+				track_errors = numpy.linalg.norm(previous_points - back_points, axis = 2).reshape(-1, 5)
+				points = points.reshape(-1, 5, 2)
+				faces = []
+				for face, track_error, kps in zip(face_tracker.get('faces'), track_errors, points):
+					if track_error.max() > max(1.0, (face.bbox[2] - face.bbox[0]) * 0.02):
+						return None
+					affine_matrix, _ = cv2.estimateAffinePartial2D(face.kps.astype(numpy.float32), kps)
+					if affine_matrix is None:
+						return None
+					faces.append(face._replace(bbox = transform_bbox(face.bbox, affine_matrix), kps = kps.astype(face.kps.dtype)))
+				return faces
+	return None
+
+
+def set_tracker_faces(frame : Frame, faces : List[Face], is_tracked : bool) -> None:
+	face_tracker = get_face_tracker()
+	if is_face_tracker_active():
+		FACE_TRACKER.value =\
+		{
+			'gray_frame': cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY),
+			'faces': faces,
+			'frame_count': face_tracker.get('frame_count') + 1 if face_tracker and is_tracked else 1
+		}
+
+
+def find_tracked_face(tracked_faces : List[Face], bbox : Bbox) -> Optional[Face]:
+	for tracked_face in tracked_faces:
+		if calc_bbox_iou(tracked_face.bbox, bbox) > 0.5:
+			return tracked_face
+	return None
+
+
+def transform_bbox(bbox : Bbox, affine_matrix : Matrix) -> Bbox:
+	corners = numpy.array([ [ bbox[0], bbox[1] ], [ bbox[2], bbox[3] ] ]).reshape(-1, 1, 2)
+	corners = cv2.transform(corners, affine_matrix).reshape(-1, 2)
+	return numpy.array([ corners[:, 0].min(), corners[:, 1].min(), corners[:, 0].max(), corners[:, 1].max() ])
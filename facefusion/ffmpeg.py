@@ -1,12 +1,20 @@
-from typing import List
+from typing import Generator, Iterator, List, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
+import math
+import os
+import re
 import subprocess
+import numpy
 
 import facefusion.globals
 from facefusion import logger
-from facefusion.filesystem import get_temp_frames_pattern, get_temp_output_video_path
-from facefusion.vision import detect_fps
+from facefusion.typing import Frame
+from facefusion.tracer import trace, trace_span
+from facefusion.filesystem import get_temp_frames_pattern, get_temp_frame_paths, get_temp_directory_path, get_temp_output_video_path, is_file
+from facefusion.vision import detect_fps, detect_video_resolution, count_video_frame_total
 
 
+@trace('run_ffmpeg')
 def run_ffmpeg(args : List[str]) -> bool:
 	commands = [ 'ffmpeg', '-hide_banner', '-loglevel', 'error' ]
 	commands.extend(args)
@@ -18,53 +26,208 @@ def run_ffmpeg(args : List[str]) -> bool:
 		return False
 
 
-def open_ffmpeg(args : List[str]) -> subprocess.Popen[bytes]:
+def open_ffmpeg(args : List[str], stdout : Optional[int] = None) -> subprocess.Popen[bytes]:
 	commands = [ 'ffmpeg', '-hide_banner', '-loglevel', 'error' ]
 	commands.extend(args)
-	return subprocess.Popen(commands, stdin = subprocess.PIPE)
+	return subprocess.Popen(commands, stdin = subprocess.PIPE, stdout = stdout)
 
 
+def run_ffmpeg_parallel(args_list : List[List[str]]) -> bool:
+	with ThreadPoolExecutor(max_workers = facefusion.globals.execution_thread_count) as executor:
+		return all(executor.map(run_ffmpeg, args_list))
+
+
+@trace('extract_frames')
 def extract_frames(target_path : str, fps : float) -> bool:
+	video_segments = create_video_segments(target_path)
+	if len(video_segments) > 1:
+		return extract_segment_frames(target_path, fps, video_segments)
 	temp_frame_compression = round(31 - (facefusion.globals.temp_frame_quality * 0.31))
-	trim_frame_start = facefusion.globals.trim_frame_start
-	trim_frame_end = facefusion.globals.trim_frame_end
 	temp_frames_pattern = get_temp_frames_pattern(target_path, '%04d')
 	commands = [ '-hwaccel', 'auto', '-i', target_path, '-q:v', str(temp_frame_compression), '-pix_fmt', 'rgb24' ]
-	if trim_frame_start is not None and trim_frame_end is not None:
-		commands.extend([ '-vf', 'trim=start_frame=' + str(trim_frame_start) + ':end_frame=' + str(trim_frame_end) + ',fps=' + str(fps) ])
-	elif trim_frame_start is not None:
-		commands.extend([ '-vf', 'trim=start_frame=' + str(trim_frame_start) + ',fps=' + str(fps) ])
-	elif trim_frame_end is not None:
-		commands.extend([ '-vf', 'trim=end_frame=' + str(trim_frame_end) + ',fps=' + str(fps) ])
-	else:
-		commands.extend([ '-vf', 'fps=' + str(fps) ])
+	commands.extend([ '-vf', get_extract_frames_filter(fps) ])
 	commands.extend([ '-vsync', '0', temp_frames_pattern ])
 	return run_ffmpeg(commands)
 
 
+def extract_segment_frames(target_path : str, fps : float, video_segments : List[Tuple[float, float]]) -> bool:
+	temp_frame_compression = round(31 - (facefusion.globals.temp_frame_quality * 0.31))
+	temp_frames_pattern = get_temp_frames_pattern(target_path, '%04d')
+	video_frame_start = math.floor(video_segments[0][0] * fps + 0.5)
+	commands_list = []
+	for segment_start_time, segment_end_time in video_segments:
+		segment_frame_start = math.floor(segment_start_time * fps + 0.5) - video_frame_start
+		segment_frame_end = math.floor(segment_end_time * fps + 0.5) - video_frame_start
+		commands = [ '-hwaccel', 'auto', '-ss', str(segment_start_time), '-copyts', '-i', target_path, '-q:v', str(temp_frame_compression), '-pix_fmt', 'rgb24', '-vf', 'fps=' + str(fps), '-frames:v', str(segment_frame_end - segment_frame_start) ]
+		commands.extend([ '-start_number', str(segment_frame_start + 1), '-vsync', '0', temp_frames_pattern ])
+		commands_list.append(commands)
+	return run_ffmpeg_parallel(commands_list)
+
+
+def create_video_segments(target_path : str) -> List[Tuple[float, float]]:
+	video_fps = detect_fps(target_path)
+	video_frame_total = count_video_frame_total(target_path)
+	if video_fps and video_frame_total:
+		trim_frame_start = facefusion.globals.trim_frame_start or 0
+		trim_frame_end = facefusion.globals.trim_frame_end or video_frame_total
+		video_start_time = trim_frame_start / video_fps
+		video_end_time = trim_frame_end / video_fps
+		segment_total = get_segment_total(video_end_time - video_start_time)
+		if segment_total > 1:
+			video_keyframes = [ video_keyframe for video_keyframe in detect_video_keyframes(target_path) if video_start_time < video_keyframe < video_end_time ]
+			segment_times = [ video_start_time ]
+			for index in range(1, segment_total):
+				segment_time = video_start_time + (video_end_time - video_start_time) * index / segment_total
+				if video_keyframes:
+					segment_time = min(video_keyframes, key = lambda video_keyframe: abs(video_keyframe - segment_time))
+				if segment_time > segment_times[-1]:
+					segment_times.append(segment_time)
+			segment_times.append(video_end_time)
+			return list(zip(segment_times[:-1], segment_times[1:]))
+	return []
+
+
+def get_segment_total(video_duration : float) -> int:
+	if facefusion.globals.segment_duration and video_duration > facefusion.globals.segment_duration:
+		return min(math.ceil(video_duration / facefusion.globals.segment_duration), facefusion.globals.execution_thread_count)
+	return 1
+
+
+def detect_video_keyframes(target_path : str) -> List[float]:
+	commands = [ 'ffmpeg', '-hide_banner', '-loglevel', 'info', '-skip_frame', 'nokey', '-i', target_path, '-an', '-vf', 'showinfo', '-f', 'null', '-' ]
+	try:
+		process = subprocess.run(commands, stderr = subprocess.PIPE, check = True)
+		return [ float(pts_time) for pts_time in re.findall(r'pts_time:(\d+(?:\.\d+)?)', process.stderr.decode(errors = 'ignore')) ]
+	except subprocess.CalledProcessError as exception:
+		logger.debug(exception.stderr.decode().strip(), __name__.upper())
+		return []
+
+
+def extract_stream_frames(target_path : str, fps : float) -> Generator[Frame, None, None]:
+	video_resolution = detect_video_resolution(target_path)
+	if video_resolution:
+		video_width, video_height = video_resolution
+		frame_size = video_width * video_height * 3
+		commands = [ '-hwaccel', 'auto', '-i', target_path, '-vf', get_extract_frames_filter(fps), '-vsync', '0', '-f', 'rawvideo', '-pix_fmt', 'bgr24', '-' ]
+		process = open_ffmpeg(commands, subprocess.PIPE)
+		try:
+			while True:
+				frame_buffer = bytearray(frame_size)
+				with trace_span('decode_frame'):
+					frame_size_read = process.stdout.readinto(frame_buffer) # type: ignore[attr-defined]
+				if frame_size_read < frame_size:
+					break
+				yield numpy.frombuffer(frame_buffer, dtype = numpy.uint8).reshape((video_height, video_width, 3))
+		finally:
+			process.stdout.close()
+			process.stdin.close()
+			process.wait()
+
+
+def get_extract_frames_filter(fps : float) -> str:
+	trim_frame_start = facefusion.globals.trim_frame_start
+	trim_frame_end = facefusion.globals.trim_frame_end
+	if trim_frame_start is not None and trim_frame_end is not None:
+		return 'trim=start_frame=' + str(trim_frame_start) + ':end_frame=' + str(trim_frame_end) + ',fps=' + str(fps)
+	if trim_frame_start is not None:
+		return 'trim=start_frame=' + str(trim_frame_start) + ',fps=' + str(fps)
+	if trim_frame_end is not None:
+		return 'trim=end_frame=' + str(trim_frame_end) + ',fps=' + str(fps)
+	return 'fps=' + str(fps)
+
+
+@trace('compress_image')
 def compress_image(output_path : str) -> bool:
 	output_image_compression = round(31 - (facefusion.globals.output_image_quality * 0.31))
 	commands = [ '-hwaccel', 'auto', '-i', output_path, '-q:v', str(output_image_compression), '-y', output_path ]
 	return run_ffmpeg(commands)
 
 
+@trace('merge_video')
 def merge_video(target_path : str, fps : float) -> bool:
+	temp_frame_total = len(get_temp_frame_paths(target_path))
+	segment_total = get_segment_total(temp_frame_total / fps)
+	if segment_total > 1:
+		return merge_segment_video(target_path, fps, temp_frame_total, segment_total)
 	temp_output_video_path = get_temp_output_video_path(target_path)
 	temp_frames_pattern = get_temp_frames_pattern(target_path, '%04d')
 	commands = [ '-hwaccel', 'auto', '-r', str(fps), '-i', temp_frames_pattern, '-c:v', facefusion.globals.output_video_encoder ]
+	commands.extend(get_output_video_compression_commands())
+	commands.extend([ '-pix_fmt', 'yuv420p', '-colorspace', 'bt709', '-y', temp_output_video_path ])
+	return run_ffmpeg(commands)
+
+
+def merge_segment_video(target_path : str, fps : float, temp_frame_total : int, segment_total : int) -> bool:
+	temp_directory_path = get_temp_directory_path(target_path)
+	temp_output_video_path = get_temp_output_video_path(target_path)
+	temp_frames_pattern = get_temp_frames_pattern(target_path, '%04d')
+	temp_segment_list_path = os.path.join(temp_directory_path, 'segments.txt')
+	temp_segment_video_paths = []
+	commands_list = []
+	for index in range(segment_total):
+		segment_frame_start = temp_frame_total * index // segment_total
+		segment_frame_end = temp_frame_total * (index + 1) // segment_total
+		temp_segment_video_path = os.path.join(temp_directory_path, 'segment-' + str(index + 1).zfill(4) + '.mp4')
+		commands = [ '-hwaccel', 'auto', '-r', str(fps), '-start_number', str(segment_frame_start + 1), '-i', temp_frames_pattern, '-frames:v', str(segment_frame_end - segment_frame_start), '-c:v', facefusion.globals.output_video_encoder ]
+		commands.extend(get_output_video_compression_commands())
+		commands.extend([ '-pix_fmt', 'yuv420p', '-colorspace', 'bt709', '-y', temp_segment_video_path ])
+		commands_list.append(commands)
+		temp_segment_video_paths.append(temp_segment_video_path)
+	is_merged = False
+	if run_ffmpeg_parallel(commands_list):
+		with open(temp_segment_list_path, 'w') as temp_segment_list_file:
+			for temp_segment_video_path in temp_segment_video_paths:
+				temp_segment_list_file.write('file \'' + os.path.basename(temp_segment_video_path) + '\'\n')
+		is_merged = run_ffmpeg([ '-f', 'concat', '-safe', '0', '-i', temp_segment_list_path, '-c', 'copy', '-y', temp_output_video_path ])
+	for temp_segment_video_path in temp_segment_video_paths + [ temp_segment_list_path ]:
+		if is_file(temp_segment_video_path):
+			os.remove(temp_segment_video_path)
+	return is_merged
+
+
+def merge_stream_frames(target_path : str, fps : float, temp_frames : Iterator[Frame]) -> bool:
+	temp_output_video_path = get_temp_output_video_path(target_path)
+	process = None
+	is_merged = False
+	try:
+		for temp_frame in temp_frames:
+			if process is None:
+				temp_frame_height, temp_frame_width = temp_frame.shape[:2]
+				commands = [ '-f', 'rawvideo', '-pix_fmt', 'bgr24', '-s', str(temp_frame_width) + 'x' + str(temp_frame_height), '-r', str(fps), '-i', '-', '-c:v', facefusion.globals.output_video_encoder ]
+				commands.extend(get_output_video_compression_commands())
+				commands.extend([ '-pix_fmt', 'yuv420p', '-colorspace', 'bt709', '-y', temp_output_video_path ])
+				process = open_ffmpeg(commands)
+			with trace_span('encode_frame'):
+				process.stdin.write(temp_frame.tobytes())
+		is_merged = process is not None
+	except BrokenPipeError:
+		pass
+	finally:
+		if process:
+			try:
+				process.stdin.close()
+			except BrokenPipeError:
+				pass
+			is_merged = process.wait() == 0 and is_merged
+		if not is_merged and is_file(temp_output_video_path):
+			os.remove(temp_output_video_path)
+	return is_merged
+
+
+def get_output_video_compression_commands() -> List[str]:
 	if facefusion.globals.output_video_encoder in [ 'libx264', 'libx265' ]:
 		output_video_compression = round(51 - (facefusion.globals.output_video_quality * 0.51))
-		commands.extend([ '-crf', str(output_video_compression) ])
+		return [ '-crf', str(output_video_compression) ]
 	if facefusion.globals.output_video_encoder in [ 'libvpx-vp9' ]:
 		output_video_compression = round(63 - (facefusion.globals.output_video_quality * 0.63))
-		commands.extend([ '-crf', str(output_video_compression) ])
+		return [ '-crf', str(output_video_compression) ]
 	if facefusion.globals.output_video_encoder in [ 'h264_nvenc', 'hevc_nvenc' ]:
 		output_video_compression = round(51 - (facefusion.globals.output_video_quality * 0.51))
-		commands.extend([ '-cq', str(output_video_compression) ])
-	commands.extend([ '-pix_fmt', 'yuv420p', '-colorspace', 'bt709', '-y', temp_output_video_path ])
-	return run_ffmpeg(commands)
+		return [ '-cq', str(output_video_compression) ]
+	return []
 
 
+@trace('restore_audio')
 def restore_audio(target_path : str, output_path : str) -> bool:
 	fps = detect_fps(target_path)
 	trim_frame_start = facefusion.globals.trim_frame_start
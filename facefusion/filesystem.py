@@ -17,6 +17,11 @@ def get_temp_frame_paths(target_path : str) -> List[str]:
 	return sorted(glob.glob(temp_frames_pattern))
 
 
+def get_temp_frame_number(temp_frame_path : str) -> int:
+	temp_frame_name, _ = os.path.splitext(os.path.basename(temp_frame_path))
+	return int(temp_frame_name)
+
+
 def get_temp_frames_pattern(target_path : str, temp_frame_prefix : str) -> str:
 	temp_directory_path = get_temp_directory_path(target_path)
 	return os.path.join(temp_directory_path, temp_frame_prefix + '.' + facefusion.globals.temp_frame_format)
@@ -24,6 +29,8 @@ def get_temp_frames_pattern(target_path : str, temp_frame_prefix : str) -> str:
 
 def get_temp_directory_path(target_path : str) -> str:
 	target_name, _ = os.path.splitext(os.path.basename(target_path))
+	if facefusion.globals.batch_job_id:
+		target_name = facefusion.globals.batch_job_id + '-' + target_name
 	return os.path.join(TEMP_DIRECTORY_PATH, target_name)
 
 
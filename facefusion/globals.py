@@ -1,19 +1,36 @@
 from typing import List, Optional
 
-from facefusion.typing import LogLevel, FaceSelectorMode, FaceAnalyserOrder, FaceAnalyserAge, FaceAnalyserGender, FaceMaskType, FaceMaskRegion, OutputVideoEncoder, FaceDetectorModel, FaceRecognizerModel, TempFrameFormat, Padding
+from facefusion.typing import LogLevel, FaceSelectorMode, FaceAnalyserOrder, FaceAnalyserAge, FaceAnalyserGender, FaceMaskType, FaceMaskRegion, OutputVideoEncoder, FaceDetectorModel, FaceRecognizerModel, TempFrameFormat, Padding, ExecutionBackend, ExecutionPreset, ExecutionMode, ExecutionGraphOptimization
 
 # general
 source_paths : Optional[List[str]] = None
 target_path : Optional[str] = None
 output_path : Optional[str] = None
+batch_path : Optional[str] = None
+batch_job_id : Optional[str] = None
 # misc
 skip_download : Optional[bool] = None
+skip_face_cache : Optional[bool] = None
 headless : Optional[bool] = None
 log_level : Optional[LogLevel] = None
+trace_path : Optional[str] = None
 # execution
 execution_providers : List[str] = []
+execution_backend : Optional[ExecutionBackend] = None
+execution_preset : Optional[ExecutionPreset] = None
 execution_thread_count : Optional[int] = None
 execution_queue_count : Optional[int] = None
+execution_session_count : Optional[int] = None
+execution_session_concurrency : Optional[int] = None
+execution_batch_size : Optional[int] = None
+execution_batch_timeout : Optional[int] = None
+execution_intra_op_thread_count : Optional[int] = None
+execution_inter_op_thread_count : Optional[int] = None
+execution_mode : Optional[ExecutionMode] = None
+execution_graph_optimization : Optional[ExecutionGraphOptimization] = None
+execution_disable_memory_arena : Optional[bool] = None
+execution_disable_spinning : Optional[bool] = None
+execution_disable_model_cache : Optional[bool] = None
 max_memory : Optional[int] = None
 # face analyser
 face_analyser_order : Optional[FaceAnalyserOrder] = None
@@ -23,6 +40,8 @@ face_detector_model : Optional[FaceDetectorModel] = None
 face_detector_size : Optional[str] = None
 face_detector_score : Optional[float] = None
 face_recognizer_model : Optional[FaceRecognizerModel] = None
+face_tracker_interval : Optional[int] = None
+face_store_limit : Optional[int] = None
 # face selector
 face_selector_mode : Optional[FaceSelectorMode] = None
 reference_face_position : Optional[int] = None
@@ -39,12 +58,23 @@ trim_frame_end : Optional[int] = None
 temp_frame_format : Optional[TempFrameFormat] = None
 temp_frame_quality : Optional[int] = None
 keep_temp : Optional[bool] = None
+segment_duration : Optional[int] = None
+stream_frames : Optional[bool] = None
+resume : Optional[bool] = None
 # output creation
 output_image_quality : Optional[int] = None
 output_video_encoder : Optional[OutputVideoEncoder] = None
 output_video_quality : Optional[int] = None
 keep_fps : Optional[bool] = None
 skip_audio : Optional[bool] = None
+# benchmark
+benchmark_path : Optional[str] = None
+benchmark_resolutions : List[str] = []
+benchmark_frame_total : Optional[int] = None
+benchmark_cycles : Optional[int] = None
+benchmark_history_path : Optional[str] = None
+benchmark_baseline : Optional[str] = None
+benchmark_threshold : Optional[int] = None
 # frame processors
 frame_processors : List[str] = []
 # uis
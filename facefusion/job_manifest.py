@@ -0,0 +1,206 @@
+from typing import Any, Dict, List, Optional, Set
+import json
+import os
+import threading
+
+import facefusion.globals
+from facefusion.filesystem import get_temp_directory_path, is_file
+from facefusion.processors.frame import globals as frame_processors_globals
+from facefusion.typing import JobManifest, JobStage
+
+JOB_MANIFEST : Optional[JobManifest] = None
+JOB_DIRECTORY_PATH : Optional[str] = None
+JOB_FRAMES : Dict[str, Set[str]] = {}
+JOB_FRAME_PROCESSORS : List[str] = []
+THREAD_LOCK : threading.Lock = threading.Lock()
+JOB_MANIFEST_NAME = 'manifest.json'
+JOB_FRAMES_NAME = 'manifest.log'
+JOB_FRAME_PREFIX = '.processed-'
+JOB_SETTINGS_IGNORES =\
+[
+	'output_path',
+	'batch_path',
+	'batch_job_id',
+	'skip_download',
+	'skip_face_cache',
+	'headless',
+	'log_level',
+	'execution_providers',
+	'execution_backend',
+	'execution_thread_count',
+	'execution_queue_count',
+	'execution_session_count',
+	'execution_session_concurrency',
+	'execution_batch_size',
+	'execution_batch_timeout',
+	'execution_preset',
+	'execution_intra_op_thread_count',
+	'execution_inter_op_thread_count',
+	'execution_mode',
+	'execution_graph_optimization',
+	'execution_disable_memory_arena',
+	'execution_disable_spinning',
+	'execution_disable_model_cache',
+	'max_memory',
+	'face_store_limit',
+	'segment_duration',
+	'stream_frames',
+	'keep_temp',
+	'resume',
+	'trace_path',
+	'ui_layouts'
+]
+JOB_MERGE_SETTINGS =\
+[
+	'output_video_encoder',
+	'output_video_quality'
+]
+
+
+def create_job_manifest(target_path : str) -> None:
+	global JOB_MANIFEST
+	global JOB_DIRECTORY_PATH
+	global JOB_FRAMES
+
+	JOB_MANIFEST =\
+	{
+		'settings': get_job_settings(),
+		'merge_settings': get_job_merge_settings(),
+		'stages':
+		{
+			'extract_frames': False,
+			'merge_video': False,
+			'restore_audio': False
+		}
+	}
+	JOB_DIRECTORY_PATH = get_temp_directory_path(target_path)
+	JOB_FRAMES = {}
+	job_frames_path = os.path.join(JOB_DIRECTORY_PATH, JOB_FRAMES_NAME)
+	if is_file(job_frames_path):
+		os.remove(job_frames_path)
+	save_job_manifest()
+
+
+def resume_job_manifest(target_path : str) -> bool:
+	global JOB_MANIFEST
+	global JOB_DIRECTORY_PATH
+	global JOB_FRAMES
+
+	job_directory_path = get_temp_directory_path(target_path)
+	job_manifest_path = os.path.join(job_directory_path, JOB_MANIFEST_NAME)
+	job_frames_path = os.path.join(job_directory_path, JOB_FRAMES_NAME)
+	if is_file(job_manifest_path):
+		with open(job_manifest_path, 'r') as job_manifest_file:
+			job_manifest = json.load(job_manifest_file)
+		if job_manifest.get('settings') == get_job_settings():
+			if job_manifest.get('merge_settings') != get_job_merge_settings():
+				job_manifest['merge_settings'] = get_job_merge_settings()
+				job_manifest['stages']['merge_video'] = False
+				job_manifest['stages']['restore_audio'] = False
+			JOB_MANIFEST = job_manifest
+			JOB_DIRECTORY_PATH = job_directory_path
+			JOB_FRAMES = {}
+			if is_file(job_frames_path):
+				with open(job_frames_path, 'r') as job_frames_file:
+					for line in job_frames_file:
+						frame_processor, _, frame_name = line.strip().partition(' ')
+						if frame_name:
+							JOB_FRAMES.setdefault(frame_processor, set()).add(frame_name)
+			save_job_manifest()
+			return True
+	return False
+
+
+def save_job_manifest() -> None:
+	if JOB_MANIFEST and JOB_DIRECTORY_PATH:
+		job_manifest_path = os.path.join(JOB_DIRECTORY_PATH, JOB_MANIFEST_NAME)
+		with open(job_manifest_path + '.tmp', 'w') as job_manifest_file:
+			json.dump(JOB_MANIFEST, job_manifest_file, indent = 4)
+		os.replace(job_manifest_path + '.tmp', job_manifest_path)
+
+
+def clear_job_manifest() -> None:
+	global JOB_MANIFEST
+	global JOB_DIRECTORY_PATH
+	global JOB_FRAMES
+	global JOB_FRAME_PROCESSORS
+
+	JOB_MANIFEST = None
+	JOB_DIRECTORY_PATH = None
+	JOB_FRAMES = {}
+	JOB_FRAME_PROCESSORS = []
+
+
+def get_job_settings() -> Dict[str, Any]:
+	job_settings = {}
+	for settings in [ vars(facefusion.globals), vars(frame_processors_globals) ]:
+		for key, value in settings.items():
+			if not key.startswith('_') and key not in JOB_SETTINGS_IGNORES + JOB_MERGE_SETTINGS and isinstance(value, (str, int, float, bool, list, tuple, type(None))):
+				job_settings[key] = value
+	return json.loads(json.dumps(job_settings))
+
+
+def get_job_merge_settings() -> Dict[str, Any]:
+	job_merge_settings = { key: getattr(facefusion.globals, key) for key in JOB_MERGE_SETTINGS }
+	return json.loads(json.dumps(job_merge_settings))
+
+
+def is_job_stage_done(job_stage : JobStage) -> bool:
+	if JOB_MANIFEST:
+		return JOB_MANIFEST.get('stages').get(job_stage) is True
+	return False
+
+
+def set_job_stage_done(job_stage : JobStage) -> None:
+	if JOB_MANIFEST:
+		JOB_MANIFEST['stages'][job_stage] = True
+		save_job_manifest()
+
+
+def set_job_frame_processors(frame_processors : List[str]) -> None:
+	global JOB_FRAME_PROCESSORS
+
+	JOB_FRAME_PROCESSORS = frame_processors
+
+
+def restore_job_frames(frame_processors : List[str], temp_frame_paths : List[str]) -> None:
+	for temp_frame_path in temp_frame_paths:
+		job_frame_path = resolve_job_frame_path(temp_frame_path)
+		if is_file(job_frame_path):
+			if is_job_frame_done(frame_processors, temp_frame_path):
+				os.replace(job_frame_path, temp_frame_path)
+			else:
+				os.remove(job_frame_path)
+
+
+def get_job_pending_frame_paths(frame_processors : List[str], temp_frame_paths : List[str]) -> List[str]:
+	return [ temp_frame_path for temp_frame_path in temp_frame_paths if not is_job_frame_done(frame_processors, temp_frame_path) ]
+
+
+def is_job_frame_done(frame_processors : List[str], temp_frame_path : str) -> bool:
+	frame_name = os.path.basename(temp_frame_path)
+	return all(frame_name in JOB_FRAMES.get(frame_processor, set()) for frame_processor in frame_processors)
+
+
+def get_job_frame_path(temp_frame_path : str) -> str:
+	if JOB_MANIFEST and JOB_DIRECTORY_PATH and JOB_FRAME_PROCESSORS:
+		return resolve_job_frame_path(temp_frame_path)
+	return temp_frame_path
+
+
+def resolve_job_frame_path(temp_frame_path : str) -> str:
+	return os.path.join(os.path.dirname(temp_frame_path), JOB_FRAME_PREFIX + os.path.basename(temp_frame_path))
+
+
+def set_job_frame_done(temp_frame_path : str) -> None:
+	if JOB_MANIFEST and JOB_DIRECTORY_PATH and JOB_FRAME_PROCESSORS:
+		frame_name = os.path.basename(temp_frame_path)
+		job_frames_path = os.path.join(JOB_DIRECTORY_PATH, JOB_FRAMES_NAME)
+		job_frame_path = resolve_job_frame_path(temp_frame_path)
+		with THREAD_LOCK:
+			with open(job_frames_path, 'a') as job_frames_file:
+				for frame_processor in JOB_FRAME_PROCESSORS:
+					job_frames_file.write(frame_processor + ' ' + frame_name + '\n')
+					JOB_FRAMES.setdefault(frame_processor, set()).add(frame_name)
+		if is_file(job_frame_path):
+			os.replace(job_frame_path, temp_frame_path)
@@ -1,17 +1,38 @@
 import sys
 import importlib
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from argparse import Namespace
+import threading
+import time
+import multiprocessing
+from multiprocessing import resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed, wait, Future
+from collections import deque
+from functools import partial
 from queue import Queue
 from types import ModuleType
-from typing import Any, List
+from typing import Any, Callable, Dict, List, Iterator, Generator, Deque, Optional, Tuple
 from tqdm import tqdm
+import numpy
 
 import facefusion.globals
-from facefusion.typing import Process_Frames
+from facefusion.typing import Process_Frames, Update_Process, Face, FaceSet, Frame, SharedFrame, ScheduleReport
 from facefusion.execution_helper import encode_execution_providers
+from facefusion.content_analyser import clear_content_analyser
+from facefusion.face_analyser import get_average_face, clear_face_analyser
+from facefusion.face_masker import clear_face_occluder, clear_face_parser
+from facefusion.face_tracker import is_face_tracker_enabled, start_face_tracker, stop_face_tracker
+from facefusion.face_cache import get_cached_face_counts, pop_cached_faces, append_cached_faces
+from facefusion.face_store import get_reference_faces, create_frame_context, set_context_frame, clear_frame_context, get_static_faces_statistics, pop_static_faces_statistics, append_static_faces_statistics
+from facefusion.vision import read_image, read_static_images, write_image
+from facefusion.filesystem import get_temp_frame_number
+from facefusion.job_manifest import get_job_frame_path, set_job_frame_done
+from facefusion.tracer import trace, append_trace_events, pop_trace_events
 from facefusion import logger, wording
 
 FRAME_PROCESSORS_MODULES : List[ModuleType] = []
+REGISTERED_FRAME_PROCESSORS : List[str] = []
+PROCESS_WORKER : Dict[str, Any] = {}
 FRAME_PROCESSORS_METHODS =\
 [
 	'get_frame_processor',
@@ -24,9 +45,7 @@ FRAME_PROCESSORS_METHODS =\
 	'pre_process',
 	'get_reference_frame',
 	'process_frame',
-	'process_frames',
 	'process_image',
-	'process_video',
 	'post_process'
 ]
 
@@ -45,6 +64,20 @@ def load_frame_processor_module(frame_processor : str) -> Any:
 	return frame_processor_module
 
 
+def register_frame_processors_args(program : Any, frame_processors : List[str]) -> None:
+	for frame_processor in frame_processors:
+		if frame_processor not in REGISTERED_FRAME_PROCESSORS:
+			frame_processor_module = load_frame_processor_module(frame_processor)
+			frame_processor_module.register_args(program)
+			REGISTERED_FRAME_PROCESSORS.append(frame_processor)
+
+
+def apply_frame_processors_args(args : Namespace) -> None:
+	for frame_processor in REGISTERED_FRAME_PROCESSORS:
+		frame_processor_module = load_frame_processor_module(frame_processor)
+		frame_processor_module.apply_args(args)
+
+
 def get_frame_processors_modules(frame_processors : List[str]) -> List[ModuleType]:
 	global FRAME_PROCESSORS_MODULES
 
@@ -63,24 +96,284 @@ def clear_frame_processors_modules() -> None:
 	FRAME_PROCESSORS_MODULES = []
 
 
-def multi_process_frames(source_paths : List[str], temp_frame_paths : List[str], process_frames : Process_Frames) -> None:
+def group_frame_processors_modules(frame_processors_modules : List[ModuleType]) -> List[List[ModuleType]]:
+	frame_processors_groups : List[List[ModuleType]] = []
+	for frame_processor_module in frame_processors_modules:
+		if getattr(frame_processor_module, 'SEPARATE_PASS', False) or not frame_processors_groups or getattr(frame_processors_groups[-1][-1], 'SEPARATE_PASS', False):
+			frame_processors_groups.append([ frame_processor_module ])
+		else:
+			frame_processors_groups[-1].append(frame_processor_module)
+	return frame_processors_groups
+
+
+def multi_process_frames(temp_frame_paths : List[str], process_frames : Process_Frames) -> None:
 	with tqdm(total = len(temp_frame_paths), desc = wording.get('processing'), unit = 'frame', ascii = ' =', disable = facefusion.globals.log_level in [ 'warn', 'error' ]) as progress:
 		progress.set_postfix(
 		{
 			'execution_providers': encode_execution_providers(facefusion.globals.execution_providers),
+			'execution_backend': facefusion.globals.execution_backend,
 			'execution_thread_count': facefusion.globals.execution_thread_count,
 			'execution_queue_count': facefusion.globals.execution_queue_count
 		})
-		with ThreadPoolExecutor(max_workers = facefusion.globals.execution_thread_count) as executor:
-			futures = []
+		start_time = time.perf_counter()
+		schedule_reports : List[ScheduleReport] = []
+		if is_face_tracker_enabled():
 			queue_temp_frame_paths : Queue[str] = create_queue(temp_frame_paths)
-			queue_per_future = max(len(temp_frame_paths) // facefusion.globals.execution_thread_count * facefusion.globals.execution_queue_count, 1)
-			while not queue_temp_frame_paths.empty():
-				payload_temp_frame_paths = pick_queue(queue_temp_frame_paths, queue_per_future)
-				future = executor.submit(process_frames, source_paths, payload_temp_frame_paths, progress.update)
-				futures.append(future)
-			for future_done in as_completed(futures):
-				future_done.result()
+			queue_per_future = max(facefusion.globals.execution_queue_count, facefusion.globals.face_tracker_interval)
+		else:
+			queue_temp_frame_paths = create_queue(sort_temp_frame_paths(temp_frame_paths))
+			queue_per_future = facefusion.globals.execution_queue_count
+		if is_process_backend():
+			frame_progress = multiprocessing.get_context('fork').Value('i', 0)
+			with create_process_executor({ 'process_frames': process_frames, 'frame_progress': frame_progress }) as process_executor:
+				futures = []
+				while not queue_temp_frame_paths.empty():
+					payload_temp_frame_paths = pick_queue(queue_temp_frame_paths, queue_per_future)
+					future = process_executor.submit(process_worker_frames, payload_temp_frame_paths)
+					futures.append(future)
+				while futures:
+					futures_done, futures_pending = wait(futures, timeout = 0.5)
+					progress.update(frame_progress.value - progress.n)
+					for future_done in futures_done:
+						schedule_reports.append(future_done.result())
+					futures = list(futures_pending)
+		else:
+			with ThreadPoolExecutor(max_workers = facefusion.globals.execution_thread_count) as thread_executor:
+				futures = []
+				while not queue_temp_frame_paths.empty():
+					payload_temp_frame_paths = pick_queue(queue_temp_frame_paths, queue_per_future)
+					future = thread_executor.submit(process_schedule_frames, process_frames, payload_temp_frame_paths, partial(update_frame_progress, progress))
+					futures.append(future)
+				for future_done in as_completed(futures):
+					schedule_reports.append(future_done.result())
+		for schedule_report in schedule_reports:
+			append_trace_events(schedule_report.get('trace_events'))
+			append_static_faces_statistics(schedule_report.get('static_faces_statistics'))
+			append_cached_faces(schedule_report.get('face_cache_entries'))
+		report_worker_utilisation(schedule_reports, time.perf_counter() - start_time)
+		report_static_faces_statistics()
+
+
+def process_schedule_frames(process_frames : Process_Frames, temp_frame_paths : List[str], update_frame : Callable[[str], None]) -> ScheduleReport:
+	start_time = time.perf_counter()
+	start_face_tracker()
+	try:
+		process_frames(temp_frame_paths, partial(update_schedule_frame, deque(temp_frame_paths), update_frame))
+	finally:
+		stop_face_tracker()
+	return\
+	{
+		'worker_name': get_worker_name(),
+		'frame_total': len(temp_frame_paths),
+		'busy_time': time.perf_counter() - start_time,
+		'trace_events': [],
+		'static_faces_statistics':
+		{
+			'hits': 0,
+			'misses': 0
+		},
+		'face_cache_entries': {}
+	}
+
+
+def update_schedule_frame(payload_temp_frame_paths : Deque[str], update_frame : Callable[[str], None]) -> None:
+	temp_frame_path = payload_temp_frame_paths.popleft()
+	update_frame(temp_frame_path)
+
+
+def sort_temp_frame_paths(temp_frame_paths : List[str]) -> List[str]:
+	face_counts = get_cached_face_counts()
+	if face_counts:
+		face_count_average = sum(face_counts.values()) / len(face_counts)
+		return sorted(temp_frame_paths, key = lambda temp_frame_path: face_counts.get(get_temp_frame_number(temp_frame_path), face_count_average), reverse = True)
+	return temp_frame_paths
+
+
+def get_worker_name() -> str:
+	if multiprocessing.parent_process():
+		return multiprocessing.current_process().name
+	return threading.current_thread().name
+
+
+def report_worker_utilisation(schedule_reports : List[ScheduleReport], process_time : float) -> None:
+	worker_frame_totals : Dict[str, int] = {}
+	worker_busy_times : Dict[str, float] = {}
+	for schedule_report in schedule_reports:
+		worker_name = schedule_report.get('worker_name')
+		worker_frame_totals[worker_name] = worker_frame_totals.get(worker_name, 0) + schedule_report.get('frame_total')
+		worker_busy_times[worker_name] = worker_busy_times.get(worker_name, 0.0) + schedule_report.get('busy_time')
+	for worker_name in sorted(worker_frame_totals):
+		worker_utilisation = round(worker_busy_times.get(worker_name) / max(process_time, 1e-6) * 100, 1)
+		logger.debug(wording.get('worker_utilisation').format(worker_name = worker_name, frame_total = worker_frame_totals.get(worker_name), worker_utilisation = worker_utilisation), __name__.upper())
+
+
+def multi_process_stream(source_paths : List[str], temp_frames : Iterator[Frame], frame_total : int) -> Generator[Frame, None, None]:
+	source_frames = read_static_images(source_paths)
+	source_face = get_average_face(source_frames)
+	reference_faces = get_reference_faces() if 'reference' in facefusion.globals.face_selector_mode else None
+	frame_processors_modules = get_frame_processors_modules(facefusion.globals.frame_processors)
+	buffer_total = facefusion.globals.execution_thread_count * facefusion.globals.execution_queue_count * 2
+	with tqdm(total = frame_total, desc = wording.get('processing'), unit = 'frame', ascii = ' =', disable = facefusion.globals.log_level in [ 'warn', 'error' ]) as progress:
+		progress.set_postfix(
+		{
+			'execution_providers': encode_execution_providers(facefusion.globals.execution_providers),
+			'execution_backend': facefusion.globals.execution_backend,
+			'execution_thread_count': facefusion.globals.execution_thread_count,
+			'execution_queue_count': facefusion.globals.execution_queue_count
+		})
+		if is_process_backend():
+			for result_frame in multi_process_shared_stream(partial(process_fused_frame, frame_processors_modules, source_face, reference_faces), temp_frames, buffer_total):
+				progress.update()
+				yield result_frame
+		else:
+			with ThreadPoolExecutor(max_workers = facefusion.globals.execution_thread_count) as executor:
+				futures : Deque[Future[Frame]] = deque()
+				for frame_number, temp_frame in enumerate(temp_frames, 1):
+					future = executor.submit(process_fused_frame, frame_processors_modules, source_face, reference_faces, temp_frame, frame_number)
+					futures.append(future)
+					if len(futures) >= buffer_total:
+						progress.update()
+						yield futures.popleft().result()
+				while futures:
+					progress.update()
+					yield futures.popleft().result()
+		report_static_faces_statistics()
+
+
+def multi_process_shared_stream(process_frame : Callable[[Frame, int], Frame], temp_frames : Iterator[Frame], buffer_total : int) -> Generator[Frame, None, None]:
+	shared_frames : List[SharedMemory] = []
+	futures : Deque[Tuple[SharedMemory, Future[SharedFrame]]] = deque()
+	try:
+		with create_process_executor({ 'process_frame': process_frame }) as executor:
+			for index, temp_frame in enumerate(temp_frames):
+				if len(futures) >= buffer_total:
+					yield read_shared_frame(*futures.popleft())
+				if len(shared_frames) < buffer_total:
+					shared_frames.append(SharedMemory(create = True, size = temp_frame.nbytes))
+				shared_frame = shared_frames[index % buffer_total]
+				numpy.ndarray(temp_frame.shape, dtype = numpy.uint8, buffer = shared_frame.buf)[:] = temp_frame
+				future = executor.submit(process_shared_frame, shared_frame.name, temp_frame.shape, index + 1)
+				futures.append((shared_frame, future))
+			while futures:
+				yield read_shared_frame(*futures.popleft())
+	finally:
+		for shared_frame in shared_frames:
+			shared_frame.close()
+			shared_frame.unlink()
+
+
+def is_process_backend() -> bool:
+	if facefusion.globals.execution_backend == 'process':
+		if 'fork' in multiprocessing.get_all_start_methods():
+			return True
+		logger.warn(wording.get('execution_backend_not_supported').format(execution_backend = facefusion.globals.execution_backend), __name__.upper())
+	return False
+
+
+def create_process_executor(process_worker : Dict[str, Any]) -> ProcessPoolExecutor:
+	for frame_processor_module in get_frame_processors_modules(facefusion.globals.frame_processors):
+		frame_processor_module.clear_frame_processor()
+	clear_face_analyser()
+	clear_face_occluder()
+	clear_face_parser()
+	clear_content_analyser()
+	resource_tracker.ensure_running()
+	return ProcessPoolExecutor(max_workers = facefusion.globals.execution_thread_count, mp_context = multiprocessing.get_context('fork'), initializer = init_process_worker, initargs = (process_worker,))
+
+
+def report_static_faces_statistics() -> None:
+	static_faces_statistics = get_static_faces_statistics()
+	logger.debug(wording.get('static_faces_statistics').format(hits = static_faces_statistics.get('hits'), misses = static_faces_statistics.get('misses')), __name__.upper())
+
+
+def init_process_worker(process_worker : Dict[str, Any]) -> None:
+	global PROCESS_WORKER
+
+	PROCESS_WORKER = process_worker
+	pop_trace_events()
+	pop_static_faces_statistics()
+	pop_cached_faces()
+
+
+def process_worker_frames(temp_frame_paths : List[str]) -> ScheduleReport:
+	process_frames = PROCESS_WORKER.get('process_frames')
+	schedule_report = process_schedule_frames(process_frames, temp_frame_paths, update_worker_frame_progress)
+	schedule_report['trace_events'] = pop_trace_events()
+	schedule_report['static_faces_statistics'] = pop_static_faces_statistics()
+	schedule_report['face_cache_entries'] = pop_cached_faces()
+	return schedule_report
+
+
+def update_worker_frame_progress(temp_frame_path : str) -> None:
+	set_job_frame_done(temp_frame_path)
+	frame_progress = PROCESS_WORKER.get('frame_progress')
+	with frame_progress.get_lock():
+		frame_progress.value += 1
+
+
+def process_shared_frame(shared_frame_name : str, temp_frame_shape : Tuple[int, ...], frame_number : int) -> SharedFrame:
+	process_frame = PROCESS_WORKER.get('process_frame')
+	shared_frame = SharedMemory(name = shared_frame_name)
+	temp_frame : Frame = numpy.ndarray(temp_frame_shape, dtype = numpy.uint8, buffer = shared_frame.buf)
+	result_frame = process_frame(temp_frame, frame_number)
+	result_frame_shape = result_frame.shape
+	result_shared_frame_name = None
+	if result_frame.nbytes > shared_frame.size:
+		result_shared_frame = SharedMemory(create = True, size = result_frame.nbytes)
+		numpy.ndarray(result_frame_shape, dtype = numpy.uint8, buffer = result_shared_frame.buf)[:] = result_frame
+		result_shared_frame_name = result_shared_frame.name
+		result_shared_frame.close()
+	else:
+		numpy.ndarray(result_frame_shape, dtype = numpy.uint8, buffer = shared_frame.buf)[:] = result_frame
+	del temp_frame, result_frame
+	shared_frame.close()
+	return result_shared_frame_name, result_frame_shape, pop_trace_events(), pop_static_faces_statistics(), pop_cached_faces()
+
+
+def read_shared_frame(shared_frame : SharedMemory, future : Future[SharedFrame]) -> Frame:
+	result_shared_frame_name, result_frame_shape, trace_events, static_faces_statistics, face_cache_entries = future.result()
+	append_trace_events(trace_events)
+	append_static_faces_statistics(static_faces_statistics)
+	append_cached_faces(face_cache_entries)
+	if result_shared_frame_name:
+		result_shared_frame = SharedMemory(name = result_shared_frame_name)
+		result_frame : Frame = numpy.ndarray(result_frame_shape, dtype = numpy.uint8, buffer = result_shared_frame.buf).copy()
+		result_shared_frame.close()
+		result_shared_frame.unlink()
+		return result_frame
+	return numpy.ndarray(result_frame_shape, dtype = numpy.uint8, buffer = shared_frame.buf).copy()
+
+
+@trace('process_frame')
+def process_fused_frame(frame_processors_modules : List[ModuleType], source_face : Face, reference_faces : FaceSet, temp_frame : Frame, frame_number : Optional[int] = None) -> Frame:
+	create_frame_context(temp_frame, frame_number)
+	try:
+		for frame_processor_module in frame_processors_modules:
+			temp_frame = frame_processor_module.process_frame(source_face, reference_faces, temp_frame)
+			set_context_frame(temp_frame)
+	finally:
+		clear_frame_context()
+	return temp_frame
+
+
+def process_fused_frames(frame_processors_modules : List[ModuleType], source_face : Face, reference_faces : FaceSet, temp_frame_paths : List[str], update_progress : Update_Process) -> None:
+	for temp_frame_path in temp_frame_paths:
+		temp_frame = read_image(temp_frame_path)
+		result_frame = process_fused_frame(frame_processors_modules, source_face, reference_faces, temp_frame, get_temp_frame_number(temp_frame_path))
+		write_image(get_job_frame_path(temp_frame_path), result_frame)
+		update_progress()
+
+
+def process_fused_video(frame_processors_modules : List[ModuleType], source_paths : List[str], temp_frame_paths : List[str]) -> None:
+	source_frames = read_static_images(source_paths)
+	source_face = get_average_face(source_frames)
+	reference_faces = get_reference_faces() if 'reference' in facefusion.globals.face_selector_mode else None
+	multi_process_frames(temp_frame_paths, partial(process_fused_frames, frame_processors_modules, source_face, reference_faces))
+
+
+def update_frame_progress(progress : tqdm, temp_frame_path : str) -> None:
+	set_job_frame_done(temp_frame_path)
+	progress.update()
 
 
 def create_queue(temp_frame_paths : List[str]) -> Queue[str]:
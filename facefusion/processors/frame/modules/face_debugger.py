@@ -1,16 +1,15 @@
 from typing import Any, List, Literal
-from argparse import ArgumentParser
+from argparse import ArgumentParser, Namespace
 import cv2
 import numpy
 
 import facefusion.globals
-import facefusion.processors.frame.core as frame_processors
 from facefusion import wording
 from facefusion.face_analyser import get_one_face, get_average_face, get_many_faces, find_similar_faces, clear_face_analyser
 from facefusion.face_store import get_reference_faces
 from facefusion.content_analyser import clear_content_analyser
-from facefusion.typing import Face, FaceSet, Frame, Update_Process, ProcessMode
-from facefusion.vision import read_image, read_static_image, read_static_images, write_image
+from facefusion.typing import Face, FaceSet, Frame, ProcessMode
+from facefusion.vision import read_static_image, read_static_images, write_image
 from facefusion.face_helper import warp_face
 from facefusion.face_masker import create_static_box_mask, create_occlusion_mask, create_region_mask, clear_face_occluder, clear_face_parser
 from facefusion.processors.frame import globals as frame_processors_globals, choices as frame_processors_choices
@@ -38,8 +37,7 @@ def register_args(program : ArgumentParser) -> None:
 	program.add_argument('--face-debugger-items', help = wording.get('face_debugger_items_help').format(choices = ', '.join(frame_processors_choices.face_debugger_items)), default = [ 'kps', 'face-mask' ], choices = frame_processors_choices.face_debugger_items, nargs = '+', metavar = 'FACE_DEBUGGER_ITEMS')
 
 
-def apply_args(program : ArgumentParser) -> None:
-	args = program.parse_args()
+def apply_args(args : Namespace) -> None:
 	frame_processors_globals.face_debugger_items = args.face_debugger_items
 
 
@@ -101,6 +99,7 @@ def get_reference_frame(source_face : Face, target_face : Face, temp_frame : Fra
 
 
 def process_frame(source_face : Face, reference_faces : FaceSet, temp_frame : Frame) -> Frame:
+	temp_frame = temp_frame.copy()
 	if 'reference' in facefusion.globals.face_selector_mode:
 		similar_faces = find_similar_faces(temp_frame, reference_faces, facefusion.globals.reference_face_distance)
 		if similar_faces:
@@ -118,17 +117,6 @@ def process_frame(source_face : Face, reference_faces : FaceSet, temp_frame : Fr
 	return temp_frame
 
 
-def process_frames(source_paths : List[str], temp_frame_paths : List[str], update_progress : Update_Process) -> None:
-	source_frames = read_static_images(source_paths)
-	source_face = get_average_face(source_frames)
-	reference_faces = get_reference_faces() if 'reference' in facefusion.globals.face_selector_mode else None
-	for temp_frame_path in temp_frame_paths:
-		temp_frame = read_image(temp_frame_path)
-		result_frame = process_frame(source_face, reference_faces, temp_frame)
-		write_image(temp_frame_path, result_frame)
-		update_progress()
-
-
 def process_image(source_paths : List[str], target_path : str, output_path : str) -> None:
 	source_frames = read_static_images(source_paths)
 	source_face = get_average_face(source_frames)
@@ -136,7 +124,3 @@ def process_image(source_paths : List[str], target_path : str, output_path : str
 	reference_faces = get_reference_faces() if 'reference' in facefusion.globals.face_selector_mode else None
 	result_frame = process_frame(source_face, reference_faces, target_frame)
 	write_image(output_path, result_frame)
-
-
-def process_video(source_paths : List[str], temp_frame_paths : List[str]) -> None:
-	frame_processors.multi_process_frames(source_paths, temp_frame_paths, process_frames)
@@ -1,28 +1,28 @@
 from typing import Any, List, Literal, Optional
-from argparse import ArgumentParser
-import cv2
+from argparse import ArgumentParser, Namespace
+from functools import partial
 import threading
 import numpy
-import onnxruntime
 
 import facefusion.globals
-import facefusion.processors.frame.core as frame_processors
 from facefusion import logger, wording
 from facefusion.face_analyser import get_many_faces, clear_face_analyser, find_similar_faces, get_one_face
-from facefusion.face_helper import warp_face, paste_back
+from facefusion.face_helper import warp_face, paste_back, paste_back_many
 from facefusion.content_analyser import clear_content_analyser
 from facefusion.face_store import get_reference_faces
-from facefusion.typing import Face, FaceSet, Frame, Update_Process, ProcessMode, ModelSet, OptionsWithModel
+from facefusion.typing import Face, FaceSet, FacePaste, Frame, ProcessMode, ModelSet, OptionsWithModel
 from facefusion.common_helper import create_metavar
 from facefusion.filesystem import is_file, is_image, is_video, resolve_relative_path
 from facefusion.download import conditional_download, is_download_done
-from facefusion.vision import read_image, read_static_image, write_image
+from facefusion.vision import read_static_image, write_image
 from facefusion.processors.frame import globals as frame_processors_globals
 from facefusion.processors.frame import choices as frame_processors_choices
 from facefusion.face_masker import create_static_box_mask, create_occlusion_mask, clear_face_occluder
+from facefusion.session_pool import create_session_pool, create_inference_session
+from facefusion.session_batcher import create_session_batcher
+from facefusion.tracer import trace, trace_span
 
 FRAME_PROCESSOR = None
-THREAD_SEMAPHORE : threading.Semaphore = threading.Semaphore()
 THREAD_LOCK : threading.Lock = threading.Lock()
 NAME = __name__.upper()
 MODELS : ModelSet =\
@@ -86,7 +86,7 @@ def get_frame_processor() -> Any:
 	with THREAD_LOCK:
 		if FRAME_PROCESSOR is None:
 			model_path = get_options('model').get('path')
-			FRAME_PROCESSOR = onnxruntime.InferenceSession(model_path, providers = facefusion.globals.execution_providers)
+			FRAME_PROCESSOR = create_session_batcher(create_session_pool(partial(create_inference_session, model_path)))
 	return FRAME_PROCESSOR
 
 
@@ -110,6 +110,11 @@ def get_options(key : Literal['model']) -> Any:
 def set_options(key : Literal['model'], value : Any) -> None:
 	global OPTIONS
 
+	if OPTIONS is None:
+		OPTIONS =\
+		{
+			'model': value
+		}
 	OPTIONS[key] = value
 
 
@@ -118,8 +123,7 @@ def register_args(program : ArgumentParser) -> None:
 	program.add_argument('--face-enhancer-blend', help = wording.get('frame_processor_blend_help'), type = int, default = 80, choices = frame_processors_choices.face_enhancer_blend_range, metavar = create_metavar(frame_processors_choices.face_enhancer_blend_range))
 
 
-def apply_args(program : ArgumentParser) -> None:
-	args = program.parse_args()
+def apply_args(args : Namespace) -> None:
 	frame_processors_globals.face_enhancer_model = args.face_enhancer_model
 	frame_processors_globals.face_enhancer_blend = args.face_enhancer_blend
 
@@ -158,7 +162,13 @@ def post_process() -> None:
 	read_static_image.cache_clear()
 
 
-def enhance_face(target_face: Face, temp_frame: Frame) -> Frame:
+def enhance_face(target_face : Face, temp_frame : Frame) -> Frame:
+	crop_frame, crop_mask, affine_matrix = create_face_paste(target_face, temp_frame)
+	return paste_back(temp_frame, crop_frame, crop_mask, affine_matrix)
+
+
+@trace('enhance_face')
+def create_face_paste(target_face : Face, temp_frame : Frame) -> FacePaste:
 	frame_processor = get_frame_processor()
 	model_template = get_options('model').get('template')
 	model_size = get_options('model').get('size')
@@ -176,13 +186,11 @@ def enhance_face(target_face: Face, temp_frame: Frame) -> Frame:
 			frame_processor_inputs[frame_processor_input.name] = crop_frame
 		if frame_processor_input.name == 'weight':
 			frame_processor_inputs[frame_processor_input.name] = numpy.array([ 1 ], dtype = numpy.double)
-	with THREAD_SEMAPHORE:
+	with trace_span('enhance_face_inference'):
 		crop_frame = frame_processor.run(None, frame_processor_inputs)[0][0]
 	crop_frame = normalize_crop_frame(crop_frame)
-	crop_mask = numpy.minimum.reduce(crop_mask_list).clip(0, 1)
-	paste_frame = paste_back(temp_frame, crop_frame, crop_mask, affine_matrix)
-	temp_frame = blend_frame(temp_frame, paste_frame)
-	return temp_frame
+	crop_mask = numpy.minimum.reduce(crop_mask_list).clip(0, 1) * (frame_processors_globals.face_enhancer_blend / 100)
+	return crop_frame, crop_mask, affine_matrix
 
 
 def prepare_crop_frame(crop_frame : Frame) -> Frame:
@@ -201,49 +209,31 @@ def normalize_crop_frame(crop_frame : Frame) -> Frame:
 	return crop_frame
 
 
-def blend_frame(temp_frame : Frame, paste_frame : Frame) -> Frame:
-	face_enhancer_blend = 1 - (frame_processors_globals.face_enhancer_blend / 100)
-	temp_frame = cv2.addWeighted(temp_frame, face_enhancer_blend, paste_frame, 1 - face_enhancer_blend, 0)
-	return temp_frame
-
-
 def get_reference_frame(source_face : Face, target_face : Face, temp_frame : Frame) -> Optional[Frame]:
 	return enhance_face(target_face, temp_frame)
 
 
 def process_frame(source_face : Face, reference_faces : FaceSet, temp_frame : Frame) -> Frame:
+	target_faces : List[Face] = []
 	if 'reference' in facefusion.globals.face_selector_mode:
 		similar_faces = find_similar_faces(temp_frame, reference_faces, facefusion.globals.reference_face_distance)
 		if similar_faces:
-			for similar_face in similar_faces:
-				temp_frame = enhance_face(similar_face, temp_frame)
+			target_faces.extend(similar_faces)
 	if 'one' in facefusion.globals.face_selector_mode:
 		target_face = get_one_face(temp_frame)
 		if target_face:
-			temp_frame = enhance_face(target_face, temp_frame)
+			target_faces.append(target_face)
 	if 'many' in facefusion.globals.face_selector_mode:
 		many_faces = get_many_faces(temp_frame)
 		if many_faces:
-			for target_face in many_faces:
-				temp_frame = enhance_face(target_face, temp_frame)
+			target_faces.extend(many_faces)
+	if target_faces:
+		temp_frame = paste_back_many(temp_frame, [ create_face_paste(target_face, temp_frame) for target_face in target_faces ])
 	return temp_frame
 
 
-def process_frames(source_path : List[str], temp_frame_paths : List[str], update_progress : Update_Process) -> None:
-	reference_faces = get_reference_faces() if 'reference' in facefusion.globals.face_selector_mode else None
-	for temp_frame_path in temp_frame_paths:
-		temp_frame = read_image(temp_frame_path)
-		result_frame = process_frame(None, reference_faces, temp_frame)
-		write_image(temp_frame_path, result_frame)
-		update_progress()
-
-
 def process_image(source_path : str, target_path : str, output_path : str) -> None:
 	reference_faces = get_reference_faces() if 'reference' in facefusion.globals.face_selector_mode else None
 	target_frame = read_static_image(target_path)
 	result_frame = process_frame(None, reference_faces, target_frame)
 	write_image(output_path, result_frame)
-
-
-def process_video(source_paths : List[str], temp_frame_paths : List[str]) -> None:
-	frame_processors.multi_process_frames(None, temp_frame_paths, process_frames)
@@ -1,25 +1,27 @@
 from typing import Any, List, Literal, Optional
-from argparse import ArgumentParser
+from argparse import ArgumentParser, Namespace
+from functools import partial
 import threading
 import numpy
 import onnx
-import onnxruntime
 from onnx import numpy_helper
 
 import facefusion.globals
-import facefusion.processors.frame.core as frame_processors
 from facefusion import logger, wording
 from facefusion.face_analyser import get_one_face, get_average_face, get_many_faces, find_similar_faces, clear_face_analyser
-from facefusion.face_helper import warp_face, paste_back
+from facefusion.face_helper import warp_face, paste_back, paste_back_many
 from facefusion.face_store import get_reference_faces
 from facefusion.content_analyser import clear_content_analyser
-from facefusion.typing import Face, FaceSet, Frame, Update_Process, ProcessMode, ModelSet, OptionsWithModel, Embedding
+from facefusion.typing import Face, FaceSet, FacePaste, Frame, ProcessMode, ModelSet, OptionsWithModel, Embedding
 from facefusion.filesystem import is_file, is_image, are_images, is_video, resolve_relative_path
 from facefusion.download import conditional_download, is_download_done
-from facefusion.vision import read_image, read_static_image, read_static_images, write_image
+from facefusion.vision import read_static_image, read_static_images, write_image
 from facefusion.processors.frame import globals as frame_processors_globals
 from facefusion.processors.frame import choices as frame_processors_choices
 from facefusion.face_masker import create_static_box_mask, create_occlusion_mask, create_region_mask, clear_face_occluder, clear_face_parser
+from facefusion.session_pool import create_session_pool, create_inference_session
+from facefusion.session_batcher import create_session_batcher
+from facefusion.tracer import trace, trace_span
 
 FRAME_PROCESSOR = None
 MODEL_MATRIX = None
@@ -87,7 +89,7 @@ def get_frame_processor() -> Any:
 	with THREAD_LOCK:
 		if FRAME_PROCESSOR is None:
 			model_path = get_options('model').get('path')
-			FRAME_PROCESSOR = onnxruntime.InferenceSession(model_path, providers = facefusion.globals.execution_providers)
+			FRAME_PROCESSOR = create_session_batcher(create_session_pool(partial(create_inference_session, model_path)))
 	return FRAME_PROCESSOR
 
 
@@ -128,6 +130,11 @@ def get_options(key : Literal['model']) -> Any:
 def set_options(key : Literal['model'], value : Any) -> None:
 	global OPTIONS
 
+	if OPTIONS is None:
+		OPTIONS =\
+		{
+			'model': value
+		}
 	OPTIONS[key] = value
 
 
@@ -135,8 +142,7 @@ def register_args(program : ArgumentParser) -> None:
 	program.add_argument('--face-swapper-model', help = wording.get('frame_processor_model_help'), default = 'inswapper_128', choices = frame_processors_choices.face_swapper_models)
 
 
-def apply_args(program : ArgumentParser) -> None:
-	args = program.parse_args()
+def apply_args(args : Namespace) -> None:
 	frame_processors_globals.face_swapper_model = args.face_swapper_model
 	if args.face_swapper_model == 'blendswap_256':
 		facefusion.globals.face_recognizer_model = 'arcface_blendswap'
@@ -190,6 +196,12 @@ def post_process() -> None:
 
 
 def swap_face(source_face : Face, target_face : Face, temp_frame : Frame) -> Frame:
+	crop_frame, crop_mask, affine_matrix = create_face_paste(source_face, target_face, temp_frame)
+	return paste_back(temp_frame, crop_frame, crop_mask, affine_matrix)
+
+
+@trace('swap_face')
+def create_face_paste(source_face : Face, target_face : Face, temp_frame : Frame) -> FacePaste:
 	frame_processor = get_frame_processor()
 	model_template = get_options('model').get('template')
 	model_size = get_options('model').get('size')
@@ -210,13 +222,13 @@ def swap_face(source_face : Face, target_face : Face, temp_frame : Frame) -> Fra
 				frame_processor_inputs[frame_processor_input.name] = prepare_source_embedding(source_face)
 		if frame_processor_input.name == 'target':
 			frame_processor_inputs[frame_processor_input.name] = crop_frame
-	crop_frame = frame_processor.run(None, frame_processor_inputs)[0][0]
+	with trace_span('swap_face_inference'):
+		crop_frame = frame_processor.run(None, frame_processor_inputs)[0][0]
 	crop_frame = normalize_crop_frame(crop_frame)
 	if 'region' in facefusion.globals.face_mask_types:
 		crop_mask_list.append(create_region_mask(crop_frame, facefusion.globals.face_mask_regions))
 	crop_mask = numpy.minimum.reduce(crop_mask_list).clip(0, 1)
-	temp_frame = paste_back(temp_frame, crop_frame, crop_mask, affine_matrix)
-	return temp_frame
+	return crop_frame, crop_mask, affine_matrix
 
 
 def prepare_source_frame(source_face : Face) -> Frame:
@@ -261,34 +273,24 @@ def get_reference_frame(source_face : Face, target_face : Face, temp_frame : Fra
 
 
 def process_frame(source_face : Face, reference_faces : FaceSet, temp_frame : Frame) -> Frame:
+	target_faces : List[Face] = []
 	if 'reference' in facefusion.globals.face_selector_mode:
 		similar_faces = find_similar_faces(temp_frame, reference_faces, facefusion.globals.reference_face_distance)
 		if similar_faces:
-			for similar_face in similar_faces:
-				temp_frame = swap_face(source_face, similar_face, temp_frame)
+			target_faces.extend(similar_faces)
 	if 'one' in facefusion.globals.face_selector_mode:
 		target_face = get_one_face(temp_frame)
 		if target_face:
-			temp_frame = swap_face(source_face, target_face, temp_frame)
+			target_faces.append(target_face)
 	if 'many' in facefusion.globals.face_selector_mode:
 		many_faces = get_many_faces(temp_frame)
 		if many_faces:
-			for target_face in many_faces:
-				temp_frame = swap_face(source_face, target_face, temp_frame)
+			target_faces.extend(many_faces)
+	if target_faces:
+		temp_frame = paste_back_many(temp_frame, [ create_face_paste(source_face, target_face, temp_frame) for target_face in target_faces ])
 	return temp_frame
 
 
-def process_frames(source_paths : List[str], temp_frame_paths : List[str], update_progress : Update_Process) -> None:
-	source_frames = read_static_images(source_paths)
-	source_face = get_average_face(source_frames)
-	reference_faces = get_reference_faces() if 'reference' in facefusion.globals.face_selector_mode else None
-	for temp_frame_path in temp_frame_paths:
-		temp_frame = read_image(temp_frame_path)
-		result_frame = process_frame(source_face, reference_faces, temp_frame)
-		write_image(temp_frame_path, result_frame)
-		update_progress()
-
-
 def process_image(source_paths : List[str], target_path : str, output_path : str) -> None:
 	source_frames = read_static_images(source_paths)
 	source_face = get_average_face(source_frames)
@@ -296,7 +298,3 @@ def process_image(source_paths : List[str], target_path : str, output_path : str
 	target_frame = read_static_image(target_path)
 	result_frame = process_frame(source_face, reference_faces, target_frame)
 	write_image(output_path, result_frame)
-
-
-def process_video(source_paths : List[str], temp_frame_paths : List[str]) -> None:
-	frame_processors.multi_process_frames(source_paths, temp_frame_paths, process_frames)
@@ -1,28 +1,29 @@
 from typing import Any, List, Literal, Optional
-from argparse import ArgumentParser
+from argparse import ArgumentParser, Namespace
 import threading
 import cv2
 from basicsr.archs.rrdbnet_arch import RRDBNet
 from realesrgan import RealESRGANer
 
 import facefusion.globals
-import facefusion.processors.frame.core as frame_processors
 from facefusion import logger, wording
 from facefusion.face_analyser import clear_face_analyser
 from facefusion.content_analyser import clear_content_analyser
-from facefusion.typing import Face, FaceSet, Frame, Update_Process, ProcessMode, ModelSet, OptionsWithModel
+from facefusion.typing import Face, FaceSet, Frame, ProcessMode, ModelSet, OptionsWithModel
 from facefusion.common_helper import create_metavar
 from facefusion.execution_helper import map_device
 from facefusion.filesystem import is_file, resolve_relative_path
 from facefusion.download import conditional_download, is_download_done
-from facefusion.vision import read_image, read_static_image, write_image
+from facefusion.vision import read_static_image, write_image
 from facefusion.processors.frame import globals as frame_processors_globals
 from facefusion.processors.frame import choices as frame_processors_choices
+from facefusion.session_pool import create_session_pool
+from facefusion.tracer import trace
 
 FRAME_PROCESSOR = None
-THREAD_SEMAPHORE : threading.Semaphore = threading.Semaphore()
 THREAD_LOCK : threading.Lock = threading.Lock()
 NAME = __name__.upper()
+SEPARATE_PASS = True
 MODELS : ModelSet =\
 {
 	'real_esrgan_x2plus':
@@ -52,21 +53,25 @@ def get_frame_processor() -> Any:
 
 	with THREAD_LOCK:
 		if FRAME_PROCESSOR is None:
-			model_path = get_options('model').get('path')
-			model_scale = get_options('model').get('scale')
-			FRAME_PROCESSOR = RealESRGANer(
-				model_path = model_path,
-				model = RRDBNet(
-					num_in_ch = 3,
-					num_out_ch = 3,
-					scale = model_scale
-				),
-				device = map_device(facefusion.globals.execution_providers),
-				scale = model_scale
-			)
+			FRAME_PROCESSOR = create_session_pool(create_frame_processor, 1)
 	return FRAME_PROCESSOR
 
 
+def create_frame_processor() -> Any:
+	model_path = get_options('model').get('path')
+	model_scale = get_options('model').get('scale')
+	return RealESRGANer(
+		model_path = model_path,
+		model = RRDBNet(
+			num_in_ch = 3,
+			num_out_ch = 3,
+			scale = model_scale
+		),
+		device = map_device(facefusion.globals.execution_providers),
+		scale = model_scale
+	)
+
+
 def clear_frame_processor() -> None:
 	global FRAME_PROCESSOR
 
@@ -87,6 +92,11 @@ def get_options(key : Literal['model']) -> Any:
 def set_options(key : Literal['model'], value : Any) -> None:
 	global OPTIONS
 
+	if OPTIONS is None:
+		OPTIONS =\
+		{
+			'model': value
+		}
 	OPTIONS[key] = value
 
 
@@ -95,8 +105,7 @@ def register_args(program : ArgumentParser) -> None:
 	program.add_argument('--frame-enhancer-blend', help = wording.get('frame_processor_blend_help'), type = int, default = 80, choices = frame_processors_choices.frame_enhancer_blend_range, metavar = create_metavar(frame_processors_choices.frame_enhancer_blend_range))
 
 
-def apply_args(program : ArgumentParser) -> None:
-	args = program.parse_args()
+def apply_args(args : Namespace) -> None:
 	frame_processors_globals.frame_enhancer_model = args.frame_enhancer_model
 	frame_processors_globals.frame_enhancer_blend = args.frame_enhancer_blend
 
@@ -131,10 +140,11 @@ def post_process() -> None:
 	read_static_image.cache_clear()
 
 
+@trace('enhance_frame')
 def enhance_frame(temp_frame : Frame) -> Frame:
-	with THREAD_SEMAPHORE:
-		paste_frame, _ = get_frame_processor().enhance(temp_frame)
-		temp_frame = blend_frame(temp_frame, paste_frame)
+	with get_frame_processor().acquire() as frame_processor:
+		paste_frame, _ = frame_processor.enhance(temp_frame)
+	temp_frame = blend_frame(temp_frame, paste_frame)
 	return temp_frame
 
 
@@ -154,19 +164,7 @@ def process_frame(source_face : Face, reference_faces : FaceSet, temp_frame : Fr
 	return enhance_frame(temp_frame)
 
 
-def process_frames(source_paths : List[str], temp_frame_paths : List[str], update_progress : Update_Process) -> None:
-	for temp_frame_path in temp_frame_paths:
-		temp_frame = read_image(temp_frame_path)
-		result_frame = process_frame(None, None, temp_frame)
-		write_image(temp_frame_path, result_frame)
-		update_progress()
-
-
 def process_image(source_paths : List[str], target_path : str, output_path : str) -> None:
 	target_frame = read_static_image(target_path)
 	result = process_frame(None, None, target_frame)
 	write_image(output_path, result)
-
-
-def process_video(source_paths : List[str], temp_frame_paths : List[str]) -> None:
-	frame_processors.multi_process_frames(None, temp_frame_paths, process_frames)
@@ -0,0 +1,96 @@
+from typing import Any, Dict, List, Optional
+import threading
+import time
+import numpy
+
+import facefusion.globals
+from facefusion.session_pool import SessionPool
+
+
+class BatchRequest:
+	def __init__(self, input_feed : Dict[str, Any]) -> None:
+		self.input_feed = input_feed
+		self.outputs : Optional[List[Any]] = None
+		self.exception : Optional[BaseException] = None
+		self.done = False
+
+
+class SessionBatcher:
+	def __init__(self, session_pool : SessionPool, batch_size : int, batch_timeout : float) -> None:
+		self.session_pool = session_pool
+		self.batch_size = max(1, batch_size)
+		self.batch_timeout = batch_timeout
+		self.batch_input_names = [ node.name for node in session_pool.get_inputs() if is_batch_dimension(node.shape) ]
+		self.condition = threading.Condition()
+		self.batch_requests : List[BatchRequest] = []
+		self.batch_support = bool(self.batch_input_names) and all(is_batch_dimension(node.shape) for node in session_pool.get_outputs())
+		if not self.batch_support:
+			self.batch_size = 1
+
+	def run(self, output_names : Optional[List[str]], input_feed : Dict[str, Any]) -> Any:
+		if self.batch_size == 1:
+			return self.session_pool.run(output_names, input_feed)
+		batch_request = BatchRequest(input_feed)
+		with self.condition:
+			self.batch_requests.append(batch_request)
+			self.condition.notify_all()
+		while not batch_request.done:
+			batch_requests = self.collect_batch(batch_request)
+			if batch_requests:
+				self.run_batch(output_names, batch_requests)
+		if batch_request.exception:
+			raise batch_request.exception
+		return batch_request.outputs
+
+	def collect_batch(self, batch_request : BatchRequest) -> Optional[List[BatchRequest]]:
+		batch_deadline = time.perf_counter() + self.batch_timeout
+		with self.condition:
+			while batch_request in self.batch_requests:
+				batch_remaining = batch_deadline - time.perf_counter()
+				if len(self.batch_requests) >= self.batch_size or batch_remaining <= 0:
+					batch_requests = self.batch_requests[:self.batch_size]
+					del self.batch_requests[:self.batch_size]
+					return batch_requests
+				self.condition.wait(batch_remaining)
+			while not batch_request.done:
+				self.condition.wait()
+		return None
+
+	def run_batch(self, output_names : Optional[List[str]], batch_requests : List[BatchRequest]) -> None:
+		try:
+			input_feed = batch_requests[0].input_feed.copy()
+			for input_name in self.batch_input_names:
+				input_feed[input_name] = numpy.concatenate([ batch_request.input_feed.get(input_name) for batch_request in batch_requests ])
+			outputs = self.session_pool.run(output_names, input_feed)
+			batch_start = 0
+			for batch_request in batch_requests:
+				batch_end = batch_start + len(batch_request.input_feed.get(self.batch_input_names[0]))
+				batch_request.outputs = [ output[batch_start:batch_end] for output in outputs ]
+				batch_start = batch_end
+		except Exception as exception:
+			for batch_request in batch_requests:
+				batch_request.exception = exception
+		with self.condition:
+			for batch_request in batch_requests:
+				batch_request.done = True
+			self.condition.notify_all()
+
+	def get_inputs(self) -> Any:
+		return self.session_pool.get_inputs()
+
+	def get_outputs(self) -> Any:
+		return self.session_pool.get_outputs()
+
+
+def is_batch_dimension(shape : List[Any]) -> bool:
+	return bool(shape) and not (isinstance(shape[0], int) and shape[0] > 0)
+
+
+def create_session_batcher(session_pool : SessionPool) -> SessionBatcher:
+	batch_size = facefusion.globals.execution_batch_size or 1
+	if facefusion.globals.execution_backend == 'process':
+		batch_size = 1
+	if facefusion.globals.execution_thread_count:
+		batch_size = min(batch_size, facefusion.globals.execution_thread_count)
+	batch_timeout = (facefusion.globals.execution_batch_timeout or 0) / 1000
+	return SessionBatcher(session_pool, batch_size, batch_timeout)
@@ -0,0 +1,164 @@
+from typing import Any, Callable, Dict, Iterator, List, Optional
+from contextlib import contextmanager
+from functools import lru_cache
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import onnxruntime
+
+import facefusion.globals
+from facefusion.filesystem import is_file
+from facefusion.typing import ExecutionGraphOptimization, ExecutionMode
+
+GRAPH_OPTIMIZATION_LEVELS : Dict[ExecutionGraphOptimization, onnxruntime.GraphOptimizationLevel] =\
+{
+	'disabled': onnxruntime.GraphOptimizationLevel.ORT_DISABLE_ALL,
+	'basic': onnxruntime.GraphOptimizationLevel.ORT_ENABLE_BASIC,
+	'extended': onnxruntime.GraphOptimizationLevel.ORT_ENABLE_EXTENDED,
+	'all': onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL
+}
+EXECUTION_MODES : Dict[ExecutionMode, onnxruntime.ExecutionMode] =\
+{
+	'sequential': onnxruntime.ExecutionMode.ORT_SEQUENTIAL,
+	'parallel': onnxruntime.ExecutionMode.ORT_PARALLEL
+}
+OPTIMIZED_MODEL_PROVIDERS = [ 'CPUExecutionProvider', 'CUDAExecutionProvider' ]
+
+
+class SessionPool:
+	def __init__(self, create_session : Callable[[], Any], session_count : int, session_concurrency : int) -> None:
+		self.create_session = create_session
+		self.session_count = max(1, session_count)
+		self.session_concurrency = max(1, session_concurrency)
+		self.condition = threading.Condition()
+		self.sessions : List[Any] = [ create_session() ]
+		self.session_loads : List[int] = [ 0 ]
+		self.session_pending = 0
+
+	@contextmanager
+	def acquire(self) -> Iterator[Any]:
+		session_index = self.acquire_index()
+		try:
+			yield self.sessions[session_index]
+		finally:
+			with self.condition:
+				self.session_loads[session_index] -= 1
+				self.condition.notify()
+
+	def acquire_index(self) -> int:
+		with self.condition:
+			while True:
+				session_load = min(self.session_loads)
+				if session_load == 0 or len(self.sessions) + self.session_pending == self.session_count:
+					if session_load < self.session_concurrency:
+						session_index = self.session_loads.index(session_load)
+						self.session_loads[session_index] += 1
+						return session_index
+				else:
+					self.session_pending += 1
+					break
+				self.condition.wait()
+		try:
+			session = self.create_session()
+		except Exception:
+			with self.condition:
+				self.session_pending -= 1
+				self.condition.notify()
+			raise
+		with self.condition:
+			self.session_pending -= 1
+			self.sessions.append(session)
+			self.session_loads.append(1)
+			self.condition.notify_all()
+			return len(self.sessions) - 1
+
+	def run(self, output_names : Optional[List[str]], input_feed : Any) -> Any:
+		with self.acquire() as session:
+			return session.run(output_names, input_feed)
+
+	def get_inputs(self) -> Any:
+		return self.sessions[0].get_inputs()
+
+	def get_outputs(self) -> Any:
+		return self.sessions[0].get_outputs()
+
+
+def create_session_pool(create_session : Callable[[], Any], session_concurrency : Optional[int] = None) -> SessionPool:
+	session_count = facefusion.globals.execution_session_count or 1
+	session_concurrency = session_concurrency or facefusion.globals.execution_session_concurrency or facefusion.globals.execution_thread_count or 1
+	return SessionPool(create_session, session_count, session_concurrency)
+
+
+def create_inference_session(model_path : str) -> onnxruntime.InferenceSession:
+	session_options = create_session_options()
+	optimized_model_path = resolve_optimized_model_path(model_path)
+	if optimized_model_path:
+		if is_file(optimized_model_path):
+			session_options.graph_optimization_level = onnxruntime.GraphOptimizationLevel.ORT_DISABLE_ALL
+			return onnxruntime.InferenceSession(optimized_model_path, sess_options = session_options, providers = facefusion.globals.execution_providers)
+		return create_optimized_inference_session(model_path, optimized_model_path, session_options)
+	return onnxruntime.InferenceSession(model_path, sess_options = session_options, providers = facefusion.globals.execution_providers)
+
+
+def create_optimized_inference_session(model_path : str, optimized_model_path : str, session_options : onnxruntime.SessionOptions) -> onnxruntime.InferenceSession:
+	optimized_directory_path = os.path.dirname(optimized_model_path)
+	os.makedirs(optimized_directory_path, exist_ok = True)
+	temp_file_descriptor, temp_model_path = tempfile.mkstemp(dir = optimized_directory_path, suffix = '.onnx')
+	os.close(temp_file_descriptor)
+	session_options.optimized_model_filepath = temp_model_path
+	try:
+		inference_session = onnxruntime.InferenceSession(model_path, sess_options = session_options, providers = facefusion.globals.execution_providers)
+		os.replace(temp_model_path, optimized_model_path)
+	finally:
+		if is_file(temp_model_path):
+			os.remove(temp_model_path)
+	return inference_session
+
+
+def resolve_optimized_model_path(model_path : str) -> Optional[str]:
+	graph_optimization = facefusion.globals.execution_graph_optimization or 'all'
+	if facefusion.globals.execution_disable_model_cache or graph_optimization == 'disabled' or not is_file(model_path):
+		return None
+	if not facefusion.globals.execution_providers or any(execution_provider not in OPTIMIZED_MODEL_PROVIDERS for execution_provider in facefusion.globals.execution_providers):
+		return None
+	model_stat = os.stat(model_path)
+	model_key =\
+	{
+		'model_name': os.path.basename(model_path),
+		'model_hash': get_model_hash(model_path, model_stat.st_size, model_stat.st_ctime_ns),
+		'execution_providers': facefusion.globals.execution_providers,
+		'graph_optimization': graph_optimization,
+		'onnxruntime_version': onnxruntime.__version__
+	}
+	model_key_hash = hashlib.sha1(json.dumps(model_key, sort_keys = True).encode()).hexdigest()[:12]
+	model_name, _ = os.path.splitext(os.path.basename(model_path))
+	return os.path.join(os.path.dirname(model_path), 'optimized', model_name + '.' + model_key_hash + '.onnx')
+
+
+@lru_cache(maxsize = None)
+def get_model_hash(model_path : str, model_size : int, model_time : int) -> str:
+	model_hash = hashlib.sha1()
+	with open(model_path, 'rb') as model_file:
+		for model_chunk in iter(lambda: model_file.read(1024 * 1024), b''):
+			model_hash.update(model_chunk)
+	return model_hash.hexdigest()
+
+
+def create_session_options() -> onnxruntime.SessionOptions:
+	session_options = onnxruntime.SessionOptions()
+	if facefusion.globals.execution_intra_op_thread_count:
+		session_options.intra_op_num_threads = facefusion.globals.execution_intra_op_thread_count
+	if facefusion.globals.execution_inter_op_thread_count:
+		session_options.inter_op_num_threads = facefusion.globals.execution_inter_op_thread_count
+	if facefusion.globals.execution_mode:
+		session_options.execution_mode = EXECUTION_MODES[facefusion.globals.execution_mode]
+	if facefusion.globals.execution_graph_optimization:
+		session_options.graph_optimization_level = GRAPH_OPTIMIZATION_LEVELS[facefusion.globals.execution_graph_optimization]
+	if facefusion.globals.execution_disable_memory_arena:
+		session_options.enable_cpu_mem_arena = False
+	if facefusion.globals.execution_disable_spinning:
+		session_options.add_session_config_entry('session.intra_op.allow_spinning', '0')
+		session_options.add_session_config_entry('session.inter_op.allow_spinning', '0')
+	return session_options
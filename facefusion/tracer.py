@@ -0,0 +1,101 @@
+from typing import Any, Callable, ContextManager, Dict, List, TypeVar
+from contextlib import nullcontext
+from functools import wraps
+import json
+import os
+import threading
+import time
+
+import facefusion.globals
+from facefusion import logger, wording
+from facefusion.typing import TraceEvent
+
+TRACE_EVENTS : List[TraceEvent] = []
+THREAD_LOCK : threading.Lock = threading.Lock()
+NULL_CONTEXT : ContextManager[None] = nullcontext()
+Function = TypeVar('Function', bound = Callable[..., Any])
+
+
+class TraceSpan:
+	def __init__(self, name : str) -> None:
+		self.name = name
+		self.start_time = 0.0
+
+	def __enter__(self) -> None:
+		self.start_time = time.perf_counter()
+
+	def __exit__(self, *exception : Any) -> None:
+		append_trace_event(self.name, self.start_time, time.perf_counter())
+
+
+def trace(name : str) -> Callable[[Function], Function]:
+	def decorator(function : Function) -> Function:
+		@wraps(function)
+		def wrapper(*args : Any, **kwargs : Any) -> Any:
+			if not facefusion.globals.trace_path:
+				return function(*args, **kwargs)
+			start_time = time.perf_counter()
+			try:
+				return function(*args, **kwargs)
+			finally:
+				append_trace_event(name, start_time, time.perf_counter())
+		return wrapper # type: ignore[return-value]
+	return decorator
+
+
+def trace_span(name : str) -> ContextManager[None]:
+	if facefusion.globals.trace_path:
+		return TraceSpan(name)
+	return NULL_CONTEXT
+
+
+def append_trace_event(name : str, start_time : float, end_time : float) -> None:
+	trace_event : TraceEvent =\
+	{
+		'name': name,
+		'ph': 'X',
+		'ts': start_time * 1000000,
+		'dur': (end_time - start_time) * 1000000,
+		'pid': os.getpid(),
+		'tid': threading.get_native_id()
+	}
+	with THREAD_LOCK:
+		TRACE_EVENTS.append(trace_event)
+
+
+def append_trace_events(trace_events : List[TraceEvent]) -> None:
+	with THREAD_LOCK:
+		TRACE_EVENTS.extend(trace_events)
+
+
+def pop_trace_events() -> List[TraceEvent]:
+	global TRACE_EVENTS
+
+	with THREAD_LOCK:
+		trace_events = TRACE_EVENTS
+		TRACE_EVENTS = []
+	return trace_events
+
+
+def write_trace(trace_path : str) -> bool:
+	trace_events = pop_trace_events()
+	try:
+		with open(trace_path, 'w') as trace_file:
+			json.dump(
+			{
+				'traceEvents': trace_events,
+				'displayTimeUnit': 'ms'
+			}, trace_file)
+	except OSError:
+		return False
+	report_trace_summary(trace_events)
+	return True
+
+
+def report_trace_summary(trace_events : List[TraceEvent]) -> None:
+	trace_summary : Dict[str, List[float]] = {}
+	for trace_event in trace_events:
+		trace_summary.setdefault(trace_event.get('name'), []).append(trace_event.get('dur') / 1000)
+	logger.info(wording.get('trace_summary_row').format(name = 'span'.ljust(24), calls = 'calls'.rjust(8), total = 'total ms'.rjust(12), average = 'avg ms'.rjust(10), maximum = 'max ms'.rjust(10)), __name__.upper())
+	for name, durations in sorted(trace_summary.items(), key = lambda item: sum(item[1]), reverse = True):
+		logger.info(wording.get('trace_summary_row').format(name = name.ljust(24), calls = str(len(durations)).rjust(8), total = str(round(sum(durations), 2)).rjust(12), average = str(round(sum(durations) / len(durations), 2)).rjust(10), maximum = str(round(max(durations), 2)).rjust(10)), __name__.upper())
@@ -1,34 +1,170 @@
-from typing import Any, Literal, Callable, List, Tuple, Dict, TypedDict
-from collections import namedtuple
+from typing import Any, Literal, Callable, List, Optional, Tuple, Dict, OrderedDict, TypedDict
 import numpy
 
 Bbox = numpy.ndarray[Any, Any]
 Kps = numpy.ndarray[Any, Any]
 Score = float
 Embedding = numpy.ndarray[Any, Any]
-Face = namedtuple('Face',
-[
-	'bbox',
-	'kps',
-	'score',
-	'embedding',
-	'normed_embedding',
-	'gender',
-	'age'
-])
+EmbeddingMatrix = numpy.ndarray[Any, Any]
+
+
+class FaceAttributes:
+	def __init__(self, load_attribute : Optional[Callable[[str], None]] = None) -> None:
+		self.values : Dict[str, Any] = {}
+		self.load_attribute = load_attribute
+
+	def get(self, name : str) -> Any:
+		if name not in self.values and self.load_attribute:
+			self.load_attribute(name)
+		return self.values.get(name)
+
+
+class Face:
+	__slots__ = ('bbox', 'kps', 'score', 'attributes')
+
+	def __init__(self, bbox : Bbox, kps : Kps, score : Score, embedding : Optional[Embedding] = None, normed_embedding : Optional[Embedding] = None, gender : Optional[int] = None, age : Optional[int] = None, attributes : Optional[FaceAttributes] = None) -> None:
+		self.bbox = bbox
+		self.kps = kps
+		self.score = score
+		self.attributes = attributes or FaceAttributes()
+		for name, value in [ ('embedding', embedding), ('normed_embedding', normed_embedding), ('gender', gender), ('age', age) ]:
+			if value is not None:
+				self.attributes.values[name] = value
+
+	@property
+	def embedding(self) -> Embedding:
+		return self.attributes.get('embedding')
+
+	@property
+	def normed_embedding(self) -> Embedding:
+		return self.attributes.get('normed_embedding')
+
+	@property
+	def gender(self) -> int:
+		return self.attributes.get('gender')
+
+	@property
+	def age(self) -> int:
+		return self.attributes.get('age')
+
+	def _replace(self, **kwargs : Any) -> 'Face':
+		return Face(kwargs.get('bbox', self.bbox), kwargs.get('kps', self.kps), kwargs.get('score', self.score), attributes = self.attributes)
+
+
 FaceSet = Dict[str, List[Face]]
 FaceStore = TypedDict('FaceStore',
 {
-	'static_faces' : FaceSet,
-	'reference_faces': FaceSet
+	'static_faces' : OrderedDict[str, List[Face]],
+	'reference_faces': FaceSet,
+	'reference_embeddings' : OrderedDict[Tuple[int, ...], Tuple[Tuple[Face, ...], EmbeddingMatrix]]
+})
+FaceCacheFace = Tuple[Bbox, Kps, Score, Dict[str, Any]]
+FaceCacheEntry = TypedDict('FaceCacheEntry',
+{
+	'bboxes' : numpy.ndarray[Any, Any],
+	'kps' : numpy.ndarray[Any, Any],
+	'scores' : numpy.ndarray[Any, Any],
+	'embeddings' : Optional[numpy.ndarray[Any, Any]],
+	'normed_embeddings' : Optional[numpy.ndarray[Any, Any]],
+	'genders' : Optional[numpy.ndarray[Any, Any]],
+	'ages' : Optional[numpy.ndarray[Any, Any]]
+})
+FaceCache = TypedDict('FaceCache',
+{
+	'path' : str,
+	'entries' : Dict[int, FaceCacheEntry],
+	'new_entries' : Dict[int, FaceCacheEntry],
+	'pending_faces' : Dict[int, List[FaceCacheFace]]
+})
+StaticFacesStatistics = TypedDict('StaticFacesStatistics',
+{
+	'hits' : int,
+	'misses' : int
 })
 Frame = numpy.ndarray[Any, Any]
+FrameContext = TypedDict('FrameContext',
+{
+	'frame' : Frame,
+	'frame_number' : Optional[int],
+	'faces' : Optional[List[Face]]
+})
+FaceTracker = TypedDict('FaceTracker',
+{
+	'gray_frame' : Frame,
+	'faces' : List[Face],
+	'frame_count' : int
+})
 Mask = numpy.ndarray[Any, Any]
 Matrix = numpy.ndarray[Any, Any]
+FacePaste = Tuple[Frame, Mask, Matrix]
 Padding = Tuple[int, int, int, int]
 
 Update_Process = Callable[[], None]
-Process_Frames = Callable[[List[str], List[str], Update_Process], None]
+Process_Frames = Callable[[List[str], Update_Process], None]
+TraceEvent = TypedDict('TraceEvent',
+{
+	'name' : str,
+	'ph' : str,
+	'ts' : float,
+	'dur' : float,
+	'pid' : int,
+	'tid' : int
+})
+SharedFrame = Tuple[Optional[str], Tuple[int, ...], List[TraceEvent], StaticFacesStatistics, Dict[int, FaceCacheEntry]]
+ScheduleReport = TypedDict('ScheduleReport',
+{
+	'worker_name' : str,
+	'frame_total' : int,
+	'busy_time' : float,
+	'trace_events' : List[TraceEvent],
+	'static_faces_statistics' : StaticFacesStatistics,
+	'face_cache_entries' : Dict[int, FaceCacheEntry]
+})
+BatchJob = Dict[str, Any]
+Resolution = Tuple[int, int]
+BenchmarkStage = TypedDict('BenchmarkStage',
+{
+	'cold' : float,
+	'warm_mean' : float,
+	'warm_median' : float,
+	'warm_min' : float,
+	'warm_max' : float,
+	'warm_fps' : float
+})
+BenchmarkResult = TypedDict('BenchmarkResult',
+{
+	'resolution' : str,
+	'frame_total' : int,
+	'stages' : Dict[str, BenchmarkStage]
+})
+BenchmarkReport = TypedDict('BenchmarkReport',
+{
+	'name' : str,
+	'version' : str,
+	'host' : Dict[str, Any],
+	'settings' : Dict[str, Any],
+	'results' : List[BenchmarkResult]
+})
+BenchmarkRecord = TypedDict('BenchmarkRecord',
+{
+	'revision' : Optional[str],
+	'host_fingerprint' : str,
+	'settings_fingerprint' : str,
+	'created_at' : int,
+	'report' : BenchmarkReport
+})
+BenchmarkComparison = TypedDict('BenchmarkComparison',
+{
+	'resolution' : str,
+	'stage' : str,
+	'baseline' : float,
+	'current' : float,
+	'change' : float
+})
+ExecutionBackend = Literal['thread', 'process']
+ExecutionPreset = Literal['throughput', 'latency']
+ExecutionMode = Literal['sequential', 'parallel']
+ExecutionGraphOptimization = Literal['disabled', 'basic', 'extended', 'all']
 LogLevel = Literal['error',	'warn',	'info',	'debug']
 Template = Literal['arcface_112_v1', 'arcface_112_v2', 'arcface_128_v2', 'ffhq_512']
 ProcessMode = Literal['output', 'preview', 'stream']
@@ -42,6 +178,13 @@ FaceMaskType = Literal['box', 'occlusion', 'region']
 FaceMaskRegion = Literal['skin', 'left-eyebrow', 'right-eyebrow', 'left-eye', 'right-eye', 'eye-glasses', 'nose', 'mouth', 'upper-lip', 'lower-lip']
 TempFrameFormat = Literal['jpg', 'png']
 OutputVideoEncoder = Literal['libx264', 'libx265', 'libvpx-vp9', 'h264_nvenc', 'hevc_nvenc']
+JobStage = Literal['extract_frames', 'merge_video', 'restore_audio']
+JobManifest = TypedDict('JobManifest',
+{
+	'settings' : Dict[str, Any],
+	'merge_settings' : Dict[str, Any],
+	'stages' : Dict[JobStage, bool]
+})
 
 ModelValue = Dict[str, Any]
 ModelSet = Dict[str, ModelValue]
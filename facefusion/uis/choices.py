@@ -2,6 +2,6 @@ from typing import List
 
 from facefusion.uis.typing import WebcamMode
 
-common_options : List[str] = [ 'keep-fps', 'keep-temp', 'skip-audio', 'skip-download' ]
+common_options : List[str] = [ 'keep-fps', 'keep-temp', 'stream-frames', 'skip-audio', 'skip-download' ]
 webcam_modes : List[WebcamMode] = [ 'inline', 'udp', 'v4l2' ]
 webcam_resolutions : List[str] = [ '320x240', '640x480', '800x600', '1024x768', '1280x720', '1280x960', '1920x1080', '2560x1440', '3840x2160' ]
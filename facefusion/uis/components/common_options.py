@@ -16,6 +16,8 @@ def render() -> None:
 		value.append('keep-fps')
 	if facefusion.globals.keep_temp:
 		value.append('keep-temp')
+	if facefusion.globals.stream_frames:
+		value.append('stream-frames')
 	if facefusion.globals.skip_audio:
 		value.append('skip-audio')
 	if facefusion.globals.skip_download:
@@ -34,5 +36,6 @@ def listen() -> None:
 def update(common_options : List[str]) -> None:
 	facefusion.globals.keep_fps = 'keep-fps' in common_options
 	facefusion.globals.keep_temp = 'keep-temp' in common_options
+	facefusion.globals.stream_frames = 'stream-frames' in common_options
 	facefusion.globals.skip_audio = 'skip-audio' in common_options
 	facefusion.globals.skip_download = 'skip-download' in common_options
@@ -10,7 +10,7 @@ from facefusion.typing import Frame, Face, FaceSet
 from facefusion.vision import get_video_frame, count_video_frame_total, normalize_frame_color, resize_frame_dimension, read_static_image, read_static_images
 from facefusion.face_analyser import get_average_face, clear_face_analyser
 from facefusion.content_analyser import analyse_frame
-from facefusion.processors.frame.core import load_frame_processor_module
+from facefusion.processors.frame.core import load_frame_processor_module, process_fused_frame
 from facefusion.filesystem import is_image, is_video
 from facefusion.uis.typing import ComponentName
 from facefusion.uis.core import get_ui_component, register_ui_component
@@ -162,12 +162,9 @@ def process_preview_frame(source_face : Face, reference_faces : FaceSet, temp_fr
 	temp_frame = resize_frame_dimension(temp_frame, 640, 640)
 	if analyse_frame(temp_frame):
 		return cv2.GaussianBlur(temp_frame, (99, 99), 0)
+	frame_processors_modules = []
 	for frame_processor in facefusion.globals.frame_processors:
 		frame_processor_module = load_frame_processor_module(frame_processor)
 		if frame_processor_module.pre_process('preview'):
-			temp_frame = frame_processor_module.process_frame(
-				source_face,
-				reference_faces,
-				temp_frame
-			)
-	return temp_frame
+			frame_processors_modules.append(frame_processor_module)
+	return process_fused_frame(frame_processors_modules, source_face, reference_faces, temp_frame)
@@ -13,7 +13,7 @@ from facefusion import logger, wording
 from facefusion.content_analyser import analyse_stream
 from facefusion.typing import Frame, Face
 from facefusion.face_analyser import get_average_face
-from facefusion.processors.frame.core import get_frame_processors_modules
+from facefusion.processors.frame.core import get_frame_processors_modules, process_fused_frame
 from facefusion.ffmpeg import open_ffmpeg
 from facefusion.vision import normalize_frame_color, read_static_images
 from facefusion.uis.typing import StreamMode, WebcamMode
@@ -131,14 +131,11 @@ def stop() -> gradio.Image:
 
 
 def process_stream_frame(source_face : Face, temp_frame : Frame) -> Frame:
+	frame_processors_modules = []
 	for frame_processor_module in get_frame_processors_modules(facefusion.globals.frame_processors):
 		if frame_processor_module.pre_process('stream'):
-			temp_frame = frame_processor_module.process_frame(
-				source_face,
-				None,
-				temp_frame
-			)
-	return temp_frame
+			frame_processors_modules.append(frame_processor_module)
+	return process_fused_frame(frame_processors_modules, source_face, None, temp_frame)
 
 
 def open_stream(stream_mode : StreamMode, resolution : str, fps : float) -> subprocess.Popen[bytes]:
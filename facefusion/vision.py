@@ -1,8 +1,9 @@
-from typing import Optional, List
+from typing import Optional, List, Tuple
 from functools import lru_cache
 import cv2
 
 from facefusion.typing import Frame
+from facefusion.tracer import trace
 
 
 def get_video_frame(video_path : str, frame_number : int = 0) -> Optional[Frame]:
@@ -26,6 +27,17 @@ def detect_fps(video_path : str) -> Optional[float]:
 	return None
 
 
+def detect_video_resolution(video_path : str) -> Optional[Tuple[int, int]]:
+	if video_path:
+		video_capture = cv2.VideoCapture(video_path)
+		if video_capture.isOpened():
+			width = int(video_capture.get(cv2.CAP_PROP_FRAME_WIDTH))
+			height = int(video_capture.get(cv2.CAP_PROP_FRAME_HEIGHT))
+			video_capture.release()
+			return width, height
+	return None
+
+
 def count_video_frame_total(video_path : str) -> int:
 	if video_path:
 		video_capture = cv2.VideoCapture(video_path)
@@ -63,12 +75,14 @@ def read_static_images(image_paths : List[str]) -> Optional[List[Frame]]:
 	return frames
 
 
+@trace('read_image')
 def read_image(image_path : str) -> Optional[Frame]:
 	if image_path:
 		return cv2.imread(image_path)
 	return None
 
 
+@trace('write_image')
 def write_image(image_path : str, frame : Frame) -> bool:
 	if image_path:
 		return cv2.imwrite(image_path, frame)
@@ -7,6 +7,7 @@ WORDING =\
 	'source_help': 'select a source image',
 	'target_help': 'select a target image or video',
 	'output_help': 'specify the output file or directory',
+	'batch_help': 'run the jobs of a batch manifest while keeping the models loaded',
 	'frame_processors_help': 'choose from the available frame processors (choices: {choices}, ...)',
 	'frame_processor_model_help': 'choose the model for the frame processor',
 	'frame_processor_blend_help': 'specify the blend amount for the frame processor',
@@ -14,6 +15,9 @@ WORDING =\
 	'ui_layouts_help': 'choose from the available ui layouts (choices: {choices}, ...)',
 	'keep_fps_help': 'preserve the frames per second (fps) of the target',
 	'keep_temp_help': 'retain temporary frames after processing',
+	'segment_duration_help': 'specify the segment duration (in seconds) above which frames are extracted and merged in parallel (0 to disable)',
+	'stream_frames_help': 'process the frames in memory without writing temporary frames',
+	'resume_help': 'resume an interrupted job from the manifest in the temporary directory',
 	'skip_audio_help': 'omit audio from the target',
 	'face_analyser_order_help': 'specify the order used for the face analyser',
 	'face_analyser_age_help': 'specify the age used for the face analyser',
@@ -21,6 +25,17 @@ WORDING =\
 	'face_detector_model_help': 'specify the model used for the face detector',
 	'face_detector_size_help': 'specify the size threshold used for the face detector',
 	'face_detector_score_help': 'specify the score threshold used for the face detector',
+	'benchmark_path_help': 'specify the file for the benchmark results (printed when omitted)',
+	'benchmark_resolutions_help': 'choose from the available benchmark resolutions (choices: {choices})',
+	'benchmark_frame_total_help': 'specify the number of frames of the synthetic benchmark video',
+	'benchmark_cycles_help': 'specify the number of warm cycles after the cold cycle',
+	'benchmark_history_path_help': 'specify the file that keeps the benchmark history',
+	'benchmark_baseline_help': 'specify the revision (or latest) within the benchmark history to compare against',
+	'benchmark_threshold_help': 'specify the slowdown (in percent) above which a stage is flagged',
+	'benchmark_compare_baseline_help': 'specify the revision (or latest) of the baseline record within the benchmark history',
+	'benchmark_compare_current_help': 'specify the revision (or latest) of the record to compare against the baseline',
+	'face_tracker_interval_help': 'specify the number of frames between full face detections while faces are tracked in between extracted frames',
+	'face_store_limit_help': 'specify the number of source, reference and preview frames whose analysed faces are kept in memory',
 	'face_selector_mode_help': 'specify the mode for the face selector',
 	'reference_face_position_help': 'specify the position of the reference face',
 	'reference_face_distance_help': 'specify the distance between the reference face and the target face',
@@ -38,13 +53,30 @@ WORDING =\
 	'output_video_quality_help': 'specify the quality used for the output video',
 	'max_memory_help': 'specify the maximum amount of ram to be used (in gb)',
 	'execution_providers_help': 'choose from the available execution providers (choices: {choices}, ...)',
+	'execution_backend_help': 'choose whether frames are processed by threads or forked processes',
 	'execution_thread_count_help': 'specify the number of execution threads',
 	'execution_queue_count_help': 'specify the number of execution queries',
+	'execution_preset_help': 'choose the session topology preset, throughput for many single threaded sessions or latency for one multi threaded session',
+	'execution_session_count_help': 'specify the number of inference sessions per model',
+	'execution_session_concurrency_help': 'specify the number of concurrent runs per inference session (defaults to the execution thread count)',
+	'execution_batch_size_help': 'specify the maximum number of face crops batched into one inference run (capped by the execution thread count)',
+	'execution_batch_timeout_help': 'specify the milliseconds to wait for a batch to fill before running it',
+	'execution_intra_op_thread_count_help': 'specify the number of threads within an operator of an inference session (0 for the runtime default)',
+	'execution_inter_op_thread_count_help': 'specify the number of threads across operators of an inference session (0 for the runtime default)',
+	'execution_mode_help': 'choose whether the operators of an inference session run sequential or parallel',
+	'execution_graph_optimization_help': 'choose the graph optimization level of the inference sessions',
+	'execution_disable_memory_arena_help': 'disable the memory arena of the inference sessions',
+	'execution_disable_spinning_help': 'disable the thread spinning of the inference sessions',
+	'execution_disable_model_cache_help': 'disable the cache of optimized models next to the downloaded models',
 	'skip_download_help': 'omit automate downloads and lookups',
+	'skip_face_cache_help': 'omit the on-disk cache of analysed faces per target video',
 	'headless_help': 'run the program in headless mode',
 	'log_level_help': 'choose from the available log levels',
+	'trace_path_help': 'write per stage timings to a chrome trace file',
 	'creating_temp': 'Creating temporary resources',
+	'resuming_job': 'Resuming job from the manifest',
 	'extracting_frames_fps': 'Extracting frames with {fps} FPS',
+	'streaming_frames_fps': 'Streaming frames with {fps} FPS',
 	'analysing': 'Analysing',
 	'processing': 'Processing',
 	'downloading': 'Downloading',
@@ -53,6 +85,8 @@ WORDING =\
 	'compressing_image_failed': 'Compressing image failed',
 	'merging_video_fps': 'Merging video with {fps} FPS',
 	'merging_video_failed': 'Merging video failed',
+	'streaming_frames_failed': 'Streaming frames failed',
+	'streaming_frames_face_tracker_not_supported': 'Streaming frames does not support a face tracker interval above 1',
 	'skipping_audio': 'Skipping audio',
 	'restoring_audio': 'Restoring audio',
 	'restoring_audio_skipped': 'Restoring audio skipped',
@@ -61,6 +95,7 @@ WORDING =\
 	'processing_image_failed': 'Processing to image failed',
 	'processing_video_succeed': 'Processing to video succeed',
 	'processing_video_failed': 'Processing to video failed',
+	'writing_trace_failed': 'Writing trace failed',
 	'model_download_not_done': 'Download of the model is not done',
 	'model_file_not_present': 'File of the model is not present',
 	'select_image_source': 'Select an image for source path',
@@ -69,6 +104,28 @@ WORDING =\
 	'no_source_face_detected': 'No source face detected',
 	'frame_processor_not_loaded': 'Frame processor {frame_processor} could not be loaded',
 	'frame_processor_not_implemented': 'Frame processor {frame_processor} not implemented correctly',
+	'execution_backend_not_supported': 'Execution backend {execution_backend} is not supported on this platform, falling back to threads',
+	'trace_summary_row': '{name} {calls} {total} {average} {maximum}',
+	'worker_utilisation': 'Worker {worker_name} processed {frame_total} frames at {worker_utilisation}% utilisation',
+	'saving_face_cache_skipped': 'Saving face cache skipped',
+	'static_faces_statistics': 'Static faces cache had {hits} hits and {misses} misses',
+	'creating_benchmark_inputs': 'Creating synthetic benchmark inputs and stand-in models',
+	'benchmarking_resolution': 'Benchmarking {resolution}',
+	'benchmark_stage': '{resolution} {stage}: cold {cold}s, warm {warm}s ({fps} fps)',
+	'benchmark_model_not_supported': 'Benchmark has no stand-in model for {model}',
+	'benchmark_frame_processor_skipped': 'Benchmark has no stand-in model for frame processor {frame_processor}, skipping',
+	'writing_benchmark_failed': 'Writing benchmark results failed',
+	'writing_benchmark_history_failed': 'Writing benchmark history failed',
+	'benchmark_baseline_not_found': 'No benchmark baseline {baseline} found for this host and settings',
+	'benchmark_record_not_found': 'No benchmark record {revision} found in the benchmark history',
+	'benchmark_records_not_comparable': 'Benchmark records differ in host or settings',
+	'comparing_benchmark_baseline': 'Comparing against benchmark baseline {revision}',
+	'benchmark_stage_compare': '{resolution} {stage}: {baseline}s -> {current}s ({change}%)',
+	'benchmark_stage_regression': '{resolution} {stage}: {baseline}s -> {current}s ({change}%) exceeds the {threshold}% threshold',
+	'batch_not_loaded': 'Batch manifest could not be loaded',
+	'batch_paths_not_supported': 'Batch takes the source, target and output paths from its jobs only',
+	'processing_batch_job': 'Processing batch job {batch_job_number} of {batch_job_total}',
+	'batch_job_skipped': 'Skipping batch job {batch_job_number} without a valid output path',
 	'ui_layout_not_loaded': 'UI layout {ui_layout} could not be loaded',
 	'ui_layout_not_implemented': 'UI layout {ui_layout} not implemented correctly',
 	'stream_not_loaded': 'Stream {stream_mode} could not be loaded',
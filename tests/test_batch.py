@@ -0,0 +1,61 @@
+from argparse import ArgumentParser
+from unittest import mock
+import json
+import os
+import tempfile
+
+import facefusion.globals
+import facefusion.processors.frame.core as frame_processors
+from facefusion.core import process_batch
+from facefusion.batch import read_batch_jobs, is_batch_job, create_batch_job_args
+from facefusion.processors.frame import globals as frame_processors_globals
+
+
+def test_read_batch_jobs() -> None:
+	batch_path = os.path.join(tempfile.gettempdir(), 'test-batch.json')
+	with open(batch_path, 'w') as batch_file:
+		json.dump([ { 'source_paths': [ 'source.jpg' ], 'target_path': 'target.mp4' } ], batch_file)
+	assert read_batch_jobs(batch_path) == [ { 'source_paths': [ 'source.jpg' ], 'target_path': 'target.mp4' } ]
+	with open(batch_path, 'w') as batch_file:
+		json.dump([ { 'source_paths': [ 'source.jpg' ] } ], batch_file)
+	assert read_batch_jobs(batch_path) is None
+	with open(batch_path, 'w') as batch_file:
+		batch_file.write('invalid')
+	assert read_batch_jobs(batch_path) is None
+	assert read_batch_jobs('invalid') is None
+	os.remove(batch_path)
+
+
+def test_is_batch_job() -> None:
+	assert is_batch_job({ 'target_path': 'target.mp4' }) is True
+	assert is_batch_job({ 'target_path': 'target.mp4', 'args': [ '--face-swapper-model', 'simswap_256' ] }) is True
+	assert is_batch_job({ 'target_path': 'target.mp4', 'source_paths': 'source.jpg' }) is False
+	assert is_batch_job({ 'target_path': 'target.mp4', 'args': '--keep-fps' }) is False
+	assert is_batch_job([ 'target.mp4' ]) is False
+
+
+def test_create_batch_job_args() -> None:
+	assert create_batch_job_args({ 'source_paths': [ 'source.jpg' ], 'target_path': 'target.mp4', 'output_path': 'output.mp4' }) == [ '-s', 'source.jpg', '-t', 'target.mp4', '-o', 'output.mp4' ]
+	assert create_batch_job_args({ 'target_path': 'target.mp4', 'args': [ '--keep-fps' ] }) == [ '-t', 'target.mp4', '--keep-fps' ]
+
+
+def test_register_and_apply_frame_processors_args() -> None:
+	frame_processors.REGISTERED_FRAME_PROCESSORS.clear()
+	program = ArgumentParser()
+	program.add_argument('--frame-processors', default = [ 'face_swapper' ], nargs = '+')
+	batch_job_args = [ '--frame-processors', 'face_enhancer', '--face-enhancer-model', 'codeformer', '--face-enhancer-blend', '50' ]
+	batch_job_namespace, _ = program.parse_known_args(batch_job_args)
+	frame_processors.register_frame_processors_args(program, batch_job_namespace.frame_processors)
+	frame_processors.apply_frame_processors_args(program.parse_args(batch_job_args))
+
+	assert frame_processors.REGISTERED_FRAME_PROCESSORS == [ 'face_enhancer' ]
+	assert frame_processors_globals.face_enhancer_model == 'codeformer'
+	assert frame_processors_globals.face_enhancer_blend == 50
+	frame_processors.REGISTERED_FRAME_PROCESSORS.clear()
+
+
+def test_process_batch_rejects_paths() -> None:
+	for source_paths, target_path, output_path in [ ([ 'source.jpg' ], None, None), (None, 'target.mp4', None), (None, None, 'output.mp4') ]:
+		with mock.patch.multiple(facefusion.globals, source_paths = source_paths, target_path = target_path, output_path = output_path, batch_path = 'batch.json'), mock.patch('facefusion.core.read_batch_jobs') as read_batch_jobs_mock:
+			process_batch(ArgumentParser())
+		assert read_batch_jobs_mock.call_count == 0
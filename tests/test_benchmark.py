@@ -0,0 +1,140 @@
+from typing import Any
+from unittest import mock
+import os
+import shutil
+import tempfile
+import numpy
+import onnxruntime
+
+import facefusion.globals
+import facefusion.processors.frame.core as frame_processors
+from facefusion import face_analyser, face_masker
+from facefusion.benchmark.core import benchmark, clear_benchmark_sessions, create_benchmark_stage, compare_benchmark
+from facefusion.benchmark.stand_in import create_face_detector_model, create_face_swapper_model
+from facefusion.benchmark.history import read_benchmark_records, append_benchmark_record, find_baseline_record, find_benchmark_record, compare_benchmark_records
+from facefusion.processors.frame import globals as frame_processors_globals
+from facefusion.processors.frame.modules import face_swapper, face_enhancer
+
+
+def test_create_face_detector_model() -> None:
+	model_path = os.path.join(tempfile.gettempdir(), 'test-face-detector.onnx')
+	create_face_detector_model(model_path, '320x320')
+	face_detector = onnxruntime.InferenceSession(model_path, providers = [ 'CPUExecutionProvider' ])
+	detections = face_detector.run(None,
+	{
+		'input': numpy.zeros((1, 3, 320, 320), dtype = numpy.float32)
+	})
+	assert len(detections) == 9
+	assert detections[0].shape == (3200, 1)
+	assert numpy.count_nonzero(detections[2] >= 0.5) == 1
+	os.remove(model_path)
+
+
+def test_create_face_swapper_model() -> None:
+	model_path = os.path.join(tempfile.gettempdir(), 'test-face-swapper.onnx')
+	create_face_swapper_model(model_path, 'inswapper', (128, 128))
+	face_swapper = onnxruntime.InferenceSession(model_path, providers = [ 'CPUExecutionProvider' ])
+	crop_frame = face_swapper.run(None,
+	{
+		'target': numpy.zeros((1, 3, 128, 128), dtype = numpy.float32),
+		'source': numpy.ones((1, 512), dtype = numpy.float32)
+	})[0]
+	assert crop_frame.shape == (1, 3, 128, 128)
+	assert numpy.all(crop_frame == 0.5)
+	os.remove(model_path)
+
+
+def test_benchmark() -> None:
+	benchmark_directory_path = tempfile.mkdtemp()
+	with mock.patch.multiple(facefusion.globals, skip_download = True, skip_face_cache = True, log_level = 'error', execution_providers = [ 'CPUExecutionProvider' ], execution_backend = 'thread', execution_thread_count = 2, execution_queue_count = 1, execution_batch_size = 1, execution_batch_timeout = 5, face_analyser_order = 'left-right', face_detector_model = 'retinaface', face_detector_size = '320x320', face_detector_score = 0.5, face_recognizer_model = 'arcface_inswapper', face_tracker_interval = 1, face_store_limit = 256, face_selector_mode = 'many', face_mask_types = [ 'box' ], face_mask_blur = 0.3, face_mask_padding = (0, 0, 0, 0), temp_frame_format = 'jpg', temp_frame_quality = 100, output_video_encoder = 'libx264', output_video_quality = 80, benchmark_resolutions = [ '240p' ], benchmark_frame_total = 3, benchmark_cycles = 1, frame_processors = [ 'face_swapper', 'face_enhancer' ]), \
+		mock.patch.multiple(frame_processors_globals, face_swapper_model = 'inswapper_128', face_enhancer_model = 'gfpgan_1.4', face_enhancer_blend = 80), \
+		mock.patch.dict(face_analyser.MODELS), mock.patch.dict(face_masker.MODELS), mock.patch.object(face_swapper, 'OPTIONS', None), mock.patch.object(face_enhancer, 'OPTIONS', None), mock.patch.object(frame_processors, 'FRAME_PROCESSORS_MODULES', []):
+		benchmark_report = benchmark(benchmark_directory_path)
+		clear_benchmark_sessions(frame_processors.FRAME_PROCESSORS_MODULES)
+	shutil.rmtree(benchmark_directory_path)
+
+	assert benchmark_report.get('settings').get('frame_processors') == [ 'face_swapper', 'face_enhancer' ]
+	assert list(benchmark_report.get('results')[0].get('stages').keys()) == [ 'extract_frames', 'face_analyser', 'face_swapper+face_enhancer', 'merge_video' ]
+
+
+def test_create_benchmark_stage() -> None:
+	facefusion.globals.benchmark_frame_total = 10
+	benchmark_stage = create_benchmark_stage([ 4.0, 1.0, 3.0, 2.0 ])
+	assert benchmark_stage.get('cold') == 4.0
+	assert benchmark_stage.get('warm_mean') == 2.0
+	assert benchmark_stage.get('warm_median') == 2.0
+	assert benchmark_stage.get('warm_min') == 1.0
+	assert benchmark_stage.get('warm_max') == 3.0
+	assert benchmark_stage.get('warm_fps') == 5.0
+
+
+def create_benchmark_record(revision : str, warm_median : float) -> Any:
+	return\
+	{
+		'revision': revision,
+		'host_fingerprint': 'host',
+		'settings_fingerprint': 'settings',
+		'created_at': 0,
+		'report':
+		{
+			'results':
+			[
+				{
+					'resolution': '240p',
+					'stages':
+					{
+						'paste_back': { 'warm_median': warm_median }
+					}
+				}
+			]
+		}
+	}
+
+
+def test_read_benchmark_records() -> None:
+	history_path = os.path.join(tempfile.gettempdir(), 'test-benchmark-history.jsonl')
+	if os.path.exists(history_path):
+		os.remove(history_path)
+	assert read_benchmark_records(history_path) == []
+	assert append_benchmark_record(history_path, create_benchmark_record('abc1234', 1.0)) is True
+	assert append_benchmark_record(history_path, create_benchmark_record('def5678', 2.0)) is True
+	assert [ benchmark_record.get('revision') for benchmark_record in read_benchmark_records(history_path) ] == [ 'abc1234', 'def5678' ]
+	os.remove(history_path)
+
+
+def test_find_baseline_record() -> None:
+	benchmark_records = [ create_benchmark_record('abc1234', 1.0), create_benchmark_record('def5678', 2.0) ]
+	benchmark_record = create_benchmark_record('0123456', 3.0)
+	assert find_baseline_record(benchmark_records, benchmark_record, 'latest').get('revision') == 'def5678'
+	assert find_baseline_record(benchmark_records, benchmark_record, 'abc').get('revision') == 'abc1234'
+	assert find_baseline_record(benchmark_records, benchmark_record, 'invalid') is None
+	benchmark_record['host_fingerprint'] = 'other'
+	assert find_baseline_record(benchmark_records, benchmark_record, 'latest') is None
+
+
+def test_find_benchmark_record() -> None:
+	benchmark_records = [ create_benchmark_record('abc1234', 1.0), create_benchmark_record('def5678', 2.0) ]
+	benchmark_records[1]['host_fingerprint'] = 'other'
+	assert find_benchmark_record(benchmark_records, 'latest').get('revision') == 'def5678'
+	assert find_benchmark_record(benchmark_records, 'abc').get('revision') == 'abc1234'
+	assert find_benchmark_record(benchmark_records, 'invalid') is None
+	assert find_benchmark_record([], 'latest') is None
+
+
+def test_compare_benchmark() -> None:
+	facefusion.globals.benchmark_history_path = os.path.join(tempfile.gettempdir(), 'test-benchmark-compare.jsonl')
+	facefusion.globals.benchmark_threshold = 10
+	if os.path.exists(facefusion.globals.benchmark_history_path):
+		os.remove(facefusion.globals.benchmark_history_path)
+	append_benchmark_record(facefusion.globals.benchmark_history_path, create_benchmark_record('abc1234', 2.0))
+	append_benchmark_record(facefusion.globals.benchmark_history_path, create_benchmark_record('def5678', 2.1))
+	append_benchmark_record(facefusion.globals.benchmark_history_path, create_benchmark_record('0123456', 2.5))
+	assert compare_benchmark('abc', 'def') is True
+	assert compare_benchmark('abc', 'latest') is False
+	assert compare_benchmark('abc', 'invalid') is False
+	os.remove(facefusion.globals.benchmark_history_path)
+
+
+def test_compare_benchmark_records() -> None:
+	benchmark_comparisons = compare_benchmark_records(create_benchmark_record('abc1234', 2.0), create_benchmark_record('def5678', 2.5))
+	assert benchmark_comparisons == [ { 'resolution': '240p', 'stage': 'paste_back', 'baseline': 2.0, 'current': 2.5, 'change': 25.0 } ]
@@ -1,4 +1,5 @@
-from facefusion.execution_helper import encode_execution_providers, decode_execution_providers
+import facefusion.globals
+from facefusion.execution_helper import encode_execution_providers, decode_execution_providers, apply_execution_preset
 
 
 def test_encode_execution_providers() -> None:
@@ -7,3 +8,15 @@ def test_encode_execution_providers() -> None:
 
 def test_decode_execution_providers() -> None:
 	assert decode_execution_providers([ 'cpu' ]) == [ 'CPUExecutionProvider' ]
+
+
+def test_apply_execution_preset() -> None:
+	facefusion.globals.execution_thread_count = 4
+	facefusion.globals.execution_session_count = None
+	facefusion.globals.execution_intra_op_thread_count = 2
+	facefusion.globals.execution_mode = None
+	apply_execution_preset('throughput')
+
+	assert facefusion.globals.execution_session_count == 4
+	assert facefusion.globals.execution_intra_op_thread_count == 2
+	assert facefusion.globals.execution_mode == 'sequential'
@@ -0,0 +1,111 @@
+from typing import List, Tuple
+from unittest import mock
+import gc
+import weakref
+import numpy
+
+from facefusion.face_analyser import create_face_attributes, find_similar_faces
+from facefusion.face_helper import warp_face
+from facefusion.face_store import create_frame_context, clear_frame_context
+from facefusion.typing import Face, FaceAttributes, FaceSet, Frame, Kps, Embedding
+
+
+def create_face(normed_embedding : Embedding) -> Face:
+	return Face(bbox = numpy.zeros(4), kps = numpy.zeros((5, 2)), score = 1.0, normed_embedding = normed_embedding / numpy.linalg.norm(normed_embedding))
+
+
+def find_similar_faces_nested(many_faces : List[Face], reference_faces : FaceSet, face_distance : float) -> List[Face]:
+	similar_faces : List[Face] = []
+	for reference_set in reference_faces:
+		if not similar_faces:
+			for reference_face in reference_faces[reference_set]:
+				for face in many_faces:
+					if 1 - numpy.dot(face.normed_embedding, reference_face.normed_embedding) < face_distance:
+						similar_faces.append(face)
+	return similar_faces
+
+
+def test_find_similar_faces() -> None:
+	random_state = numpy.random.RandomState(0)
+	identities = random_state.randn(3, 512)
+	many_faces = [ create_face(identities[index % 3] + random_state.randn(512) * 0.5) for index in range(8) ]
+	reference_faces =\
+	{
+		'origin': [ create_face(identities[1]), create_face(identities[0]) ],
+		'other': [ create_face(identities[2]) ]
+	}
+	frame = numpy.zeros((10, 10, 3), dtype = numpy.uint8)
+
+	with mock.patch('facefusion.face_analyser.get_many_faces', return_value = many_faces):
+		for face_distance in [ 0.2, 0.6, 1.0, 1.5 ]:
+			similar_faces = find_similar_faces(frame, reference_faces, face_distance)
+			assert similar_faces == find_similar_faces_nested(many_faces, reference_faces, face_distance)
+		assert find_similar_faces(frame, reference_faces, 0.6)
+		assert find_similar_faces(frame, { 'unknown': [ create_face(random_state.randn(512)) ] }, 0.6) == []
+		assert find_similar_faces(frame, {}, 0.6) == []
+
+
+def create_kps_list() -> List[Kps]:
+	kps = numpy.array([ [ 130, 110 ], [ 170, 110 ], [ 150, 130 ], [ 135, 150 ], [ 165, 150 ] ], dtype = numpy.float32)
+	return [ kps, kps * 0.8 + 20, kps * 1.2 - 30 ]
+
+
+def calc_embeddings(crop_frame_list : List[Frame]) -> List[Tuple[Embedding, Embedding]]:
+	return [ (crop_frame.astype(numpy.float32).ravel(), crop_frame.astype(numpy.float32).ravel()) for crop_frame in crop_frame_list ]
+
+
+def detect_genders_ages(crop_frame_list : List[Frame]) -> List[Tuple[int, int]]:
+	return [ (index % 2, int(crop_frame.mean())) for index, crop_frame in enumerate(crop_frame_list) ]
+
+
+def test_create_face_attributes_lazy() -> None:
+	frame = numpy.random.RandomState(0).randint(0, 255, (240, 320, 3), dtype = numpy.uint8)
+	kps_list = create_kps_list()
+	create_frame_context(frame, 1)
+	with mock.patch('facefusion.face_analyser.warp_face', side_effect = warp_face) as warp_face_mock, mock.patch('facefusion.face_analyser.calc_embeddings', side_effect = calc_embeddings) as calc_embeddings_mock, mock.patch('facefusion.face_analyser.detect_genders_ages', side_effect = detect_genders_ages) as detect_genders_ages_mock:
+		face_attributes_list = create_face_attributes(frame, kps_list)
+
+		assert warp_face_mock.call_count == 0
+		assert face_attributes_list[1].get('normed_embedding') is not None
+		assert warp_face_mock.call_count == 3
+		assert calc_embeddings_mock.call_count == 1
+		assert all('embedding' in face_attributes.values for face_attributes in face_attributes_list)
+		assert face_attributes_list[2].get('age') is not None
+		assert warp_face_mock.call_count == 6
+		assert detect_genders_ages_mock.call_count == 1
+		assert [ face_attributes.get('gender') for face_attributes in face_attributes_list ] == [ 0, 1, 0 ]
+		assert calc_embeddings_mock.call_count == 1
+	clear_frame_context()
+
+	for face_attributes, kps in zip(face_attributes_list, kps_list):
+		assert numpy.array_equal(face_attributes.get('embedding'), warp_face(frame, kps, 'arcface_112_v2', (112, 112))[0].astype(numpy.float32).ravel())
+		assert face_attributes.get('age') == int(warp_face(frame, kps, 'arcface_112_v2', (96, 96))[0].mean())
+
+
+def test_create_face_attributes_outside_pipeline() -> None:
+	frame = numpy.random.RandomState(0).randint(0, 255, (240, 320, 3), dtype = numpy.uint8)
+	kps_list = create_kps_list()
+	with mock.patch('facefusion.face_analyser.warp_face', side_effect = warp_face) as warp_face_mock, mock.patch('facefusion.face_analyser.calc_embeddings', side_effect = calc_embeddings) as calc_embeddings_mock:
+		face_attributes_list = create_face_attributes(frame, kps_list)
+		frame[:] = 0
+
+		assert warp_face_mock.call_count == 6
+		assert [ face_attributes.get('embedding').any() for face_attributes in face_attributes_list ] == [ True, True, True ]
+		assert warp_face_mock.call_count == 6
+		assert calc_embeddings_mock.call_count == 1
+
+
+def test_create_face_attributes_release_frame() -> None:
+	frame = numpy.zeros((240, 320, 3), dtype = numpy.uint8)
+	frame_reference = weakref.ref(frame)
+	create_frame_context(frame, 1)
+	face_attributes_list : List[FaceAttributes] = create_face_attributes(frame, create_kps_list())
+	clear_frame_context()
+	gc.disable()
+	try:
+		del frame
+		assert frame_reference() is not None
+		del face_attributes_list
+		assert frame_reference() is None
+	finally:
+		gc.enable()
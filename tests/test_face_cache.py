@@ -0,0 +1,125 @@
+from typing import Iterator, cast
+from types import ModuleType, SimpleNamespace
+from unittest import mock
+import os
+import tempfile
+import numpy
+import pytest
+
+import facefusion.globals
+import facefusion.face_cache
+import facefusion.processors.frame.core as frame_processors
+from facefusion.face_analyser import get_many_faces
+from facefusion.face_cache import create_face_cache_entry, create_target_hash, read_face_cache_entries, write_face_cache_entries, set_cached_faces
+from facefusion.face_store import create_frame_context, clear_frame_context
+from facefusion.typing import Face, FaceSet, Frame
+
+
+@pytest.fixture(scope = 'function', autouse = True)
+def before_each() -> Iterator[None]:
+	with mock.patch.multiple(facefusion.globals, face_selector_mode = 'many', execution_providers = [ 'CPUExecutionProvider' ], execution_backend = 'thread', execution_thread_count = 2, execution_queue_count = 1, log_level = 'error'):
+		yield
+	facefusion.face_cache.FACE_CACHE = None
+
+
+def test_write_and_read_face_cache_entries() -> None:
+	bbox = numpy.array([ 10, 20, 110, 140 ], dtype = numpy.float32)
+	kps = numpy.arange(10, dtype = numpy.float32).reshape(5, 2)
+	embedding = numpy.arange(512, dtype = numpy.float32)
+	face_cache_entries =\
+	{
+		1: create_face_cache_entry([ (bbox, kps, 0.9, { 'embedding': embedding, 'normed_embedding': embedding / numpy.linalg.norm(embedding), 'gender': 1, 'age': 30 }) ]),
+		2: create_face_cache_entry([ (bbox, kps, 0.8, {}), (bbox + 1, kps + 1, 0.7, {}) ]),
+		3: create_face_cache_entry([])
+	}
+	face_cache_path = os.path.join(tempfile.mkdtemp(), 'faces.npz')
+	write_face_cache_entries(face_cache_path, face_cache_entries)
+	read_entries = read_face_cache_entries(face_cache_path)
+
+	assert read_entries.keys() == face_cache_entries.keys()
+	assert numpy.array_equal(read_entries.get(1).get('embeddings')[0], embedding)
+	assert read_entries.get(1).get('genders').tolist() == [ 1 ]
+	assert read_entries.get(1).get('ages').tolist() == [ 30 ]
+	assert numpy.array_equal(read_entries.get(2).get('bboxes')[1], bbox + 1)
+	assert read_entries.get(2).get('embeddings') is None
+	assert read_entries.get(2).get('genders') is None
+	assert len(read_entries.get(3).get('scores')) == 0
+
+
+def test_set_cached_faces_for_target_frames() -> None:
+	facefusion.face_cache.FACE_CACHE =\
+	{
+		'path': '',
+		'entries': {},
+		'new_entries': {},
+		'pending_faces': {}
+	}
+	target_frame = numpy.full((10, 10, 3), 1, dtype = numpy.uint8)
+	source_frame = numpy.full((10, 10, 3), 2, dtype = numpy.uint8)
+	preview_frame = numpy.full((10, 10, 3), 3, dtype = numpy.uint8)
+	create_frame_context(target_frame, 5)
+	set_cached_faces(source_frame, [])
+	set_cached_faces(target_frame, [])
+	create_frame_context(preview_frame)
+	set_cached_faces(preview_frame, [])
+	clear_frame_context()
+
+	assert list(facefusion.face_cache.FACE_CACHE.get('pending_faces').keys()) == [ 5 ]
+
+
+def test_stream_returns_face_cache_entries() -> None:
+	facefusion.globals.execution_backend = 'process'
+	facefusion.face_cache.FACE_CACHE =\
+	{
+		'path': '',
+		'entries': {},
+		'new_entries': {},
+		'pending_faces': {}
+	}
+
+	def process_frame(source_face : Face, reference_faces : FaceSet, temp_frame : Frame) -> Frame:
+		set_cached_faces(temp_frame, [ Face(bbox = numpy.zeros(4), kps = numpy.zeros((5, 2)), score = 1.0) ])
+		return temp_frame
+
+	temp_frames = [ numpy.full((10, 10, 3), index + 1, dtype = numpy.uint8) for index in range(4) ]
+	with mock.patch.object(frame_processors, 'FRAME_PROCESSORS_MODULES', [ cast(ModuleType, SimpleNamespace(process_frame = process_frame, clear_frame_processor = lambda: None)) ]):
+		result_frames = list(frame_processors.multi_process_stream([], iter(temp_frames), 4))
+
+	assert len(result_frames) == 4
+	assert sorted(facefusion.face_cache.FACE_CACHE.get('new_entries').keys()) == [ 1, 2, 3, 4 ]
+
+
+def test_create_target_hash() -> None:
+	target_path = os.path.join(tempfile.mkdtemp(), 'target.mp4')
+	target_content = bytearray(numpy.random.RandomState(0).bytes(3 * 1024 * 1024))
+	with open(target_path, 'wb') as target_file:
+		target_file.write(target_content)
+	target_hash = create_target_hash(target_path, len(target_content), 0)
+	target_content[len(target_content) // 2] ^= 1
+	with open(target_path, 'wb') as target_file:
+		target_file.write(target_content)
+
+	assert create_target_hash(target_path, len(target_content), 0) == target_hash
+	assert create_target_hash(target_path, len(target_content), 1) != target_hash
+
+
+def test_get_many_faces_caches_extracted_faces() -> None:
+	facefusion.face_cache.FACE_CACHE =\
+	{
+		'path': '',
+		'entries': {},
+		'new_entries': {},
+		'pending_faces': {}
+	}
+	faces = [ Face(bbox = numpy.zeros(4), kps = numpy.zeros((5, 2)), score = 1.0) ]
+	frames = [ numpy.full((10, 10, 3), index + 1, dtype = numpy.uint8) for index in range(2) ]
+	with mock.patch.multiple(facefusion.globals, face_analyser_order = None, face_analyser_age = None, face_analyser_gender = None), mock.patch('facefusion.face_analyser.is_face_tracker_keyframe', return_value = False):
+		with mock.patch('facefusion.face_analyser.track_faces', return_value = faces):
+			create_frame_context(frames[0], 1)
+			assert get_many_faces(frames[0]) == faces
+		with mock.patch('facefusion.face_analyser.track_faces', return_value = None), mock.patch('facefusion.face_analyser.extract_faces', return_value = faces):
+			create_frame_context(frames[1], 2)
+			assert get_many_faces(frames[1]) == faces
+		clear_frame_context()
+
+	assert list(facefusion.face_cache.FACE_CACHE.get('pending_faces').keys()) == [ 2 ]
@@ -0,0 +1,52 @@
+from typing import List
+import cv2
+import numpy
+
+from facefusion.face_helper import warp_face, paste_back, paste_back_many
+from facefusion.face_masker import create_static_box_mask
+from facefusion.typing import Frame, Kps, FacePaste
+
+
+def paste_back_full(temp_frame : Frame, face_pastes : List[FacePaste]) -> Frame:
+	paste_frame = temp_frame.copy()
+	temp_frame_size = temp_frame.shape[:2][::-1]
+	for crop_frame, crop_mask, affine_matrix in face_pastes:
+		inverse_matrix = cv2.invertAffineTransform(affine_matrix)
+		inverse_crop_mask = cv2.warpAffine(crop_mask, inverse_matrix, temp_frame_size).clip(0, 1)[:, :, numpy.newaxis]
+		inverse_crop_frame = cv2.warpAffine(crop_frame, inverse_matrix, temp_frame_size, borderMode = cv2.BORDER_REPLICATE)
+		paste_frame[:] = inverse_crop_mask * inverse_crop_frame + (1 - inverse_crop_mask) * paste_frame
+	return paste_frame
+
+
+def create_temp_frame() -> Frame:
+	temp_frame = numpy.random.RandomState(0).randint(0, 255, (240, 320, 3), dtype = numpy.uint8)
+	return cv2.GaussianBlur(temp_frame, (0, 0), 5)
+
+
+def create_face_paste(temp_frame : Frame, kps : Kps) -> FacePaste:
+	crop_frame, affine_matrix = warp_face(temp_frame, kps, 'arcface_128_v2', (128, 128))
+	crop_mask = create_static_box_mask(crop_frame.shape[:2][::-1], 0.3, (0, 0, 0, 0))
+	return 255 - crop_frame, crop_mask, affine_matrix
+
+
+def test_paste_back() -> None:
+	temp_frame = create_temp_frame()
+	kps = numpy.array([ [ 130, 110 ], [ 170, 110 ], [ 150, 130 ], [ 135, 150 ], [ 165, 150 ] ], dtype = numpy.float32)
+	kps_list = [ kps, kps - [ 150, 130 ], kps + [ 170, 100 ], (kps - [ 150, 130 ]) * 2.5 + [ 160, 0 ], kps + [ 400, 0 ] ]
+
+	for kps in kps_list:
+		face_paste = create_face_paste(temp_frame, kps)
+		paste_frame = paste_back(temp_frame, *face_paste)
+
+		assert numpy.abs(paste_frame.astype(numpy.int16) - paste_back_full(temp_frame, [ face_paste ])).max() <= 1
+	assert numpy.array_equal(paste_back(temp_frame, *create_face_paste(temp_frame, kps_list[-1])), temp_frame)
+
+
+def test_paste_back_many() -> None:
+	temp_frame = create_temp_frame()
+	kps = numpy.array([ [ 130, 110 ], [ 170, 110 ], [ 150, 130 ], [ 135, 150 ], [ 165, 150 ] ], dtype = numpy.float32)
+	face_pastes = [ create_face_paste(temp_frame, kps + offset) for offset in [ [ 0, 0 ], [ 20, 10 ], [ -140, -120 ], [ 160, 100 ] ] ]
+	paste_frame = paste_back_many(temp_frame, face_pastes)
+
+	assert numpy.abs(paste_frame.astype(numpy.int16) - paste_back_full(temp_frame, face_pastes)).max() <= 1
+	assert not numpy.array_equal(paste_frame, temp_frame)
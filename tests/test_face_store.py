@@ -0,0 +1,83 @@
+from unittest import mock
+import numpy
+
+import facefusion.globals
+from facefusion.face_store import get_static_faces, set_static_faces, clear_static_faces, create_frame_hash, get_static_faces_statistics, append_reference_face, clear_reference_faces, get_reference_faces, get_reference_embeddings, create_frame_context, set_context_frame, clear_frame_context, get_context_frame_number, get_context_faces, set_context_faces
+from facefusion.typing import Face
+
+
+def test_create_frame_hash() -> None:
+	frame = numpy.random.RandomState(0).randint(0, 255, (1080, 1920, 3), dtype = numpy.uint8)
+
+	assert create_frame_hash(frame) == create_frame_hash(frame.copy())
+	assert create_frame_hash(frame) != create_frame_hash(frame[:, :1440])
+	assert create_frame_hash(numpy.zeros((1080, 1920, 3), dtype = numpy.uint8)) is None
+
+
+def test_static_faces_eviction() -> None:
+	clear_static_faces()
+	frames = [ numpy.full((10, 10, 3), index + 1, dtype = numpy.uint8) for index in range(3) ]
+	with mock.patch.object(facefusion.globals, 'face_store_limit', 2):
+		for frame in frames:
+			set_static_faces(frame, [])
+	get_static_faces(frames[1])
+
+	assert get_static_faces(frames[0]) is None
+	assert get_static_faces(frames[2]) == []
+	assert get_static_faces_statistics() == { 'hits': 2, 'misses': 1 }
+	clear_static_faces()
+
+
+def test_static_faces_skip_pipeline_frame() -> None:
+	clear_static_faces()
+	frame = numpy.full((10, 10, 3), 1, dtype = numpy.uint8)
+	preview_frame = numpy.full((10, 10, 3), 2, dtype = numpy.uint8)
+	with mock.patch.object(facefusion.globals, 'face_store_limit', 2):
+		create_frame_context(frame, 1)
+		with mock.patch('facefusion.face_store.create_frame_hash') as create_frame_hash_mock:
+			set_static_faces(frame, [])
+
+			assert get_static_faces(frame) is None
+			assert create_frame_hash_mock.call_count == 0
+		create_frame_context(preview_frame)
+		set_static_faces(preview_frame, [])
+		clear_frame_context()
+
+	assert get_static_faces(frame) is None
+	assert get_static_faces(preview_frame) == []
+	assert get_static_faces_statistics() == { 'hits': 1, 'misses': 1 }
+	clear_static_faces()
+
+
+def test_get_reference_embeddings() -> None:
+	clear_reference_faces()
+	append_reference_face('origin', Face(bbox = numpy.zeros(4), kps = numpy.zeros((5, 2)), score = 1.0, normed_embedding = numpy.ones(512)))
+	reference_faces = get_reference_faces()
+
+	assert get_reference_embeddings(reference_faces['origin']).shape == (1, 512)
+	assert get_reference_embeddings(reference_faces['origin']) is get_reference_embeddings(list(reference_faces['origin']))
+	append_reference_face('origin', Face(bbox = numpy.zeros(4), kps = numpy.zeros((5, 2)), score = 1.0, normed_embedding = numpy.zeros(512)))
+	assert get_reference_embeddings(reference_faces['origin']).shape == (2, 512)
+	assert get_reference_embeddings([]).shape == (0, 512)
+	clear_reference_faces()
+
+
+def test_context_faces() -> None:
+	frame = numpy.zeros((10, 10, 3), dtype = numpy.uint8)
+	other_frame = numpy.zeros((10, 10, 3), dtype = numpy.uint8)
+	faces = [ Face(bbox = numpy.zeros(4), kps = numpy.zeros((5, 2)), score = 1.0) ]
+	create_frame_context(frame, 1)
+	set_context_faces(other_frame, [])
+	set_context_faces(frame, faces)
+
+	assert get_context_faces(frame) is faces
+	assert get_context_faces(other_frame) is None
+	assert get_context_frame_number(other_frame) is None
+	set_context_frame(other_frame)
+	assert get_context_faces(other_frame) is faces
+	assert get_context_frame_number(other_frame) == 1
+	resized_frame = numpy.zeros((20, 20, 3), dtype = numpy.uint8)
+	set_context_frame(resized_frame)
+	assert get_context_faces(resized_frame) is None
+	assert get_context_frame_number(resized_frame) is None
+	clear_frame_context()
@@ -0,0 +1,75 @@
+from typing import Any, Iterator, List, Optional, cast
+from types import ModuleType, SimpleNamespace
+from unittest import mock
+import numpy
+import pytest
+
+import facefusion.globals
+import facefusion.processors.frame.core as frame_processors
+from facefusion.core import process_video
+from facefusion.face_analyser import get_many_faces
+from facefusion.face_store import clear_static_faces
+from facefusion.face_tracker import is_face_tracker_active
+from facefusion.typing import Face, FaceSet, Frame
+
+
+@pytest.fixture(scope = 'function', autouse = True)
+def before_each() -> Iterator[None]:
+	with mock.patch.multiple(facefusion.globals, face_tracker_interval = 5, face_store_limit = 256, face_selector_mode = 'many', execution_providers = [ 'CPUExecutionProvider' ], execution_backend = 'thread', execution_thread_count = 2, execution_queue_count = 1, stream_frames = False, log_level = 'error'):
+		clear_static_faces()
+		yield
+		clear_static_faces()
+
+
+def create_frames() -> Frame:
+	frame = numpy.random.RandomState(0).randint(0, 255, (240, 320, 3), dtype = numpy.uint8)
+	frames = numpy.stack([ frame ] * 10)
+	frames[:, 0, 0, 0] = numpy.arange(10)
+	return frames
+
+
+def extract_faces(frame : Frame, tracked_faces : Optional[List[Face]] = None) -> List[Face]:
+	return [ Face(bbox = numpy.array([ 100, 80, 200, 180 ], dtype = numpy.float32), kps = numpy.array([ [ 130, 110 ], [ 170, 110 ], [ 150, 130 ], [ 135, 150 ], [ 165, 150 ] ], dtype = numpy.float32), score = 1.0) ]
+
+
+def test_face_tracker_in_schedule_frames() -> None:
+	frames = create_frames()
+
+	def process_frames(temp_frame_paths : List[str], update_progress : Any) -> None:
+		for temp_frame_path in temp_frame_paths:
+			get_many_faces(frames[int(temp_frame_path)])
+			update_progress()
+
+	with mock.patch('facefusion.face_analyser.extract_faces', side_effect = extract_faces) as extract_faces_mock:
+		frame_processors.process_schedule_frames(process_frames, [ str(index) for index in range(10) ], mock.Mock())
+
+	assert extract_faces_mock.call_count == 2
+	assert is_face_tracker_active() is False
+
+
+def test_face_tracker_in_stream() -> None:
+	tracker_states = []
+
+	def process_frame(source_face : Face, reference_faces : FaceSet, temp_frame : Frame) -> Frame:
+		tracker_states.append(is_face_tracker_active())
+		get_many_faces(temp_frame)
+		return temp_frame
+
+	with mock.patch.object(frame_processors, 'FRAME_PROCESSORS_MODULES', [ cast(ModuleType, SimpleNamespace(process_frame = process_frame)) ]), mock.patch('facefusion.face_analyser.extract_faces', side_effect = extract_faces) as extract_faces_mock:
+		result_frames = list(frame_processors.multi_process_stream([], iter(create_frames()), 10))
+
+	assert len(result_frames) == 10
+	assert extract_faces_mock.call_count == 10
+	assert tracker_states == [ False ] * 10
+
+
+def test_face_tracker_rejected_in_stream() -> None:
+	facefusion.globals.stream_frames = True
+
+	with mock.patch('facefusion.core.analyse_video') as analyse_video_mock:
+		process_video()
+	assert analyse_video_mock.call_count == 0
+	facefusion.globals.face_tracker_interval = 1
+	with mock.patch('facefusion.core.analyse_video', return_value = True) as analyse_video_mock:
+		process_video()
+	assert analyse_video_mock.call_count == 1
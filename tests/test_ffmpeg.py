@@ -1,11 +1,15 @@
+from typing import Iterator
 import glob
 import subprocess
+import numpy
 import pytest
 
 import facefusion.globals
-from facefusion.filesystem import get_temp_directory_path, create_temp, clear_temp
+from facefusion.filesystem import get_temp_directory_path, get_temp_output_video_path, create_temp, clear_temp, is_file
 from facefusion.download import conditional_download
-from facefusion.ffmpeg import extract_frames
+from facefusion.ffmpeg import extract_frames, extract_stream_frames, merge_stream_frames
+from facefusion.typing import Frame
+from facefusion.vision import count_video_frame_total
 
 
 @pytest.fixture(scope = 'module', autouse = True)
@@ -18,6 +22,7 @@ def before_all() -> None:
 	subprocess.run([ 'ffmpeg', '-i', '.assets/examples/target-240p.mp4', '-vf', 'fps=25', '.assets/examples/target-240p-25fps.mp4' ])
 	subprocess.run([ 'ffmpeg', '-i', '.assets/examples/target-240p.mp4', '-vf', 'fps=30', '.assets/examples/target-240p-30fps.mp4' ])
 	subprocess.run([ 'ffmpeg', '-i', '.assets/examples/target-240p.mp4', '-vf', 'fps=60', '.assets/examples/target-240p-60fps.mp4' ])
+	subprocess.run([ 'ffmpeg', '-f', 'lavfi', '-i', 'testsrc=size=426x240:rate=30000/1001', '-t', '20', '-g', '30', '-pix_fmt', 'yuv420p', '.assets/examples/target-240p-29.97fps.mp4' ])
 
 
 @pytest.fixture(scope = 'function', autouse = True)
@@ -26,6 +31,9 @@ def before_each() -> None:
 	facefusion.globals.trim_frame_end = None
 	facefusion.globals.temp_frame_quality = 80
 	facefusion.globals.temp_frame_format = 'jpg'
+	facefusion.globals.segment_duration = None
+	facefusion.globals.output_video_encoder = 'libx264'
+	facefusion.globals.output_video_quality = 80
 
 
 def test_extract_frames() -> None:
@@ -45,6 +53,43 @@ def test_extract_frames() -> None:
 		clear_temp(target_path)
 
 
+def test_extract_segment_frames() -> None:
+	facefusion.globals.trim_frame_start = 224
+	facefusion.globals.segment_duration = 1
+	facefusion.globals.execution_thread_count = 4
+	data_provider =\
+	[
+		('.assets/examples/target-240p-25fps.mp4', 55),
+		('.assets/examples/target-240p-30fps.mp4', 100),
+		('.assets/examples/target-240p-60fps.mp4', 212)
+	]
+	for target_path, frame_total in data_provider:
+		temp_directory_path = get_temp_directory_path(target_path)
+		create_temp(target_path)
+
+		assert extract_frames(target_path, 30.0) is True
+		assert len(glob.glob1(temp_directory_path, '*.jpg')) == frame_total
+
+		clear_temp(target_path)
+
+
+def test_extract_segment_frames_with_fractional_fps() -> None:
+	facefusion.globals.trim_frame_start = 13
+	facefusion.globals.trim_frame_end = 400
+	facefusion.globals.execution_thread_count = 4
+	target_path = '.assets/examples/target-240p-29.97fps.mp4'
+	temp_directory_path = get_temp_directory_path(target_path)
+	for segment_duration in [ None, 1, 3 ]:
+		facefusion.globals.segment_duration = segment_duration
+		create_temp(target_path)
+
+		assert extract_frames(target_path, 30.0) is True
+		assert len(glob.glob1(temp_directory_path, '*.jpg')) == 387
+		assert glob.glob1(temp_directory_path, '0387.jpg') == [ '0387.jpg' ]
+
+		clear_temp(target_path)
+
+
 def test_extract_frames_with_trim_start() -> None:
 	facefusion.globals.trim_frame_start = 224
 	data_provider =\
@@ -98,3 +143,44 @@ def test_extract_frames_with_trim_end() -> None:
 		assert len(glob.glob1(temp_directory_path, '*.jpg')) == frame_total
 
 		clear_temp(target_path)
+
+
+def test_extract_stream_frames() -> None:
+	facefusion.globals.trim_frame_start = 124
+	facefusion.globals.trim_frame_end = 224
+	data_provider =\
+	[
+		('.assets/examples/target-240p-25fps.mp4', 120),
+		('.assets/examples/target-240p-30fps.mp4', 100),
+		('.assets/examples/target-240p-60fps.mp4', 50)
+	]
+	for target_path, frame_total in data_provider:
+		temp_frames = list(extract_stream_frames(target_path, 30.0))
+
+		assert len(temp_frames) == frame_total
+		assert temp_frames[0].shape[2] == 3
+
+
+def create_stream_frames(frame_total : int) -> Iterator[Frame]:
+	for index in range(frame_total):
+		yield numpy.full((240, 426, 3), index * 8, dtype = numpy.uint8)
+
+
+def test_merge_stream_frames() -> None:
+	target_path = '.assets/examples/target-240p-stream.mp4'
+	temp_output_video_path = get_temp_output_video_path(target_path)
+	create_temp(target_path)
+
+	assert merge_stream_frames(target_path, 25.0, create_stream_frames(10)) is True
+	assert count_video_frame_total(temp_output_video_path) == 10
+	assert merge_stream_frames(target_path, 25.0, create_stream_frames(0)) is False
+
+	def create_failing_stream_frames() -> Iterator[Frame]:
+		yield from create_stream_frames(3)
+		raise RuntimeError
+
+	with pytest.raises(RuntimeError):
+		merge_stream_frames(target_path, 25.0, create_failing_stream_frames())
+	assert is_file(temp_output_video_path) is False
+
+	clear_temp(target_path)
@@ -0,0 +1,172 @@
+from typing import Callable, Iterator, List, cast
+from types import ModuleType, SimpleNamespace
+from unittest import mock
+import os
+import shutil
+import tempfile
+import cv2
+import numpy
+import pytest
+
+import facefusion.globals
+import facefusion.processors.frame.core as frame_processors
+from facefusion.typing import Face, FaceSet, Frame, ScheduleReport
+from facefusion.vision import read_image, write_image
+
+
+@pytest.fixture(scope = 'function', autouse = True)
+def before_each() -> Iterator[None]:
+	with mock.patch.multiple(facefusion.globals, face_selector_mode = 'many', face_tracker_interval = 1, execution_providers = [ 'CPUExecutionProvider' ], execution_backend = 'thread', execution_thread_count = 2, execution_queue_count = 1, log_level = 'error'):
+		yield
+
+
+def create_frames() -> List[Frame]:
+	return [ numpy.random.RandomState(index).randint(0, 255, (24, 32, 3), dtype = numpy.uint8) for index in range(8) ]
+
+
+def create_frame_processor_module() -> ModuleType:
+
+	def process_frame(source_face : Face, reference_faces : FaceSet, temp_frame : Frame) -> Frame:
+		if temp_frame[0, 0, 0] % 2:
+			return cv2.resize(255 - temp_frame, None, fx = 2, fy = 2, interpolation = cv2.INTER_NEAREST)
+		return 255 - temp_frame
+
+	return cast(ModuleType, SimpleNamespace(NAME = 'stub', process_frame = process_frame, clear_frame_processor = lambda: None))
+
+
+def create_schedule_report(worker_name : str, frame_total : int, busy_time : float) -> ScheduleReport:
+	return\
+	{
+		'worker_name': worker_name,
+		'frame_total': frame_total,
+		'busy_time': busy_time,
+		'trace_events': [],
+		'static_faces_statistics':
+		{
+			'hits': 0,
+			'misses': 0
+		},
+		'face_cache_entries': {}
+	}
+
+
+def list_shared_memory() -> List[str]:
+	return sorted(os.listdir('/dev/shm'))
+
+
+def process_temp_frames(temp_directory_path : str) -> List[Frame]:
+	temp_frame_paths = [ os.path.join(temp_directory_path, str(index + 1).zfill(4) + '.png') for index in range(8) ]
+	os.makedirs(temp_directory_path)
+	for temp_frame_path, temp_frame in zip(temp_frame_paths, create_frames()):
+		write_image(temp_frame_path, temp_frame)
+	frame_processors.process_fused_video([ create_frame_processor_module() ], [], temp_frame_paths)
+	return [ read_image(temp_frame_path) for temp_frame_path in temp_frame_paths ]
+
+
+def test_group_frame_processors_modules() -> None:
+	face_swapper, face_enhancer, face_debugger = [ cast(ModuleType, SimpleNamespace(NAME = name)) for name in [ 'face_swapper', 'face_enhancer', 'face_debugger' ] ]
+	frame_enhancer, frame_colorizer = [ cast(ModuleType, SimpleNamespace(NAME = name, SEPARATE_PASS = True)) for name in [ 'frame_enhancer', 'frame_colorizer' ] ]
+
+	assert frame_processors.group_frame_processors_modules([]) == []
+	assert frame_processors.group_frame_processors_modules([ face_swapper, face_enhancer, face_debugger ]) == [ [ face_swapper, face_enhancer, face_debugger ] ]
+	assert frame_processors.group_frame_processors_modules([ frame_enhancer, face_swapper, face_enhancer ]) == [ [ frame_enhancer ], [ face_swapper, face_enhancer ] ]
+	assert frame_processors.group_frame_processors_modules([ face_swapper, frame_enhancer, face_enhancer, face_debugger ]) == [ [ face_swapper ], [ frame_enhancer ], [ face_enhancer, face_debugger ] ]
+	assert frame_processors.group_frame_processors_modules([ face_swapper, face_enhancer, frame_enhancer ]) == [ [ face_swapper, face_enhancer ], [ frame_enhancer ] ]
+	assert frame_processors.group_frame_processors_modules([ frame_enhancer, frame_colorizer ]) == [ [ frame_enhancer ], [ frame_colorizer ] ]
+
+
+def test_multi_process_frames() -> None:
+	temp_frame_paths = [ str(index + 1).zfill(4) + '.jpg' for index in range(8) ]
+	payloads_temp_frame_paths = []
+
+	def process_frames(payload_temp_frame_paths : List[str], update_progress : Callable[[], None]) -> None:
+		payloads_temp_frame_paths.append(payload_temp_frame_paths)
+		for _ in payload_temp_frame_paths:
+			update_progress()
+
+	with mock.patch.multiple(facefusion.globals, execution_thread_count = 1, execution_queue_count = 3), mock.patch('facefusion.face_cache.FACE_CACHE', None):
+		frame_processors.multi_process_frames(temp_frame_paths, process_frames)
+
+	assert payloads_temp_frame_paths == [ temp_frame_paths[0:3], temp_frame_paths[3:6], temp_frame_paths[6:8] ]
+
+
+def test_sort_temp_frame_paths() -> None:
+	temp_frame_paths = [ str(index + 1).zfill(4) + '.jpg' for index in range(5) ]
+	face_cache =\
+	{
+		'entries':
+		{
+			1: { 'scores': numpy.zeros(0) },
+			2: { 'scores': numpy.zeros(4) },
+			4: { 'scores': numpy.zeros(1) },
+			5: { 'scores': numpy.zeros(2) }
+		}
+	}
+
+	with mock.patch('facefusion.face_cache.FACE_CACHE', None):
+		assert frame_processors.sort_temp_frame_paths(temp_frame_paths) == temp_frame_paths
+	with mock.patch('facefusion.face_cache.FACE_CACHE', face_cache):
+		assert frame_processors.sort_temp_frame_paths(temp_frame_paths) == [ '0002.jpg', '0005.jpg', '0003.jpg', '0004.jpg', '0001.jpg' ]
+
+
+def test_process_schedule_frames() -> None:
+	update_frame = mock.Mock()
+
+	def process_frames(temp_frame_paths : List[str], update_progress : Callable[[], None]) -> None:
+		for _ in temp_frame_paths:
+			update_progress()
+
+	schedule_report = frame_processors.process_schedule_frames(process_frames, [ '0001.jpg', '0002.jpg', '0003.jpg' ], update_frame)
+
+	assert schedule_report.get('worker_name') == frame_processors.get_worker_name()
+	assert schedule_report.get('frame_total') == 3
+	assert schedule_report.get('busy_time') > 0
+	assert update_frame.call_args_list == [ mock.call('0001.jpg'), mock.call('0002.jpg'), mock.call('0003.jpg') ]
+
+
+def test_report_worker_utilisation() -> None:
+	schedule_reports = [ create_schedule_report('worker-2', 4, 3.0), create_schedule_report('worker-1', 3, 1.0), create_schedule_report('worker-1', 2, 0.5) ]
+
+	with mock.patch('facefusion.processors.frame.core.logger.debug') as debug_mock:
+		frame_processors.report_worker_utilisation(schedule_reports, 4.0)
+
+	assert [ call.args[0] for call in debug_mock.call_args_list ] ==\
+	[
+		'Worker worker-1 processed 5 frames at 37.5% utilisation',
+		'Worker worker-2 processed 4 frames at 75.0% utilisation'
+	]
+
+
+def test_process_backend_frames() -> None:
+	temp_directory_path = tempfile.mkdtemp()
+	with mock.patch.object(frame_processors, 'FRAME_PROCESSORS_MODULES', [ create_frame_processor_module() ]):
+		thread_frames = process_temp_frames(os.path.join(temp_directory_path, 'thread'))
+		facefusion.globals.execution_backend = 'process'
+		process_frames = process_temp_frames(os.path.join(temp_directory_path, 'process'))
+	shutil.rmtree(temp_directory_path)
+
+	assert [ thread_frame.shape for thread_frame in thread_frames ] != [ (24, 32, 3) ] * 8
+	assert all(numpy.array_equal(thread_frame, process_frame) for thread_frame, process_frame in zip(thread_frames, process_frames))
+
+
+def test_process_fused_video_source_face() -> None:
+	temp_directory_path = tempfile.mkdtemp()
+	with mock.patch.object(frame_processors, 'get_average_face') as get_average_face_mock:
+		process_temp_frames(os.path.join(temp_directory_path, 'thread'))
+		facefusion.globals.execution_backend = 'process'
+		process_temp_frames(os.path.join(temp_directory_path, 'process'))
+	shutil.rmtree(temp_directory_path)
+
+	assert get_average_face_mock.call_count == 2
+
+
+def test_process_backend_stream() -> None:
+	shared_memory_names = list_shared_memory()
+	with mock.patch.object(frame_processors, 'FRAME_PROCESSORS_MODULES', [ create_frame_processor_module() ]):
+		thread_frames = list(frame_processors.multi_process_stream([], iter(create_frames()), 8))
+		facefusion.globals.execution_backend = 'process'
+		process_frames = list(frame_processors.multi_process_stream([], iter(create_frames()), 8))
+
+	assert len(process_frames) == 8
+	assert all(numpy.array_equal(thread_frame, process_frame) for thread_frame, process_frame in zip(thread_frames, process_frames))
+	assert list_shared_memory() == shared_memory_names
@@ -0,0 +1,79 @@
+from unittest import mock
+import os
+import tempfile
+
+import facefusion.globals
+from facefusion.job_manifest import create_job_manifest, resume_job_manifest, clear_job_manifest, is_job_stage_done, set_job_stage_done, set_job_frame_processors, restore_job_frames, get_job_pending_frame_paths, get_job_frame_path, set_job_frame_done
+
+
+def read_frame(frame_path : str) -> str:
+	with open(frame_path, 'r') as frame_file:
+		return frame_file.read()
+
+
+def write_frame(frame_path : str, frame : str) -> None:
+	with open(frame_path, 'w') as frame_file:
+		frame_file.write(frame)
+
+
+def test_resume_job_frames() -> None:
+	with tempfile.TemporaryDirectory() as temp_directory_path, mock.patch('facefusion.filesystem.TEMP_DIRECTORY_PATH', temp_directory_path):
+		job_directory_path = os.path.join(temp_directory_path, 'target')
+		os.makedirs(job_directory_path)
+		temp_frame_paths = [ os.path.join(job_directory_path, frame_name) for frame_name in [ '0001.png', '0002.png', '0003.png' ] ]
+		for temp_frame_path in temp_frame_paths:
+			write_frame(temp_frame_path, 'extracted')
+		create_job_manifest('target.mp4')
+		set_job_frame_processors([ 'face_swapper' ])
+
+		write_frame(get_job_frame_path(temp_frame_paths[0]), 'processed')
+		set_job_frame_done(temp_frame_paths[0])
+		write_frame(get_job_frame_path(temp_frame_paths[1]), 'processed')
+		with mock.patch('facefusion.job_manifest.os.replace', side_effect = KeyboardInterrupt):
+			try:
+				set_job_frame_done(temp_frame_paths[1])
+			except KeyboardInterrupt:
+				pass
+		write_frame(get_job_frame_path(temp_frame_paths[2]), 'processed')
+		clear_job_manifest()
+
+		assert resume_job_manifest('target.mp4') is True
+		restore_job_frames([ 'face_swapper' ], temp_frame_paths)
+		assert get_job_pending_frame_paths([ 'face_swapper' ], temp_frame_paths) == [ temp_frame_paths[2] ]
+		assert [ read_frame(temp_frame_path) for temp_frame_path in temp_frame_paths ] == [ 'processed', 'processed', 'extracted' ]
+		assert sorted(os.listdir(job_directory_path)) == [ '0001.png', '0002.png', '0003.png', 'manifest.json', 'manifest.log' ]
+		clear_job_manifest()
+		assert get_job_frame_path(temp_frame_paths[0]) == temp_frame_paths[0]
+
+
+def test_resume_job_manifest_ignores_execution_backend() -> None:
+	with tempfile.TemporaryDirectory() as temp_directory_path, mock.patch('facefusion.filesystem.TEMP_DIRECTORY_PATH', temp_directory_path):
+		os.makedirs(os.path.join(temp_directory_path, 'target'))
+		with mock.patch.object(facefusion.globals, 'execution_backend', 'thread'):
+			create_job_manifest('target.mp4')
+			clear_job_manifest()
+		with mock.patch.object(facefusion.globals, 'execution_backend', 'process'):
+			assert resume_job_manifest('target.mp4') is True
+		clear_job_manifest()
+
+
+def test_resume_job_manifest_with_merge_settings() -> None:
+	with tempfile.TemporaryDirectory() as temp_directory_path, mock.patch('facefusion.filesystem.TEMP_DIRECTORY_PATH', temp_directory_path):
+		os.makedirs(os.path.join(temp_directory_path, 'target'))
+		with mock.patch.multiple(facefusion.globals, output_video_encoder = 'libx264', output_video_quality = 80, segment_duration = 60, stream_frames = False):
+			create_job_manifest('target.mp4')
+			set_job_stage_done('extract_frames')
+			set_job_stage_done('merge_video')
+			set_job_stage_done('restore_audio')
+			clear_job_manifest()
+		with mock.patch.multiple(facefusion.globals, output_video_encoder = 'libx264', output_video_quality = 80, segment_duration = 0, stream_frames = True):
+			assert resume_job_manifest('target.mp4') is True
+			assert [ is_job_stage_done('extract_frames'), is_job_stage_done('merge_video'), is_job_stage_done('restore_audio') ] == [ True, True, True ]
+			clear_job_manifest()
+		with mock.patch.multiple(facefusion.globals, output_video_encoder = 'libx265', output_video_quality = 80):
+			assert resume_job_manifest('target.mp4') is True
+			assert [ is_job_stage_done('extract_frames'), is_job_stage_done('merge_video'), is_job_stage_done('restore_audio') ] == [ True, False, False ]
+			clear_job_manifest()
+			assert resume_job_manifest('target.mp4') is True
+			assert is_job_stage_done('merge_video') is False
+		clear_job_manifest()
@@ -0,0 +1,61 @@
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+from typing import Any, Dict, List
+import numpy
+
+from facefusion.session_batcher import SessionBatcher
+from facefusion.session_pool import SessionPool
+
+
+class FakeSession:
+	def __init__(self, batch_dimension : Any = 'batch') -> None:
+		self.batch_sizes : List[int] = []
+		self.batch_dimension = batch_dimension
+
+	def run(self, output_names : None, input_feed : Dict[str, Any]) -> List[Any]:
+		self.batch_sizes.append(input_feed.get('input').shape[0])
+		return [ input_feed.get('input') * input_feed.get('scale') ]
+
+	def get_inputs(self) -> List[Any]:
+		return [ SimpleNamespace(name = 'input', shape = [ self.batch_dimension, 4 ]), SimpleNamespace(name = 'scale', shape = [ 1 ]) ]
+
+	def get_outputs(self) -> List[Any]:
+		return [ SimpleNamespace(name = 'output', shape = [ self.batch_dimension, 4 ]) ]
+
+
+def run_session_batcher(session_batcher : SessionBatcher) -> None:
+	with ThreadPoolExecutor(max_workers = 8) as executor:
+		outputs = list(executor.map(lambda index: session_batcher.run(None, { 'input': numpy.full((1, 4), index), 'scale': numpy.array([ 2 ]) })[0], range(32)))
+	for index, output in enumerate(outputs):
+		assert output.tolist() == [ [ index * 2 ] * 4 ]
+
+
+def test_session_batcher_batches() -> None:
+	session_pool = SessionPool(FakeSession, 1, 1)
+	session_batcher = SessionBatcher(session_pool, 4, 0.05)
+	run_session_batcher(session_batcher)
+
+	assert session_batcher.batch_size == 4
+	assert sum(session_pool.sessions[0].batch_sizes) == 32
+	assert max(session_pool.sessions[0].batch_sizes) == 4
+	assert session_batcher.batch_requests == []
+
+
+def test_session_batcher_fixed_batch() -> None:
+	session_pool = SessionPool(lambda: FakeSession(1), 1, 1)
+	session_batcher = SessionBatcher(session_pool, 4, 0.05)
+	run_session_batcher(session_batcher)
+
+	assert session_batcher.batch_size == 1
+	assert session_pool.sessions[0].batch_sizes == [ 1 ] * 32
+
+
+def test_session_batcher_multiple_rows() -> None:
+	session_pool = SessionPool(FakeSession, 1, 1)
+	session_batcher = SessionBatcher(session_pool, 4, 0.05)
+	with ThreadPoolExecutor(max_workers = 4) as executor:
+		outputs = list(executor.map(lambda index: session_batcher.run(None, { 'input': numpy.full((index + 1, 4), index), 'scale': numpy.array([ 1 ]) })[0], range(4)))
+
+	assert session_batcher.batch_support is True
+	for index, output in enumerate(outputs):
+		assert output.tolist() == [ [ index ] * 4 ] * (index + 1)
@@ -0,0 +1,127 @@
+from typing import List
+from concurrent.futures import ThreadPoolExecutor
+import threading
+import os
+import tempfile
+import time
+import onnxruntime
+
+import facefusion.globals
+from facefusion.benchmark import stand_in
+from facefusion.session_pool import SessionPool, create_session_options, create_inference_session, resolve_optimized_model_path
+
+
+class FakeSession:
+	def __init__(self) -> None:
+		self.lock = threading.Lock()
+		self.active_total = 0
+		self.active_maximum = 0
+
+	def run(self, output_names : None, input_feed : float) -> float:
+		with self.lock:
+			self.active_total += 1
+			self.active_maximum = max(self.active_maximum, self.active_total)
+		time.sleep(input_feed)
+		with self.lock:
+			self.active_total -= 1
+		return input_feed
+
+
+def run_session_pool(session_pool : SessionPool) -> None:
+	with ThreadPoolExecutor(max_workers = 8) as executor:
+		assert list(executor.map(lambda _: session_pool.run(None, 0.02), range(16))) == [ 0.02 ] * 16
+
+
+def test_session_pool_sessions() -> None:
+	session_pool = SessionPool(FakeSession, 4, 1)
+	run_session_pool(session_pool)
+	assert len(session_pool.sessions) == 4
+	assert all(session.active_maximum == 1 for session in session_pool.sessions)
+
+
+def test_session_pool_concurrency() -> None:
+	session_pool = SessionPool(FakeSession, 1, 3)
+	run_session_pool(session_pool)
+	assert len(session_pool.sessions) == 1
+	assert session_pool.sessions[0].active_maximum == 3
+	assert session_pool.session_loads == [ 0 ]
+
+
+def test_session_pool_create_session_outside_lock() -> None:
+	create_started = threading.Event()
+	create_released = threading.Event()
+	sessions : List[FakeSession] = []
+
+	def create_session() -> FakeSession:
+		if sessions:
+			create_started.set()
+			create_released.wait(5)
+		sessions.append(FakeSession())
+		return sessions[-1]
+
+	session_pool = SessionPool(create_session, 2, 1)
+	with session_pool.acquire():
+		create_thread = threading.Thread(target = session_pool.run, args = (None, 0))
+		create_thread.start()
+		assert create_started.wait(5)
+		assert session_pool.condition.acquire(timeout = 1)
+		session_pool.condition.release()
+		create_released.set()
+		create_thread.join()
+	assert len(session_pool.sessions) == 2
+	assert session_pool.session_loads == [ 0, 0 ]
+	assert session_pool.session_pending == 0
+
+
+def test_create_session_options() -> None:
+	facefusion.globals.execution_intra_op_thread_count = 2
+	facefusion.globals.execution_inter_op_thread_count = None
+	facefusion.globals.execution_mode = 'parallel'
+	facefusion.globals.execution_graph_optimization = 'basic'
+	facefusion.globals.execution_disable_memory_arena = True
+	facefusion.globals.execution_disable_spinning = True
+	session_options = create_session_options()
+
+	assert session_options.intra_op_num_threads == 2
+	assert session_options.execution_mode == onnxruntime.ExecutionMode.ORT_PARALLEL
+	assert session_options.graph_optimization_level == onnxruntime.GraphOptimizationLevel.ORT_ENABLE_BASIC
+	assert session_options.enable_cpu_mem_arena is False
+	assert session_options.get_session_config_entry('session.intra_op.allow_spinning') == '0'
+
+
+def test_create_inference_session_with_model_cache() -> None:
+	facefusion.globals.execution_providers = [ 'CPUExecutionProvider' ]
+	facefusion.globals.execution_graph_optimization = None
+	facefusion.globals.execution_disable_model_cache = None
+	with tempfile.TemporaryDirectory() as temp_directory_path:
+		model_path = os.path.join(temp_directory_path, 'model.onnx')
+		stand_in.create_face_recognizer_model(model_path)
+		optimized_model_path = resolve_optimized_model_path(model_path)
+
+		assert optimized_model_path and optimized_model_path.startswith(os.path.join(temp_directory_path, 'optimized', 'model.'))
+		assert create_inference_session(model_path).get_outputs()[0].name == 'embedding'
+		assert os.listdir(os.path.dirname(optimized_model_path)) == [ os.path.basename(optimized_model_path) ]
+		assert create_inference_session(model_path).get_outputs()[0].name == 'embedding'
+
+		facefusion.globals.execution_disable_model_cache = True
+		assert resolve_optimized_model_path(model_path) is None
+		facefusion.globals.execution_disable_model_cache = None
+
+
+def test_resolve_optimized_model_path_with_model_hash() -> None:
+	facefusion.globals.execution_providers = [ 'CPUExecutionProvider' ]
+	facefusion.globals.execution_graph_optimization = None
+	facefusion.globals.execution_disable_model_cache = None
+	with tempfile.TemporaryDirectory() as temp_directory_path:
+		model_path = os.path.join(temp_directory_path, 'model.onnx')
+		with open(model_path, 'wb') as model_file:
+			model_file.write(b'a' * 64)
+		model_stat = os.stat(model_path)
+		optimized_model_path = resolve_optimized_model_path(model_path)
+
+		assert resolve_optimized_model_path(model_path) == optimized_model_path
+		time.sleep(0.01)
+		with open(model_path, 'wb') as model_file:
+			model_file.write(b'b' * 64)
+		os.utime(model_path, ns = (model_stat.st_atime_ns, model_stat.st_mtime_ns))
+		assert resolve_optimized_model_path(model_path) != optimized_model_path
@@ -0,0 +1,33 @@
+import json
+import os
+import tempfile
+
+import facefusion.globals
+from facefusion.tracer import trace, trace_span, pop_trace_events, write_trace
+
+
+@trace('traced_function')
+def traced_function() -> int:
+	with trace_span('traced_span'):
+		return 1
+
+
+def test_trace_disabled() -> None:
+	facefusion.globals.trace_path = None
+	pop_trace_events()
+	assert traced_function() == 1
+	assert pop_trace_events() == []
+
+
+def test_trace_enabled() -> None:
+	facefusion.globals.trace_path = os.path.join(tempfile.gettempdir(), 'test-trace.json')
+	pop_trace_events()
+	assert traced_function() == 1
+	assert write_trace(facefusion.globals.trace_path) is True
+	with open(facefusion.globals.trace_path, 'r') as trace_file:
+		trace_events = json.load(trace_file).get('traceEvents')
+	assert [ trace_event.get('name') for trace_event in trace_events ] == [ 'traced_span', 'traced_function' ]
+	assert all(trace_event.get('ph') == 'X' and trace_event.get('dur') >= 0 for trace_event in trace_events)
+	assert pop_trace_events() == []
+	os.remove(facefusion.globals.trace_path)
+	facefusion.globals.trace_path = None